@@ -9,7 +9,9 @@ from PyQt5.QtWidgets import QApplication, QDesktopWidget, QMessageBox
 from PyQt5.QtCore import QSettings
 from src.ui.login import load_token, LoginWindow
 from src.ui.home import HomePage
+from src.ui.theme import apply_theme
 from src.utils.logger import logger
+from src.utils.stall_watchdog import get_stall_watchdog
 from src.config import settings as settings_module
 
 # 设置 QSettings
@@ -122,64 +124,14 @@ def main():
         logger.info(f"应用程序启动，设置日志级别为: {log_level}")
         logger.set_level(log_level)
         
-        # 设置全局样式表，确保所有下拉框和弹出窗口都有深色背景
-        global_style = """
-            QComboBox QAbstractItemView, QComboBoxPrivateContainer {
-                background-color: #282828;
-                color: white;
-                border: none;
-                outline: none;
-                border-radius: 0px;
-                selection-background-color: #1DB954;
-                selection-color: white;
-                padding: 0px;
-                margin: 0px;
-            }
-            QListView, QTreeView, QTableView {
-                background-color: #282828;
-                color: white;
-                border: none;
-                outline: none;
-            }
-            QListView::item:selected, QTreeView::item:selected {
-                background-color: #1DB954;
-                color: white;
-            }
-            QScrollBar:vertical {
-                background-color: #282828;
-                width: 8px;
-                margin: 0px;
-            }
-            QScrollBar::handle:vertical {
-                background-color: #535353;
-                min-height: 20px;
-                border-radius: 4px;
-            }
-            QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical,
-            QScrollBar::add-page:vertical, QScrollBar::sub-page:vertical {
-                background: none;
-                height: 0px;
-                width: 0px;
-            }
-            QMenu, QMenu::item {
-                background-color: #040404;
-                color: #b3b3b3;
-                margin: 0px;
-                padding: 8px 32px;
-                border: none;
-            }
-            QMenu::item:selected {
-                background-color: #282828;
-                color: white;
-            }
-            QMenu::separator {
-                height: 1px;
-                background-color: #282828;
-                margin: 0px;
-                padding: 0px;
-            }
-        """
-        app.setStyleSheet(global_style)
+        # 可选的界面卡顿监视，卡顿超过阈值时把主线程调用栈写入日志
+        if settings_module.get_setting("stall_watchdog", False):
+            watchdog = get_stall_watchdog()
+            watchdog.start()
+            app.aboutToQuit.connect(watchdog.stop)
+        
+        # 设置应用级样式表（所有界面的样式集中在 src/ui/theme.py，只解析一次）
+        apply_theme(app)
         
         # 设置应用图标
         from PyQt5.QtGui import QIcon
@@ -24,7 +24,13 @@ DEFAULT_SETTINGS = {
     'window_x': 100,
     'window_y': 100,
     'sidebar_collapsed': False,
-    'log_level': 'info'  # 默认日志级别
+    'log_level': 'info',  # 默认日志级别
+    'cache_warmer': True,  # 空闲时后台预热歌单缓存
+    'image_max_downloads': 6,  # 同时下载图片的最大数量
+    'playlist_view_cache_size': 5,  # 保留在内存中的歌单页面数量
+    'playlist_view_cache_mb': 200,  # 保留的歌单页面最多占用的内存（MB）
+    'stall_watchdog': False,  # 监视界面卡顿并把主线程调用栈写入日志
+    'stall_threshold_ms': 200  # 界面卡顿超过多少毫秒时记录调用栈
 }
 
 def load_settings():
@@ -0,0 +1,116 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+缓存维护工具 - 校验、修复并压缩本地缓存
+不需要图形界面，可以在服务器或共享机器上直接运行
+
+用法:
+    python -m src.tools.cache_maintenance [--repair] [--no-compact] [--cache-dir 目录]
+
+主程序运行时打包文件被它锁定，工具会拒绝运行，请先关闭主程序
+"""
+
+import argparse
+import os
+import sys
+import time
+
+from PyQt5.QtCore import QCoreApplication
+
+from src.utils.cache_manager import CacheManager
+
+
+def format_size(size):
+    """
+    格式化文件大小
+
+    Args:
+        size (int): 字节数
+
+    Returns:
+        str: 带单位的大小
+    """
+    for unit in ['B', 'KB', 'MB', 'GB']:
+        if size < 1024.0:
+            return f"{size:.1f} {unit}"
+        size /= 1024.0
+    return f"{size:.1f} TB"
+
+
+def print_paths(title, paths):
+    """
+    打印文件列表
+
+    Args:
+        title (str): 标题
+        paths (list): 文件路径列表
+    """
+    print(f"{title}: {len(paths)}")
+    for path in paths:
+        print(f"  - {path}")
+
+
+def main(argv=None):
+    """
+    主函数，处理命令行参数并执行维护
+
+    Returns:
+        int: 退出码，发现问题且未修复时为1，主程序正在运行时为2
+    """
+    parser = argparse.ArgumentParser(description="校验、修复并压缩 SpotifyExportTool 的本地缓存")
+    parser.add_argument("--repair", action="store_true", help="删除损坏和无主的文件，并重建打包文件的索引")
+    parser.add_argument("--no-compact", action="store_true", help="不压缩打包存储")
+    parser.add_argument("--cache-dir", help="缓存目录，默认为程序目录下的cache")
+    args = parser.parse_args(argv)
+
+    # QImage解码插件需要应用实例，但不需要显示
+    app = QCoreApplication.instance() or QCoreApplication(sys.argv[:1])
+
+    cache_dir = os.path.abspath(args.cache_dir) if args.cache_dir else None
+    if cache_dir and not os.path.isdir(cache_dir):
+        print(f"缓存目录不存在: {cache_dir}")
+        return 1
+
+    cache_manager = CacheManager(cache_dir)
+    print(f"缓存目录: {cache_manager.cache_dir}")
+    if cache_manager.track_cover_pack.read_only:
+        print("主程序正在使用这个缓存目录，请先关闭主程序再运行维护")
+        cache_manager.track_cover_pack.close()
+        return 2
+
+    size_before = cache_manager.get_cache_size()
+    pack_before = cache_manager.track_cover_pack.stats()
+    print(f"维护前大小: {format_size(size_before)}")
+    print(f"打包存储: {pack_before['entries']} 条, "
+          f"有效 {format_size(pack_before['live_bytes'])}, 失效 {format_size(pack_before['dead_bytes'])}")
+
+    # 校验
+    start = time.perf_counter()
+    report = cache_manager.verify_cache(repair=args.repair)
+    verify_time = time.perf_counter() - start
+
+    print(f"\n已校验 {report['checked']} 个条目，用时 {verify_time:.2f} 秒")
+    print_paths("损坏", report['corrupt'])
+    print_paths("无主", report['orphaned'])
+    if args.repair:
+        print(f"已修复: {report['repaired']}，打包索引已重建")
+
+    # 压缩
+    if not args.no_compact:
+        start = time.perf_counter()
+        pack_size_before, pack_size_after = cache_manager.compact_cache()
+        compact_time = time.perf_counter() - start
+        print(f"\n打包存储压缩: {format_size(pack_size_before)} -> {format_size(pack_size_after)}，"
+              f"用时 {compact_time:.2f} 秒")
+
+    cache_manager.track_cover_pack.close()
+    size_after = cache_manager.get_cache_size()
+    print(f"\n维护后大小: {format_size(size_after)}（回收 {format_size(max(0, size_before - size_after))}）")
+
+    has_problems = bool(report['corrupt'] or report['orphaned'])
+    return 1 if has_problems and not args.repair else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
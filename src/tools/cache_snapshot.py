@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+缓存快照工具 - 导出或导入整个本地缓存
+在新机器上导入快照后，打开歌单可以直接命中缓存，不需要重新调用API
+
+用法:
+    python -m src.tools.cache_snapshot export 快照文件 [--cache-dir 目录]
+    python -m src.tools.cache_snapshot import 快照文件 [--cache-dir 目录]
+
+导入会替换现有缓存，主程序运行时工具会拒绝导入，请先关闭主程序
+"""
+
+import argparse
+import os
+import sys
+import time
+
+from src.utils.cache_manager import CacheManager
+from src.utils.cache_snapshot import export_snapshot, import_snapshot, SnapshotError
+from src.tools.cache_maintenance import format_size
+
+
+def main(argv=None):
+    """
+    主函数，处理命令行参数并执行导出或导入
+
+    Returns:
+        int: 退出码，失败时为1，主程序正在运行时为2
+    """
+    parser = argparse.ArgumentParser(description="导出或导入 SpotifyExportTool 的缓存快照")
+    parser.add_argument("action", choices=["export", "import"], help="导出或导入")
+    parser.add_argument("snapshot", help="快照文件路径（.tar.gz）")
+    parser.add_argument("--cache-dir", help="缓存目录，默认为程序目录下的cache")
+    args = parser.parse_args(argv)
+
+    cache_dir = os.path.abspath(args.cache_dir) if args.cache_dir else None
+    cache_manager = CacheManager(cache_dir)
+    print(f"缓存目录: {cache_manager.cache_dir}")
+    if args.action == "import" and cache_manager.track_cover_pack.read_only:
+        print("主程序正在使用这个缓存目录，请先关闭主程序再导入")
+        cache_manager.track_cover_pack.close()
+        return 2
+
+    start = time.perf_counter()
+    try:
+        if args.action == "export":
+            count, total = export_snapshot(cache_manager, args.snapshot)
+            print(f"已导出 {count} 个文件（{format_size(total)}）到 {args.snapshot}，"
+                  f"快照大小 {format_size(os.path.getsize(args.snapshot))}")
+        else:
+            count, total = import_snapshot(cache_manager, args.snapshot)
+            print(f"已导入 {count} 个文件（{format_size(total)}）")
+    except (SnapshotError, OSError) as e:
+        print(f"{'导出' if args.action == 'export' else '导入'}失败: {str(e)}")
+        return 1
+    finally:
+        cache_manager.track_cover_pack.close()
+
+    print(f"用时 {time.perf_counter() - start:.2f} 秒")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
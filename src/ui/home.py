@@ -3,9 +3,10 @@
 """
 
 from PyQt5.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
-                            QStackedWidget)
-from PyQt5.QtCore import Qt, QTimer
+                            QStackedWidget, QApplication)
+from PyQt5.QtCore import Qt, QTimer, QEvent
 import os
+from collections import OrderedDict
 from PyQt5.QtGui import QIcon, QResizeEvent
 import spotipy
 import sys
@@ -19,6 +20,8 @@ from src.ui.error_view import ErrorView
 from src.ui.loading_view import LoadingView
 from src.utils.language_manager import LanguageManager
 from src.utils.cache_manager import CacheManager
+from src.utils.cache_warmer import CacheWarmer
+from src.config import settings
 from src.utils.logger import logger
 
 class HomePage(QMainWindow):
@@ -44,6 +47,13 @@ class HomePage(QMainWindow):
             self.language_manager = LanguageManager()
             self.cache_manager = CacheManager()
             
+            # 空闲时预热歌单缓存
+            self.cache_warmer = None
+            if settings.get_setting('cache_warmer', True):
+                self.cache_warmer = CacheWarmer(self.sp, self.cache_manager, parent=self)
+                QApplication.instance().installEventFilter(self)
+                QApplication.instance().aboutToQuit.connect(self.cache_warmer.stop)
+            
             # 监听语言变更
             self.language_manager.language_changed.connect(self.update_ui_texts)
             
@@ -122,20 +132,20 @@ class HomePage(QMainWindow):
             
             # 添加侧边栏 - 左侧，竖向占满
             logger.info("创建侧边栏")
-            self.sidebar_view = SidebarView(self.sp)
+            self.sidebar_view = SidebarView(self.sp, self.cache_manager)
             self.content_layout.addWidget(self.sidebar_view)
 
             # 添加主内容区域
             logger.info("创建主内容区域")
             main_content = QWidget()
-            main_content.setStyleSheet("background-color: #040404;")
+            main_content.setObjectName("mainContent")
             main_content_layout = QVBoxLayout(main_content)
             main_content_layout.setContentsMargins(0, 0, 0, 0)
             main_content_layout.setSpacing(0)
 
             # 内容主体区域（使用QStackedWidget实现页面切换）
             self.stacked_widget = QStackedWidget()
-            self.stacked_widget.setStyleSheet("background-color: #040404;")
+            self.stacked_widget.setObjectName("contentStack")
             main_content_layout.addWidget(self.stacked_widget)
 
             # 创建欢迎页面
@@ -145,6 +155,8 @@ class HomePage(QMainWindow):
 
             # 创建播放列表视图页（初始时为空，将在选择歌单时创建）
             self.playlist_view = None
+            # 最近打开的歌单页面保留在内存中，切换回来时不再重新创建
+            self.playlist_views = OrderedDict()  # 歌单ID -> PlaylistView，最近使用的在最后
 
             # 将主内容区添加到水平布局中
             self.content_layout.addWidget(main_content)
@@ -161,6 +173,9 @@ class HomePage(QMainWindow):
             logger.info("连接各组件信号")
             self.sidebar_view.playlist_selected.connect(self.show_playlist)
             self.sidebar_view.collapsed_changed.connect(self.adjust_layout)
+            if self.cache_warmer:
+                self.sidebar_view.playlists_ready.connect(self.cache_warmer.enqueue_playlists)
+            QApplication.instance().aboutToQuit.connect(self.sidebar_view.stop_prefetch)
             self.topbar_view.home_clicked.connect(self.show_home)
             self.topbar_view.settings_clicked.connect(self.show_settings)
 
@@ -281,19 +296,32 @@ class HomePage(QMainWindow):
             self.playlist_view.load_songs(force_refresh=True)
             return
         
+        # 记录打开时间，已打开的歌单不再需要预热
+        self.cache_manager.mark_playlist_opened(playlist["id"])
+        if self.cache_warmer:
+            self.cache_warmer.discard(playlist["id"])
+        
         # 清除之前的内容
         self.clear_content()
         
-        # 创建播放列表视图，传递语言管理器和缓存管理器
-        self.playlist_view = PlaylistView(
-            self.sp, 
-            playlist,
-            parent=self,
-            language_manager=self.language_manager,
-            cache_manager=self.cache_manager
-        )
-        self.stacked_widget.addWidget(self.playlist_view)
-        self.stacked_widget.setCurrentWidget(self.playlist_view)
+        # 最近打开过的歌单直接切换回去，保留歌曲、封面和滚动位置
+        view = self.playlist_views.pop(playlist["id"], None)
+        if view is None:
+            # 创建播放列表视图，传递语言管理器和缓存管理器
+            view = PlaylistView(
+                self.sp, 
+                playlist,
+                parent=self,
+                language_manager=self.language_manager,
+                cache_manager=self.cache_manager
+            )
+            self.stacked_widget.addWidget(view)
+        else:
+            logger.info(f"切换到已缓存的播放列表页面: {playlist['name']}")
+        self.playlist_views[playlist["id"]] = view
+        self.playlist_view = view
+        self.stacked_widget.setCurrentWidget(view)
+        self.trim_playlist_views()
     
     def load_user_data(self):
         """加载用户数据"""
@@ -340,6 +368,12 @@ class HomePage(QMainWindow):
             self.stacked_widget.addWidget(error_view)
             self.stacked_widget.setCurrentWidget(error_view)
     
+    def eventFilter(self, obj, event):
+        """用户有操作时通知缓存预热器暂停"""
+        if self.cache_warmer and event.type() in (QEvent.MouseButtonPress, QEvent.KeyPress, QEvent.Wheel):
+            self.cache_warmer.notify_user_activity()
+        return super().eventFilter(obj, event)
+    
     def resizeEvent(self, event: QResizeEvent):
         """窗口大小变化事件"""
         super().resizeEvent(event)
@@ -386,12 +420,32 @@ class HomePage(QMainWindow):
 
     def clear_content(self):
         """清空内容区域"""
-        # 移除播放列表视图（如果存在）
-        if self.playlist_view is not None:
-            if self.stacked_widget.indexOf(self.playlist_view) != -1:
-                self.stacked_widget.removeWidget(self.playlist_view)
-            self.playlist_view.deleteLater()
-            self.playlist_view = None
+        # 当前的播放列表视图留在缓存中，切换页面后它会暂停后台工作
+        self.playlist_view = None
+    
+    def trim_playlist_views(self):
+        """按数量和估算的内存淘汰最久未使用的播放列表视图"""
+        max_views = max(1, settings.get_setting('playlist_view_cache_size', 5))
+        max_bytes = settings.get_setting('playlist_view_cache_mb', 200) * 1024 * 1024
+        total_bytes = sum(view.estimated_memory() for view in self.playlist_views.values())
+        
+        while len(self.playlist_views) > 1 and (len(self.playlist_views) > max_views or total_bytes > max_bytes):
+            playlist_id, view = next(iter(self.playlist_views.items()))
+            if view is self.playlist_view:
+                break
+            del self.playlist_views[playlist_id]
+            total_bytes -= view.estimated_memory()
+            logger.info(f"释放播放列表页面: {playlist_id}")
+            self.destroy_playlist_view(view)
+    
+    def destroy_playlist_view(self, view):
+        """停止视图的后台线程并删除视图
+        :param view: 播放列表视图
+        """
+        if self.stacked_widget.indexOf(view) != -1:
+            self.stacked_widget.removeWidget(view)
+        view.stop_background_threads()
+        view.deleteLater()
     
     def adjust_layout(self, collapsed):
         """根据侧边栏折叠状态调整布局
@@ -403,10 +457,8 @@ class HomePage(QMainWindow):
         # 延迟绘制标志，防止过度重绘
         self.is_adjusting_layout = True
         
-        # 更新主内容区域的风格表
+        # 主内容区域的背景由主题提供，这里不再重设样式表（会让整个页面重新polish）
         if hasattr(self, 'stacked_widget'):
-            self.stacked_widget.setStyleSheet("background-color: #040404;")
-            
             # 获取当前显示的控件
             current_widget = self.stacked_widget.currentWidget()
             if current_widget:
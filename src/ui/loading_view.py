@@ -27,11 +27,11 @@ class LoadingView(QWidget):
         self.message_key = message_key
         self.default_message = message or "加载中..."
         
-        # 安全计时器，防止加载页面无限显示
+        # 安全计时器，防止加载页面无限显示；只在页面可见时计时，隐藏时停止
         self.safety_timer = QTimer(self)
         self.safety_timer.setSingleShot(True)
+        self.safety_timer.setInterval(10000)  # 10秒安全超时
         self.safety_timer.timeout.connect(self.on_safety_timeout)
-        self.safety_timer.start(10000)  # 10秒安全超时
         
         # 初始化UI
         self.init_ui()
@@ -80,6 +80,16 @@ class LoadingView(QWidget):
         # 更新界面文本
         self.update_ui_texts()
     
+    def showEvent(self, event):
+        """页面显示时开始安全计时"""
+        super().showEvent(event)
+        self.safety_timer.start()
+    
+    def hideEvent(self, event):
+        """页面隐藏时停止安全计时"""
+        super().hideEvent(event)
+        self.safety_timer.stop()
+    
     def update_ui_texts(self):
         """更新界面文本"""
         self.message_label.setText(self.language_manager.get_text(self.message_key, self.default_message))
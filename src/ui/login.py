@@ -196,9 +196,6 @@ class LoginWindow(QMainWindow):
             logger.info("更新UI文本")
             self.update_ui_texts()
             
-            # 应用全局样式修复，防止白色背景
-            self._apply_dark_theme_fixes()
-            
             # 设置计时器检查授权状态
             self.auth_timer = QTimer(self)
             self.auth_timer.timeout.connect(self.check_auth_status)
@@ -221,44 +218,6 @@ class LoginWindow(QMainWindow):
             import traceback
             traceback.print_exc()
     
-    def _apply_dark_theme_fixes(self):
-        """应用深色主题修复，确保没有白色背景"""
-        try:
-            # 获取应用程序实例
-            app = QApplication.instance()
-            if not app:
-                return
-                
-            # 添加更多全局样式，覆盖QComboBox和QMenu的默认白色背景
-            additional_style = """
-                QComboBox QAbstractItemView, QComboBoxPrivateContainer {
-                    background-color: #282828;
-                    color: white;
-                    border: none;
-                    outline: none;
-                    padding: 0px;
-                    margin: 0px;
-                }
-                QListView, QTreeView, QTableView {
-                    background-color: #282828;
-                    color: white;
-                    border: none;
-                }
-                QWidget#qt_scrollarea_viewport {
-                    background-color: #282828;
-                }
-            """
-            
-            # 检查是否已经有样式表，并追加新样式
-            current_style = app.styleSheet()
-            if "QComboBox QAbstractItemView" not in current_style:
-                app.setStyleSheet(current_style + additional_style)
-                
-        except Exception as e:
-            logger.error(f"应用深色主题修复失败: {str(e)}")
-            import traceback
-            traceback.print_exc()
-            
     def center_window(self):
         """窗口居中显示"""
         try:
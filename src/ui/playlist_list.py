@@ -0,0 +1,311 @@
+"""
+侧边栏歌单列表 - 基于模型/视图的虚拟化列表
+
+只有可见的行会被绘制，封面在行第一次绘制时才请求加载，
+歌单再多也不会为每个歌单创建控件或线程。折叠时同一个列表只显示封面图标。
+筛选只改变模型中显示哪些歌单，不重新创建任何行或控件。
+"""
+from PyQt5.QtWidgets import QListView, QStyledItemDelegate, QStyle, QAbstractItemView
+from PyQt5.QtGui import QColor, QFont, QPainter, QFontMetrics, QPixmap
+from PyQt5.QtCore import Qt, QAbstractListModel, QModelIndex, QRect, QSize, pyqtSignal
+
+from src.utils.image_utils import device_pixel_ratio, pick_image_url
+from src.ui.virtual_list import CoverCacheMixin, UniformRowsMixin
+
+PlaylistRole = Qt.UserRole + 1
+
+
+def playlist_image_url(playlist, ratio=None):
+    """
+    获取侧边栏歌单封面的图片URL
+    :param playlist: 歌单数据
+    :param ratio: 屏幕缩放比例，为None时使用当前应用的缩放比例
+    :return: 图片URL，没有封面时返回空字符串
+    """
+    return pick_image_url(playlist.get("images"), PlaylistItemDelegate.ICON_SIZE, ratio)
+
+
+class PlaylistListModel(CoverCacheMixin, QAbstractListModel):
+    """歌单列表模型"""
+    cover_requested = pyqtSignal(str)  # 需要加载封面的图片URL
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._all_playlists = []  # 全部歌单
+        self._all_urls = []  # 与全部歌单一一对应的封面URL
+        self._playlists = []  # 当前显示的歌单（筛选后）
+        self._urls = []  # 与显示的歌单一一对应的封面URL
+        self._init_covers()
+        self._selected_id = None
+
+    def set_playlists(self, playlists):
+        """
+        替换全部歌单，同时清除筛选
+        :param playlists: 按显示顺序排列的歌单列表
+        """
+        self._all_playlists = list(playlists)
+        ratio = device_pixel_ratio()
+        self._all_urls = [playlist_image_url(playlist, ratio) for playlist in self._all_playlists]
+        self._requested = set()
+        self.set_filter_rows(None)
+
+    def set_filter_rows(self, rows):
+        """
+        只显示一部分歌单
+        :param rows: 要显示的歌单在全部歌单中的序号列表（按显示顺序），为None时显示全部
+        """
+        self.beginResetModel()
+        if rows is None:
+            self._playlists = self._all_playlists
+            self._urls = self._all_urls
+        else:
+            self._playlists = [self._all_playlists[i] for i in rows]
+            self._urls = [self._all_urls[i] for i in rows]
+        self._reset_url_rows()
+        self.endResetModel()
+
+    def playlists(self):
+        """获取按显示顺序排列的全部歌单（不受筛选影响）"""
+        return self._all_playlists
+
+    def playlist(self, row):
+        """获取一行的歌单数据"""
+        return self._playlists[row]
+
+    def cover_url(self, row):
+        """获取一行的封面URL"""
+        return self._urls[row]
+
+    def _row_cover_urls(self, first, last):
+        """获取一段显示行的封面URL"""
+        return self._urls[first:last]
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._playlists)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or index.row() >= len(self._playlists):
+            return None
+        playlist = self._playlists[index.row()]
+
+        if role == Qt.DisplayRole:
+            return playlist.get("name", "未知播放列表")
+        if role == PlaylistRole:
+            return playlist
+        return None
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        return Qt.ItemIsEnabled
+
+    # ---------- 选中 ----------
+
+    def selected_id(self):
+        """当前选中的歌单ID"""
+        return self._selected_id
+
+    def set_selected_id(self, playlist_id):
+        """
+        设置选中的歌单并刷新前后两个选中行
+        :param playlist_id: 歌单ID，为None时取消选中
+        """
+        previous = self._selected_id
+        self._selected_id = playlist_id
+        for row, playlist in enumerate(self._playlists):
+            if playlist.get("id") in (previous, playlist_id):
+                index = self.index(row)
+                self.dataChanged.emit(index, index)
+
+
+
+class PlaylistItemDelegate(QStyledItemDelegate):
+    """绘制歌单行：封面和名称，折叠时只绘制封面"""
+
+    ROW_HEIGHT = 50
+    ROW_SPACING = 2
+    COLLAPSED_ROW_HEIGHT = 48
+    PADDING = 8
+    ICON_SIZE = 40
+
+    def __init__(self, default_icon=None, parent=None):
+        """
+        :param default_icon: 没有封面或封面未加载时显示的图标
+        :param parent: 父对象
+        """
+        super().__init__(parent)
+        self.collapsed = False
+        self.default_icon = default_icon if default_icon is not None else QPixmap()
+        if not self.default_icon.isNull():
+            self.default_icon = self.default_icon.scaled(self.ICON_SIZE, self.ICON_SIZE,
+                                                         Qt.KeepAspectRatio, Qt.SmoothTransformation)
+
+        self.title_font = QFont()
+        self.title_font.setPixelSize(14)
+        self.title_font.setWeight(QFont.DemiBold)
+        self.title_metrics = QFontMetrics(self.title_font)
+
+    def sizeHint(self, option, index):
+        if self.collapsed:
+            return QSize(option.rect.width(), self.COLLAPSED_ROW_HEIGHT)
+        return QSize(option.rect.width(), self.ROW_HEIGHT + self.ROW_SPACING)
+
+    def paint(self, painter, option, index):
+        playlist = index.data(PlaylistRole)
+        if playlist is None:
+            return
+
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        model = index.model()
+        selected = playlist.get("id") is not None and playlist.get("id") == model.selected_id()
+        hovered = option.state & QStyle.State_MouseOver
+
+        if self.collapsed:
+            icon_rect = QRect(0, 0, self.ICON_SIZE, self.ICON_SIZE)
+            icon_rect.moveCenter(option.rect.center())
+            if selected or hovered:
+                painter.setPen(Qt.NoPen)
+                painter.setBrush(QColor("#282828"))
+                painter.drawEllipse(icon_rect)
+            self._paint_icon(painter, icon_rect.adjusted(2, 2, -2, -2), model, model.cover_url(index.row()))
+            painter.restore()
+            return
+
+        rect = option.rect.adjusted(0, 0, 0, -self.ROW_SPACING)
+        if selected or hovered:
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(QColor("#282828") if selected else QColor("#1A1A1A"))
+            painter.drawRoundedRect(rect, 4, 4)
+
+        icon_rect = QRect(rect.left() + self.PADDING, rect.top() + (rect.height() - self.ICON_SIZE) // 2,
+                          self.ICON_SIZE, self.ICON_SIZE)
+        self._paint_icon(painter, icon_rect, model, model.cover_url(index.row()))
+
+        text_left = icon_rect.right() + 1 + self.PADDING
+        text_rect = QRect(text_left, rect.top(), max(0, rect.right() - self.PADDING - text_left), rect.height())
+        painter.setFont(self.title_font)
+        painter.setPen(QColor("#FFFFFF"))
+        painter.drawText(text_rect, Qt.AlignLeft | Qt.AlignVCenter,
+                         self.title_metrics.elidedText(index.data(Qt.DisplayRole), Qt.ElideRight, text_rect.width()))
+        painter.restore()
+
+    def _paint_icon(self, painter, rect, model, url):
+        """绘制歌单封面，未加载时显示默认图标"""
+        pixmap = model.cover(url) if url else None
+        if pixmap is None or pixmap.isNull():
+            pixmap = self.default_icon
+        if not pixmap.isNull():
+            # 高分屏的封面像素更多，按逻辑尺寸绘制
+            ratio = pixmap.devicePixelRatio()
+            target = QRect(0, 0, min(round(pixmap.width() / ratio), rect.width()),
+                           min(round(pixmap.height() / ratio), rect.height()))
+            target.moveCenter(rect.center())
+            painter.drawPixmap(target, pixmap)
+            return
+
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(QColor("#282828"))
+        painter.drawRoundedRect(rect, 4, 4)
+        painter.setPen(QColor("#B3B3B3"))
+        painter.drawText(rect, Qt.AlignCenter, "🎵")
+
+
+class PlaylistListView(UniformRowsMixin, QListView):
+    """虚拟化的歌单列表视图，所有行等高"""
+    playlist_clicked = pyqtSignal(object)  # 点击的歌单数据
+    hover_started = pyqtSignal(object)  # 鼠标进入歌单行
+    hover_ended = pyqtSignal(object)  # 鼠标离开歌单行
+
+    LAYOUT_BATCH_SIZE = 100  # 筛选后每个事件循环布局的行数
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._hover_row = -1
+        self.setUniformItemSizes(True)
+        self.setBatchSize(self.LAYOUT_BATCH_SIZE)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.verticalScrollBar().setSingleStep(20)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.setSelectionMode(QAbstractItemView.NoSelection)
+        self.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.setFocusPolicy(Qt.NoFocus)
+        self.setMouseTracking(True)
+        self.viewport().setAttribute(Qt.WA_Hover)
+        self.setFrameShape(QListView.NoFrame)
+        self.setViewportMargins(5, 0, 5, 0)
+
+    def set_collapsed(self, collapsed):
+        """
+        切换折叠显示（只显示封面图标）
+        :param collapsed: 是否折叠
+        """
+        delegate = self.itemDelegate()
+        if not isinstance(delegate, PlaylistItemDelegate) or delegate.collapsed == collapsed:
+            return
+        # 行高变化后保持第一行可见的歌单不变
+        visible = self.visible_rows()
+        delegate.collapsed = collapsed
+        margin = 0 if collapsed else 5
+        self.setViewportMargins(margin, 0, margin, 0)
+        # 所有行等高，只需重新布局一次
+        self.doItemsLayout()
+        if visible is not None:
+            self.scrollTo(self.model().index(visible[0], 0), QAbstractItemView.PositionAtTop)
+        self.viewport().update()
+
+    def set_filter_rows(self, rows):
+        """
+        只显示一部分歌单并回到顶部
+        筛选后的布局分批完成，按键时只布局第一批行，其余的行在之后的事件循环中补齐
+        :param rows: 要显示的歌单在全部歌单中的序号列表，为None时显示全部
+        """
+        self.setLayoutMode(QListView.Batched)
+        self.model().set_filter_rows(rows)
+        self.scrollToTop()
+
+    def updateGeometries(self):
+        super().updateGeometries()
+        # 分批布局完成后恢复一次布局全部行，之后调整大小时滚动位置不会被尚未布局的行截断
+        if self.layoutMode() == QListView.Batched and self._layout_finished():
+            self.setLayoutMode(QListView.SinglePass)
+
+    def _layout_finished(self):
+        """所有行是否都已布局（滚动范围覆盖全部行）"""
+        count = self.model().rowCount() if self.model() is not None else 0
+        if not count:
+            return True
+        content_height = self.verticalScrollBar().maximum() + self.viewport().height()
+        return content_height >= count * self.sizeHintForRow(0)
+
+    def reset(self):
+        # 模型重置后之前悬停的行号不再有效
+        self._hover_row = -1
+        super().reset()
+
+    def mousePressEvent(self, event):
+        index = self.indexAt(event.pos())
+        if event.button() == Qt.LeftButton and index.isValid():
+            self.playlist_clicked.emit(index.data(PlaylistRole))
+        super().mousePressEvent(event)
+
+    def mouseMoveEvent(self, event):
+        self._set_hover_row(self.indexAt(event.pos()).row())
+        super().mouseMoveEvent(event)
+
+    def leaveEvent(self, event):
+        self._set_hover_row(-1)
+        super().leaveEvent(event)
+
+    def _set_hover_row(self, row):
+        """鼠标所在的行变化时发送离开和进入信号"""
+        if row == self._hover_row:
+            return
+        model = self.model()
+        if 0 <= self._hover_row < model.rowCount():
+            self.hover_ended.emit(model.playlist(self._hover_row))
+        self._hover_row = row
+        if row >= 0:
+            self.hover_started.emit(model.playlist(row))
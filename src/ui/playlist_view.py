@@ -6,15 +6,22 @@ from datetime import datetime
 import os
 from PyQt5.QtWidgets import (QWidget, QLabel, QPushButton, QVBoxLayout, 
                            QHBoxLayout, QFileDialog, QMessageBox, 
-                           QScrollArea, QCheckBox,
+                           QStackedWidget, QCheckBox,
                            QLineEdit, QMenu, QAction)
-from PyQt5.QtGui import QPixmap, QImage
-from PyQt5.QtCore import Qt, pyqtSignal, QThread, QTimer, QSettings, QTime
-import requests
-from io import BytesIO
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
+from PyQt5.QtGui import QImage
+from PyQt5.QtCore import Qt, pyqtSignal, QThread, QTimer, QSettings
+from src.ui.song_list import (SongListModel, SongItemDelegate, SongListView, SongListBuilder,
+                              SongColumnLayout, SongListHeader)
+from src.ui.theme import set_style_property
 from src.utils.cache_manager import CacheManager
+from src.utils.image_manager import get_image_manager
+from src.utils.image_pool import ImageWorkerPool
+from src.utils.image_utils import PLAYLIST_COVER_SIZE, pick_image_url, scaled_pixmap
+from src.utils.search_index import SongSearchIndex
+from src.utils.song_selection import song_identity
+from src.utils.song_sorter import SongSorter, sort_chain
+from src.utils.track_fetcher import claim_or_wait, fetch_tracks, release_fetch, wait_for_fetch
+from src.utils.view_state import get_view_state_store
 from src.utils.language_manager import LanguageManager
 from src.utils.loading_indicator import LoadingIndicator
 from src.utils.logger import logger
@@ -22,55 +29,62 @@ from src.utils.logger import logger
 class SongLoader(QThread):
     """歌曲加载线程"""
     songs_loaded = pyqtSignal(list, bool)  # 第二个参数表示是否是从缓存加载的
+    search_index_ready = pyqtSignal(object)  # 搜索索引，在songs_loaded之前发送
     load_error = pyqtSignal(str)
     
-    def __init__(self, sp, playlist_id, cache_manager, force_refresh=False):
+    def __init__(self, sp, playlist_id, cache_manager, force_refresh=False, build_search_index=False):
         super().__init__()
         self.sp = sp
         self.playlist_id = playlist_id
         self.cache_manager = cache_manager
         self.force_refresh = force_refresh  # 是否强制刷新，不使用缓存
+        self.build_search_index = build_search_index  # 是否在加载线程中生成搜索索引
     
     def run(self):
         try:
             logger.info(f"开始加载播放列表: {self.playlist_id}，强制刷新: {self.force_refresh}")
             
-            # 如果不是强制刷新，首先尝试从缓存加载
-            if not self.force_refresh:
-                logger.info(f"尝试从缓存加载播放列表: {self.playlist_id}")
-                cached_tracks = self.cache_manager.get_cached_tracks(self.playlist_id)
-                if cached_tracks:
-                    logger.info(f"成功从缓存加载播放列表: {self.playlist_id}, 共{len(cached_tracks)}首歌曲")
-                    # 发送加载完成信号，并标记为从缓存加载
-                    self.songs_loaded.emit(cached_tracks, True)
+            # 同一歌单正在被其他线程（例如悬停预取、缓存预热）加载时，等它完成后再读缓存；
+            # 检查和登记在同一次加锁中完成，不会有两个线程同时请求同一个歌单
+            while True:
+                owner, done = claim_or_wait(self.playlist_id)
+                if owner:
+                    break
+                logger.info(f"播放列表正在加载中，等待其完成: {self.playlist_id}")
+                if not wait_for_fetch(done, self.isInterruptionRequested):
+                    return
+                if not self.force_refresh and self._load_from_cache():
                     return
-                logger.info(f"缓存中未找到播放列表或缓存已过期: {self.playlist_id}")
-            else:
-                logger.info(f"强制从API刷新播放列表: {self.playlist_id}")
-            
-            # 如果没有缓存或强制刷新，从API加载
-            tracks = []
-            logger.info(f"开始从API加载播放列表: {self.playlist_id}")
-            results = self.sp.playlist_tracks(self.playlist_id)
-            
-            # 添加原始索引
-            for i, item in enumerate(results['items']):
-                item['original_index'] = i + 1
-                tracks.append(item)
-            
-            while results['next']:
-                logger.info(f"加载更多播放列表歌曲，当前已加载: {len(tracks)}首")
-                results = self.sp.next(results)
-                for i, item in enumerate(results['items'], len(tracks) + 1):
-                    item['original_index'] = i
-                    tracks.append(item)
             
-            # 缓存歌曲列表
-            logger.info(f"播放列表加载完成，准备缓存: {self.playlist_id}, 共{len(tracks)}首歌曲")
-            self.cache_manager.cache_tracks(self.playlist_id, tracks)
+            try:
+                # 如果不是强制刷新，首先尝试从缓存加载
+                if not self.force_refresh:
+                    if self._load_from_cache():
+                        return
+                    logger.info(f"缓存中未找到播放列表或缓存已过期: {self.playlist_id}")
+                else:
+                    logger.info(f"强制从API刷新播放列表: {self.playlist_id}")
+                
+                # 如果没有缓存或强制刷新，从API加载
+                logger.info(f"开始从API加载播放列表: {self.playlist_id}")
+                # 每到一页就追加到索引，加载完成时索引也已就绪
+                search_index = SongSearchIndex() if self.build_search_index else None
+                tracks = fetch_tracks(self.sp, self.playlist_id, self.isInterruptionRequested,
+                                      search_index.add_songs if search_index is not None else None)
+                if tracks is None:
+                    logger.info(f"播放列表加载已取消: {self.playlist_id}")
+                    return
+                
+                # 缓存歌曲列表
+                logger.info(f"播放列表加载完成，准备缓存: {self.playlist_id}, 共{len(tracks)}首歌曲")
+                self.cache_manager.cache_tracks(self.playlist_id, tracks)
+            finally:
+                release_fetch(self.playlist_id, done)
             
             # 发送加载完成信号，并标记为从API加载
             logger.info(f"从API加载播放列表完成: {self.playlist_id}")
+            if search_index is not None:
+                self.search_index_ready.emit(search_index)
             self.songs_loaded.emit(tracks, False)
             
         except Exception as e:
@@ -78,6 +92,38 @@ class SongLoader(QThread):
             import traceback
             logger.error(traceback.format_exc())
             self.load_error.emit(str(e))
+    
+    def _load_from_cache(self):
+        """从缓存加载歌曲并发送信号
+        :return: 缓存中有歌曲时返回True
+        """
+        logger.info(f"尝试从缓存加载播放列表: {self.playlist_id}")
+        cached_tracks = self.cache_manager.get_cached_tracks(self.playlist_id)
+        if not cached_tracks:
+            return False
+        logger.info(f"成功从缓存加载播放列表: {self.playlist_id}, 共{len(cached_tracks)}首歌曲")
+        if self.build_search_index:
+            self.search_index_ready.emit(SongSearchIndex(cached_tracks))
+        # 发送加载完成信号，并标记为从缓存加载
+        self.songs_loaded.emit(cached_tracks, True)
+        return True
+
+def load_image(url, image_type, cache_manager):
+    """
+    加载图片，优先使用缓存，失败时返回透明的空图片
+    :param url: 图片URL
+    :param image_type: 图片类型（playlist/track）
+    :param cache_manager: 缓存管理器
+    :return: QImage
+    """
+    image = get_image_manager().fetch(url, image_type, cache_manager)
+    return image if image is not None else _empty_image()
+
+def _empty_image():
+    """创建一个空图片作为替代"""
+    empty_image = QImage(100, 100, QImage.Format_ARGB32)
+    empty_image.fill(Qt.transparent)
+    return empty_image
 
 class ImageLoader(QThread):
     """图像加载线程"""
@@ -90,84 +136,20 @@ class ImageLoader(QThread):
         self.cache_manager = cache_manager
     
     def run(self):
-        try:
-            # 输出详细日志，帮助调试
-            logger.debug(f"正在加载图片: {self.url} 类型: {'playlist' if self.track_id == 'playlist_cover' else 'track'}")
-            
-            # 确定图片类型
-            image_type = 'playlist' if self.track_id == 'playlist_cover' else 'track'
-            
-            # 首先尝试从缓存加载
-            cached_image = self.cache_manager.get_cached_image(self.url, image_type)
-            if cached_image and not cached_image.isNull():
-                logger.debug(f"图片已从缓存加载: {self.url}")
-                self.image_loaded.emit(cached_image, self.track_id)
-                return
-            
-            # 如果没有缓存，从网络加载
-            logger.debug(f"从网络加载图片: {self.url}")
-            
-            # 检查URL是否有效
-            if not self.url or not self.url.startswith('http'):
-                logger.error(f"无效的图片URL: {self.url}")
-                # 创建一个空图片作为替代
-                empty_image = QImage(100, 100, QImage.Format_ARGB32)
-                empty_image.fill(Qt.transparent)
-                self.image_loaded.emit(empty_image, self.track_id)
-                return
-                
-            # 创建会话并设置重试机制
-            session = requests.Session()
-            retries = Retry(total=3, backoff_factor=0.5)
-            session.mount('https://', HTTPAdapter(max_retries=retries))
-            
-            # 设置超时时间
-            response = session.get(self.url, timeout=10)
-            response.raise_for_status()
-            
-            # 加载图片
-            img_data = BytesIO(response.content)
-            image = QImage()
-            load_success = image.loadFromData(img_data.getvalue())
-            
-            # 检查图片是否有效
-            if not load_success or image.isNull():
-                logger.debug(f"加载的图片无效: {self.url}")
-                # 创建一个空图片作为替代
-                empty_image = QImage(100, 100, QImage.Format_ARGB32)
-                empty_image.fill(Qt.transparent)
-                self.image_loaded.emit(empty_image, self.track_id)
-                return
-                
-            logger.debug(f"图片加载成功: {self.url}, 大小: {image.width()}x{image.height()}")
-            
-            # 缓存图片
-            try:
-                self.cache_manager.cache_image(self.url, image, image_type)
-                logger.debug(f"图片已缓存: {self.url}")
-            except Exception as cache_err:
-                logger.error(f"缓存图片失败: {str(cache_err)}")
-                # 缓存失败不影响继续使用图片
-            
-            # 发送信号
-            self.image_loaded.emit(image, self.track_id)
-            
-        except requests.exceptions.RequestException as req_err:
-            logger.error(f"网络请求错误: {self.url} - {str(req_err)}")
-            # 创建一个空图片作为替代
-            empty_image = QImage(100, 100, QImage.Format_ARGB32)
-            empty_image.fill(Qt.transparent)
-            self.image_loaded.emit(empty_image, self.track_id)
-        except Exception as e:
-            import traceback
-            logger.error(f"加载图片失败: {self.url} - {str(e)}")
-            logger.error(traceback.format_exc())  # 打印更详细的错误信息
-            # 创建一个空图片作为替代
-            empty_image = QImage(100, 100, QImage.Format_ARGB32)
-            empty_image.fill(Qt.transparent)
-            self.image_loaded.emit(empty_image, self.track_id)
+        # 确定图片类型
+        image_type = 'playlist' if self.track_id == 'playlist_cover' else 'track'
+        self.image_loaded.emit(load_image(self.url, image_type, self.cache_manager), self.track_id)
 
 class PlaylistView(QWidget):
+    COVER_WORKERS = 4  # 同时加载封面的线程数
+    SEARCH_DELAY = 150  # 搜索防抖时间（毫秒）
+    SONG_MEMORY_ESTIMATE = 4 * 1024  # 每首歌的数据、搜索索引和行数据大约占用的字节数
+    COVER_SIZE = PLAYLIST_COVER_SIZE  # 歌单封面的最大显示尺寸
+    THREAD_STOP_WAIT = 100  # 销毁视图时等待每个后台线程退出的最长时间（毫秒）
+    
+    # 销毁视图时还没退出的后台线程，保持引用直到线程结束，避免线程对象运行中被回收
+    _detached_threads = set()
+    
     def __init__(self, sp, playlist, parent=None, language_manager=None, cache_manager=None):
         super().__init__(parent)
         
@@ -219,43 +201,35 @@ class PlaylistView(QWidget):
         self.visible_songs = []  # 存储过滤后的可见歌曲
         self.loaded = False  # 初始化状态
         self.is_loading = False  # 是否正在加载中
-        self.is_loading_more = False  # 是否正在加载更多歌曲
-        self.remaining_tracks = []  # 剩余待加载的歌曲
-        self.scroll_position = 0  # 当前滚动位置
         self.sort_key = self.settings.value("playlist_sort_key", "order")  # 默认按照原始顺序排序
         self.sort_reverse = self.settings.value("playlist_sort_reverse", "false") == "true"  # 默认升序
+        self.sort_secondary = self.settings.value("playlist_sort_secondary", "")  # 次要排序键，为空时自动选择
         self.search_text = ""  # 搜索文本
+        self.search_index = None  # 搜索索引，第一次搜索时生成
+        self.refreshed_search_index = None  # 后台刷新生成的搜索索引，刷新完成时替换search_index
+        self.song_sorter = None  # 排序器，缓存各排序键的顺序
         self.export_mode = False  # 是否处于导出模式
         self.width_factor = 1.0  # 宽度缩放比例
         
-        # 存储歌曲选择状态（用于导出）
-        self.song_checkboxes = []  # 改为列表存储复选框
-        
-        # UI刷新计时器
-        self.update_timer = QTimer(self)
-        self.update_timer.setInterval(500)  # 0.5秒
-        self.update_timer.timeout.connect(self.update_ui)
-        
-        # 滚动优化计时器
-        self.scroll_timer = QTimer(self)
-        self.scroll_timer.setSingleShot(True)
-        self.scroll_timer.setInterval(100)  # 0.1秒
-        self.scroll_timer.timeout.connect(self.on_scroll_end)
+        # 上次离开这个歌单时的视图状态：排序和搜索立即生效，滚动位置和勾选在歌曲加载完成后恢复
+        self.saved_view_state = get_view_state_store().get(self.playlist_id)
+        if self.saved_view_state:
+            self.sort_key = self.saved_view_state.get('sort_key', self.sort_key)
+            self.sort_reverse = self.saved_view_state.get('sort_reverse', self.sort_reverse)
+            self.sort_secondary = self.saved_view_state.get('sort_secondary', self.sort_secondary)
+            self.search_text = self.saved_view_state.get('search', '').strip()
         
         # 初始化界面
         self.init_ui()
+        if self.saved_view_state and self.search_text:
+            self.search_box.blockSignals(True)
+            self.search_box.setText(self.saved_view_state['search'])
+            self.search_box.blockSignals(False)
         
         # 加载封面和歌曲
         self.load_playlist_image()
         self.load_songs()
     
-        # 窗口大小变化初始值
-        self.last_width = self.width()
-        
-        # 初始化重绘时间
-        self.last_redraw_time = QTime.currentTime().msecsSinceStartOfDay()
-        self.is_redrawing = False
-    
 
         
     def init_ui(self):
@@ -267,7 +241,7 @@ class PlaylistView(QWidget):
         
         # 创建顶部容器
         top_container = QWidget()
-        top_container.setStyleSheet("background-color: #121212;")
+        top_container.setObjectName("playlistHeader")
         top_layout = QVBoxLayout(top_container)
         top_layout.setContentsMargins(30, 30, 30, 20)
         top_layout.setSpacing(20)
@@ -280,8 +254,8 @@ class PlaylistView(QWidget):
         
         # 创建播放列表图片标签
         self.playlist_image = QLabel()
-        self.playlist_image.setFixedSize(192, 192)
-        self.playlist_image.setStyleSheet("background-color: #282828; border-radius: 4px;")
+        self.playlist_image.setFixedSize(self.COVER_SIZE, self.COVER_SIZE)
+        self.playlist_image.setObjectName("playlistCover")
         self.playlist_image.setAlignment(Qt.AlignCenter)
         
         # 创建加载指示器
@@ -304,12 +278,12 @@ class PlaylistView(QWidget):
         
         # 创建标题标签
         self.title_label = QLabel(self.playlist_name)
-        self.title_label.setStyleSheet("color: white; font-size: 28px; font-weight: bold;")
+        self.title_label.setObjectName("playlistTitle")
         info_layout.addWidget(self.title_label)
         
         # 创建状态标签
         self.status_label = QLabel()
-        self.status_label.setStyleSheet("color: #b3b3b3; font-size: 14px;")
+        self.status_label.setObjectName("playlistStatus")
         info_layout.addWidget(self.status_label)
         
         # 创建按钮容器
@@ -321,72 +295,34 @@ class PlaylistView(QWidget):
         
         # 创建导出按钮
         self.export_button = QPushButton(self.get_text("playlist.export_button", "导出"))
-        self.export_button.setStyleSheet("""
-            QPushButton {
-                background-color: #1DB954;
-                color: white;
-                border-radius: 4px;
-                padding: 5px 15px;
-                font-weight: bold;
-                font-size: 14px;
-            }
-            QPushButton:hover {
-                background-color: #1ED760;
-            }
-        """)
+        self.export_button.setProperty("variant", "primary")
         self.export_button.clicked.connect(self.export_selected)
         button_layout.addWidget(self.export_button)
         
         # 创建取消导出按钮（默认隐藏）
         self.cancel_export_button = QPushButton(self.get_text("common.cancel", "取消"))
-        self.cancel_export_button.setStyleSheet("""
-            QPushButton {
-                background-color: #333;
-                color: white;
-                border-radius: 4px;
-                padding: 5px 15px;
-                font-size: 14px;
-            }
-            QPushButton:hover {
-                background-color: #444;
-            }
-        """)
+        self.cancel_export_button.setProperty("variant", "secondary")
         self.cancel_export_button.clicked.connect(self.toggle_export_mode)
         self.cancel_export_button.hide()
         button_layout.addWidget(self.cancel_export_button)
         
         # 创建全选按钮（默认隐藏）
         self.select_all_button = QPushButton(self.get_text("playlist.select_all", "全选"))
-        self.select_all_button.setStyleSheet("""
-            QPushButton {
-                background-color: #333;
-                color: white;
-                border-radius: 4px;
-                padding: 5px 15px;
-                font-size: 14px;
-            }
-            QPushButton:hover {
-                background-color: #444;
-            }
-        """)
+        self.select_all_button.setProperty("variant", "secondary")
         self.select_all_button.clicked.connect(self.select_all_songs)
         self.select_all_button.hide()
         button_layout.addWidget(self.select_all_button)
         
+        # 创建反选按钮（默认隐藏）
+        self.invert_selection_button = QPushButton(self.get_text("playlist.invert_selection", "反选"))
+        self.invert_selection_button.setProperty("variant", "secondary")
+        self.invert_selection_button.clicked.connect(self.invert_song_selection)
+        self.invert_selection_button.hide()
+        button_layout.addWidget(self.invert_selection_button)
+        
         # 创建清除选择按钮（默认隐藏）
         self.clear_selection_button = QPushButton(self.get_text("playlist.clear", "清空"))
-        self.clear_selection_button.setStyleSheet("""
-            QPushButton {
-                background-color: #333;
-                color: white;
-                border-radius: 4px;
-                padding: 5px 15px;
-                font-size: 14px;
-            }
-            QPushButton:hover {
-                background-color: #444;
-            }
-        """)
+        self.clear_selection_button.setProperty("variant", "secondary")
         self.clear_selection_button.clicked.connect(self.clear_song_selection)
         self.clear_selection_button.hide()
         button_layout.addWidget(self.clear_selection_button)
@@ -399,28 +335,7 @@ class PlaylistView(QWidget):
         
         # 创建全选复选框
         self.select_all_checkbox = QCheckBox(self.get_text("playlist.select_all", "全选"))
-        self.select_all_checkbox.setStyleSheet("""
-            QCheckBox {
-                color: white;
-                font-size: 14px;
-                background-color: transparent;
-            }
-            QCheckBox::indicator {
-                width: 18px;
-                height: 18px;
-            }
-            QCheckBox::indicator:unchecked {
-                border: 2px solid #b3b3b3;
-                border-radius: 4px;
-                background-color: transparent;
-            }
-            QCheckBox::indicator:checked {
-                border: 2px solid #1DB954;
-                border-radius: 4px;
-                background-color: #1DB954;
-                image: url(./assets/check.png);
-            }
-        """)
+        self.select_all_checkbox.setObjectName("selectAllCheckbox")
         self.select_all_checkbox.stateChanged.connect(self.on_select_all_changed)
         self.select_all_checkbox.hide()
         select_all_layout.addWidget(self.select_all_checkbox)
@@ -430,39 +345,30 @@ class PlaylistView(QWidget):
         
         # 创建刷新按钮
         self.refresh_button = QPushButton(self.get_text("playlist.refresh", "刷新"))
-        self.refresh_button.setStyleSheet("""
-            QPushButton {
-                background-color: #333;
-                color: white;
-                border-radius: 4px;
-                padding: 5px 15px;
-                font-size: 14px;
-            }
-            QPushButton:hover {
-                background-color: #444;
-            }
-        """)
+        self.refresh_button.setProperty("variant", "secondary")
         self.refresh_button.clicked.connect(self.refresh_songs)
         button_layout.addWidget(self.refresh_button)
         
+        # 创建排序按钮
+        self.sort_button = QPushButton(self.get_text("playlist.sort_by", "排序方式"))
+        self.sort_button.setProperty("variant", "secondary")
+        self.sort_button.clicked.connect(self.show_sort_menu)
+        button_layout.addWidget(self.sort_button)
+        
         # 添加按钮容器到信息布局
         info_layout.addWidget(button_container)
         
         # 添加搜索框
         self.search_box = QLineEdit()
         self.search_box.setPlaceholderText(self.get_text("playlist.search", "搜索歌曲名称..."))
-        self.search_box.setStyleSheet("""
-            QLineEdit {
-                background-color: #333;
-                color: white;
-                border-radius: 4px;
-                padding: 5px;
-                min-width: 200px;
-                max-width: 300px;
-                font-size: 14px;
-            }
-        """)
+        self.search_box.setObjectName("playlistSearch")
         self.search_box.textChanged.connect(self.on_search_changed)
+        
+        # 输入停顿后再搜索，避免每次按键都刷新列表
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(self.SEARCH_DELAY)
+        self.search_timer.timeout.connect(self.filter_songs)
         info_layout.addWidget(self.search_box)
         
         # 将信息容器添加到图片布局
@@ -474,51 +380,64 @@ class PlaylistView(QWidget):
         # 将顶部容器添加到主布局
         main_layout.addWidget(top_container)
         
-        # 创建滚动区域
-        self.scroll_area = QScrollArea()
-        self.scroll_area.setWidgetResizable(True)
-        self.scroll_area.setStyleSheet("""
-            QScrollArea {
-                background-color: #121212;
-                border: none;
-            }
-            QScrollBar:vertical {
-                background-color: #121212;
-                width: 12px;
-                margin: 0px;
-            }
-            QScrollBar::handle:vertical {
-                background-color: #535353;
-                min-height: 30px;
-                border-radius: 6px;
-            }
-            QScrollBar::handle:vertical:hover {
-                background-color: #636363;
-            }
-            QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {
-                height: 0px;
-            }
-            QScrollBar::add-page:vertical, QScrollBar::sub-page:vertical {
-                background-color: #121212;
-            }
-        """)
-        
-        # 创建歌曲列表容器
-        songs_container = QWidget()
-        songs_container.setObjectName("songs_container")
-        self.songs_layout = QVBoxLayout(songs_container)
-        self.songs_layout.setContentsMargins(20, 10, 20, 10)
-        self.songs_layout.setSpacing(5)
-        self.songs_layout.addStretch()  # 添加弹性空间
-        
-        # 设置滚动区域的内容
-        self.scroll_area.setWidget(songs_container)
-        
-        # 连接滚动信号
-        self.scroll_area.verticalScrollBar().valueChanged.connect(self.on_scroll)
-        
-        # 将滚动区域添加到主布局
-        main_layout.addWidget(self.scroll_area)
+        # 歌曲列表区域：加载页和列表页
+        self.song_stack = QStackedWidget()
+        self.song_stack.setObjectName("songStack")
+        
+        # 加载页
+        self.songs_loading_page = QWidget()
+        songs_loading_layout = QVBoxLayout(self.songs_loading_page)
+        songs_loading_layout.setAlignment(Qt.AlignCenter)
+        self.songs_loading_indicator = LoadingIndicator(self)
+        self.songs_loading_indicator.setFixedSize(48, 48)
+        songs_loading_layout.addWidget(self.songs_loading_indicator, 0, Qt.AlignCenter)
+        self.songs_loading_text = QLabel()
+        self.songs_loading_text.setObjectName("songsLoadingText")
+        self.songs_loading_text.setAlignment(Qt.AlignCenter)
+        songs_loading_layout.addWidget(self.songs_loading_text, 0, Qt.AlignCenter)
+        self.song_stack.addWidget(self.songs_loading_page)
+        
+        # 歌曲列表（模型/视图，只绘制可见行）
+        self.song_model = SongListModel(self)
+        self.song_model.cover_requested.connect(self.load_track_cover)
+        self.song_model.check_state_changed.connect(self.update_select_all_state)
+        self.song_builder = SongListBuilder(self.song_model, self)
+        
+        # 封面加载线程池：可见行优先，其次是附近的行，滚远的行取消
+        self.cover_pool = ImageWorkerPool(
+            lambda url: load_image(url, 'track', self.cache_manager),
+            max_workers=self.COVER_WORKERS, parent=self)
+        self.cover_pool.image_loaded.connect(self.on_track_image_loaded)
+        self.cover_priority_timer = QTimer(self)
+        self.cover_priority_timer.setSingleShot(True)
+        self.cover_priority_timer.setInterval(50)
+        self.cover_priority_timer.timeout.connect(self.update_cover_priorities)
+        # 表头和所有行共用一个列布局，列宽只在列表宽度变化时计算一次
+        self.song_columns = SongColumnLayout(self)
+        self.song_columns.show_artwork = self.settings.value("playlist_show_artwork", True, type=bool)
+        self.song_delegate = SongItemDelegate(self.song_columns, self)
+        self.song_list = SongListView(self.song_columns)
+        self.song_list.setModel(self.song_model)
+        self.song_list.setItemDelegate(self.song_delegate)
+        self.song_list.verticalScrollBar().valueChanged.connect(self.cover_priority_timer.start)
+        self.song_header = SongListHeader(self.song_list)
+        self.song_header.set_titles({
+            'title': self.get_text('playlist.column.title', "标题"),
+            'album': self.get_text('playlist.column.album', "专辑"),
+            'duration': self.get_text('playlist.column.duration', "时长")
+        })
+        
+        # 列表页：表头 + 列表
+        self.song_page = QWidget()
+        song_page_layout = QVBoxLayout(self.song_page)
+        song_page_layout.setContentsMargins(0, 0, 0, 0)
+        song_page_layout.setSpacing(0)
+        song_page_layout.addWidget(self.song_header)
+        song_page_layout.addWidget(self.song_list)
+        self.song_stack.addWidget(self.song_page)
+        
+        # 将歌曲列表区域添加到主布局
+        main_layout.addWidget(self.song_stack)
         
         # 设置窗口大小变化事件
         self.resizeEvent = self.on_resize
@@ -530,236 +449,51 @@ class PlaylistView(QWidget):
         # 调用父类的 resizeEvent
         super().resizeEvent(event)
         
-        # 检查宽度是否发生变化
+        # 可见行可能变化，重新排列封面加载顺序
+        self.cover_priority_timer.start()
+        
+        # 歌曲列的宽度由列表自己随视口宽度计算；这里只在跨过宽度档位时调整顶部控件的样式
         current_width = self.width()
-        if current_width != self.last_width:
-            self.last_width = current_width
-            
-            # 避免频繁重绘
-            current_time = QTime.currentTime().msecsSinceStartOfDay()
-            if current_time - self.last_redraw_time > 100 and not self.is_redrawing:  # 100ms防抖
-                self.is_redrawing = True
-                self.adjust_responsive_ui()
-                self.last_redraw_time = current_time
-                self.is_redrawing = False
+        width_factor = 0.8 if current_width < 800 else 0.9 if current_width < 1000 else 1.0
+        if width_factor != self.width_factor:
+            self.adjust_responsive_ui()
     
     def adjust_responsive_ui(self):
-        """根据当前宽度调整UI组件大小"""
+        """根据当前宽度调整UI组件大小（字号和边距由主题按 density 属性切换）"""
         current_width = self.width()
         
         # 根据窗口宽度动态调整组件大小
         if current_width < 800:
             # 窄屏适配
             self.width_factor = 0.8
-            # 调整标题字体大小
-            if hasattr(self, 'title_label') and self.title_label:
-                self.title_label.setStyleSheet("color: white; font-size: 22px; font-weight: bold;")
-                
-            # 调整按钮字体和大小
-            button_style = """
-                QPushButton {
-                    background-color: #333;
-                    color: white;
-                    border-radius: 4px;
-                    padding: 4px 10px;
-                    font-size: 12px;
-                }
-                QPushButton:hover {
-                    background-color: #444;
-                }
-            """
-            export_button_style = """
-            QPushButton {
-                background-color: #1DB954;
-                    color: white;
-                    border-radius: 4px;
-                    padding: 4px 10px;
-                    font-weight: bold;
-                    font-size: 12px;
-            }
-            QPushButton:hover {
-                background-color: #1ED760;
-                }
-            """
-            
-            # 调整搜索框宽度
-            if hasattr(self, 'search_box'):
-                self.search_box.setStyleSheet("""
-                    QLineEdit {
-                        background-color: #333;
-                        color: white;
-                        border-radius: 4px;
-                        padding: 4px;
-                        min-width: 150px;
-                        max-width: 200px;
-                        font-size: 12px;
-            }
-        """)
-            
-            # 调整播放列表封面(顶部大封面)图片大小
-            if hasattr(self, 'playlist_image') and self.playlist_image:
-                self.playlist_image.setFixedSize(150, 150)
-            
+            density = "compact"
+            cover_size = 150
         elif current_width < 1000:
             # 中等宽度适配
             self.width_factor = 0.9
-            # 调整播放列表封面(顶部大封面)图片大小
-            if hasattr(self, 'playlist_image') and self.playlist_image:
-                self.playlist_image.setFixedSize(180, 180)
-                
-            # 调整标题字体大小
-            if hasattr(self, 'title_label') and self.title_label:
-                self.title_label.setStyleSheet("color: white; font-size: 24px; font-weight: bold;")
-                
-            # 调整按钮字体和大小
-            button_style = """
-            QPushButton {
-                    background-color: #333;
-                color: white;
-                border-radius: 4px;
-                    padding: 5px 12px;
-                    font-size: 13px;
-            }
-            QPushButton:hover {
-                    background-color: #444;
-                }
-            """
-            export_button_style = """
-            QPushButton {
-                    background-color: #1DB954;
-                color: white;
-                border-radius: 4px;
-                    padding: 5px 12px;
-                    font-weight: bold;
-                    font-size: 13px;
-            }
-            QPushButton:hover {
-                    background-color: #1ED760;
-                }
-            """
-            
-            # 调整搜索框宽度
-            if hasattr(self, 'search_box'):
-                self.search_box.setStyleSheet("""
-                    QLineEdit {
-                        background-color: #333;
-                        color: white;
-                        border-radius: 4px;
-                        padding: 5px;
-                        min-width: 180px;
-                        max-width: 250px;
-                        font-size: 13px;
-            }
-        """)
-                
+            density = "medium"
+            cover_size = 180
         else:
-            # 宽屏适配
+            # 宽屏使用默认样式
             self.width_factor = 1.0
-            # 恢复默认播放列表封面(顶部大封面)图片大小
-            if hasattr(self, 'playlist_image') and self.playlist_image:
-                self.playlist_image.setFixedSize(192, 192)
-                
-            # 恢复标题字体大小
-            if hasattr(self, 'title_label') and self.title_label:
-                self.title_label.setStyleSheet("color: white; font-size: 28px; font-weight: bold;")
-                
-            # 标准按钮样式
-            button_style = """
-            QPushButton {
-                    background-color: #333;
-                color: white;
-                border-radius: 4px;
-                    padding: 5px 15px;
-                    font-size: 14px;
-            }
-            QPushButton:hover {
-                    background-color: #444;
-                }
-            """
-            export_button_style = """
-            QPushButton {
-                background-color: #1DB954;
-                color: white;
-                border-radius: 4px;
-                    padding: 5px 15px;
-                    font-weight: bold;
-                    font-size: 14px;
-            }
-            QPushButton:hover {
-                background-color: #1ED760;
-                }
-            """
-            
-            # 恢复搜索框默认样式
-            if hasattr(self, 'search_box'):
-                self.search_box.setStyleSheet("""
-                    QLineEdit {
-                        background-color: #333;
-                        color: white;
-                        border-radius: 4px;
-                        padding: 5px;
-                        min-width: 200px;
-                        max-width: 300px;
-                        font-size: 14px;
-            }
-        """)
-                
-        # 应用按钮样式
-        if hasattr(self, 'refresh_button'):
-            self.refresh_button.setStyleSheet(button_style)
-        if hasattr(self, 'sort_button'):
-            self.sort_button.setStyleSheet(button_style)
-        if hasattr(self, 'export_button'):
-            self.export_button.setStyleSheet(export_button_style)
-        if hasattr(self, 'confirm_export_button'):
-            self.confirm_export_button.setStyleSheet(export_button_style)
-        if hasattr(self, 'cancel_export_button'):
-            self.cancel_export_button.setStyleSheet(button_style)
-        if hasattr(self, 'select_all_button'):
-            self.select_all_button.setStyleSheet(button_style)
-        if hasattr(self, 'clear_selection_button'):
-            self.clear_selection_button.setStyleSheet(button_style)
-        
-        # 更新歌曲列表中的项目宽度 - 只调整标题和专辑列
-        self.update_song_item_widths()
+            density = None
+            cover_size = self.COVER_SIZE
+        
+        # 调整播放列表封面(顶部大封面)图片大小
+        self.playlist_image.setFixedSize(cover_size, cover_size)
+        
+        # 标题、搜索框和按钮只修改属性，不重新生成样式表
+        for widget in (self.title_label, self.search_box, self.export_button, self.cancel_export_button,
+                       self.select_all_button, self.invert_selection_button, self.clear_selection_button,
+                       self.refresh_button, self.sort_button):
+            set_style_property(widget, "density", density)
     
-    def update_song_item_widths(self):
-        """根据当前窗口宽度更新歌曲项的宽度比例"""
-        # 遍历所有歌曲项，调整其内部控件的宽度
-        for i in range(self.songs_layout.count() - 1):  # 减1是因为有一个stretch在最后
-            item = self.songs_layout.itemAt(i)
-            if item and item.widget():
-                song_item = item.widget()
-                
-                # 更新歌曲项的布局比例
-                if hasattr(song_item, 'layout') and song_item.layout():
-                    layout = song_item.layout()
-                    
-                    # 根据宽度因子调整各列宽度
-                    title_width = int(0.4 * self.width_factor * self.width())
-                    album_width = int(0.3 * self.width_factor * self.width())
-                    
-                    # 查找标题和专辑列，调整其大小
-                    for j in range(layout.count()):
-                        layout_item = layout.itemAt(j)
-                        if layout_item and layout_item.widget():
-                            widget = layout_item.widget()
-                            
-                            # 确保图片容器固定大小不变，只调整标题和专辑列
-                            if j == 2 and widget.objectName().startswith("artwork_"):  # 图片容器
-                                # 确保保持固定大小
-                                widget.setFixedSize(50, 50)
-                            elif j == 3:  # 标题列
-                                widget.setMinimumWidth(title_width)
-                            elif j == 4:  # 专辑列
-                                widget.setMinimumWidth(album_width)
-
     def load_playlist_info(self):
         """加载播放列表信息"""
         try:
             # 设置封面标签为"加载中"状态
             self.playlist_image.setText(self.get_text('playlist.loading', '加载中...'))
-            self.playlist_image.setStyleSheet("background-color: #282828; border-radius: 4px; color: white;")
+            set_style_property(self.playlist_image, "state", None)
             
             playlist_info = self.sp.playlist(self.playlist_id)
             self.playlist_name = playlist_info['name']
@@ -772,8 +506,8 @@ class PlaylistView(QWidget):
             self.status_label.setText(self.playlist_description)
             
             # 加载播放列表封面
-            if playlist_info['images']:
-                image_url = playlist_info['images'][0]['url']
+            image_url = pick_image_url(playlist_info['images'], self.COVER_SIZE)
+            if image_url:
                 # 首先尝试从缓存加载
                 cached_image = self.cache_manager.get_cached_image(image_url, 'playlist')
                 if cached_image:
@@ -783,7 +517,7 @@ class PlaylistView(QWidget):
                     # 否则异步加载
                     loader = ImageLoader(image_url, 'playlist_cover', self.cache_manager)
                     loader.image_loaded.connect(lambda image_id, image: self.on_cover_loaded(image, image_url))
-                    self.threads.append(loader)
+                    self.track_thread(loader)
                     loader.start()
             else:
                 # 没有图片，设置默认样式
@@ -811,32 +545,22 @@ class PlaylistView(QWidget):
             if image is None or image.isNull():
                 logger.debug(f"封面图片无效: {url}")
                 self.playlist_image.setText(self.get_text('playlist.load_failed', "加载失败"))
-                self.playlist_image.setStyleSheet("""
-                    background-color: #333;
-                    color: white;
-                    font-size: 14px;
-                    border-radius: 4px;
-                    text-align: center;
-                """)
+                set_style_property(self.playlist_image, "state", "placeholder")
                 return
                 
             # 图片有效，继续处理
             logger.debug(f"封面图片有效，大小: {image.width()}x{image.height()}")
             
-            # 保持矩形封面，不再创建圆形封面
-            target_size = 192
-            scaled_image = image.scaled(target_size, target_size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-            
             # 缓存封面
             try:
-                self.cache_manager.cache_image(url, scaled_image, 'playlist')
+                self.cache_manager.cache_image(url, image, 'playlist')
                 logger.debug(f"封面图片已缓存: {url}")
             except Exception as cache_err:
                 logger.error(f"缓存封面图片失败: {str(cache_err)}")
                 # 缓存失败不影响继续使用图片
             
-            # 设置封面图片
-            pixmap = QPixmap.fromImage(scaled_image)
+            # 保持矩形封面，不再创建圆形封面
+            pixmap = scaled_pixmap(image, self.COVER_SIZE)
             if not pixmap.isNull():
                 self.playlist_image.setPixmap(pixmap)
                 logger.debug(f"封面图片已设置到UI, 大小: {pixmap.width()}x{pixmap.height()}")
@@ -849,190 +573,158 @@ class PlaylistView(QWidget):
             logger.error(traceback.format_exc())
             self.playlist_image.setText(self.get_text('playlist.load_failed', "加载失败"))
 
-    def paintEvent(self, event):
-        """绘制事件处理"""
-        # 如果主窗口正在调整布局，延迟绘制
-        if hasattr(self.window(), 'is_adjusting_layout') and self.window().is_adjusting_layout:
-            event.accept()
-            return
-            
-        # 如果两次重绘时间间隔太短，跳过这次重绘
-        current_time = QTime.currentTime().msecsSinceStartOfDay()
-        if current_time - self.last_redraw_time < 50:  # 50毫秒内不重复重绘
-            event.accept()
-            return
-            
-        # 设置标志，防止在重绘过程中触发其他更新
-        self.is_redrawing = True
+    def hideEvent(self, event):
+        """隐藏事件处理，优化资源使用"""
+        super().hideEvent(event)
+        # 记录离开时的位置，视图被释放或程序重启后重新打开时恢复
+        self.save_view_state()
+        # 视图可能被主页缓存，暂停后台工作，重新显示时继续
+        self.suspend_background_work()
+
+    def showEvent(self, event):
+        """显示事件处理，继续隐藏时暂停的工作"""
+        super().showEvent(event)
+        self.resume_background_work()
+
+    def suspend_background_work(self):
+        """暂停分帧填充和封面加载（歌曲加载线程只做网络请求，让它继续完成）"""
+        self.song_builder.pause()
+        self.cover_priority_timer.stop()
         
-        # 暂停子控件更新以减少重绘次数
-        self.setUpdatesEnabled(False)
+        # 取消尚未完成的封面加载，重新显示时可见行会再次请求
+        self.song_model.forget_cover_requests(self.cover_pool.cancel_all())
+
+    def resume_background_work(self):
+        """继续分帧填充，并按当前可见行重新加载封面"""
+        self.song_builder.resume()
+        self.cover_priority_timer.start()
         
+    def stop_background_threads(self):
+        """停止所有后台线程（视图销毁前调用），正在等待网络的线程不会阻塞界面"""
+        for thread in self.threads:
+            # 加载线程在翻页之间检查中断请求
+            thread.requestInterruption()
+        for thread in self.threads:
+            if not thread.wait(self.THREAD_STOP_WAIT):
+                self._detach_thread(thread)
+
+        self.threads.clear()
+        self.song_builder.stop()
+        self.cover_pool.shutdown()
+
+    def track_thread(self, thread):
+        """
+        记录后台线程，视图销毁时由 stop_background_threads 统一停止；
+        只清理已经结束的线程，还在运行的（如首次加载和封面加载）保留引用，不会在运行中被回收
+        :param thread: 尚未启动的后台线程
+        """
+        self.threads = [t for t in self.threads if t.isRunning()]
+        self.threads.append(thread)
+
+    @classmethod
+    def _detach_thread(cls, thread):
+        """
+        断开还在运行的线程与视图的连接，线程结束后再释放
+        :param thread: 后台线程
+        """
+        # 视图即将删除，线程的结果不再需要
         try:
-            # 调用父类的绘制方法
-            super().paintEvent(event)
-        finally:
-            # 无论是否成功都要重置标志
-            self.is_redrawing = False
-            self.last_redraw_time = QTime.currentTime().msecsSinceStartOfDay()
-            
-            # 恢复更新
-            self.setUpdatesEnabled(True)
-            
-    def update(self):
-        """重写更新方法，避免过于频繁的刷新"""
-        # 如果主窗口正在调整布局，延迟更新
-        if hasattr(self.window(), 'is_adjusting_layout') and self.window().is_adjusting_layout:
-            QTimer.singleShot(150, self._delayed_update)
-            return
-            
-        # 避免过于频繁的更新
-        current_time = QTime.currentTime().msecsSinceStartOfDay()
-        if self.is_redrawing or (current_time - self.last_redraw_time < 100):
-            # 如果正在重绘或者距离上次重绘时间太短，则延迟更新
-            QTimer.singleShot(100, self._delayed_update)
-            return
-            
-        # 执行实际更新
-        self.last_redraw_time = QTime.currentTime().msecsSinceStartOfDay()
-        super().update() 
+            thread.disconnect()
+        except TypeError:
+            # 没有任何连接
+            pass
+        cls._detached_threads.add(thread)
 
-    def _delayed_update(self):
-        """延迟执行的更新"""
-        # 如果主窗口仍在调整布局，再次延迟
-        if hasattr(self.window(), 'is_adjusting_layout') and self.window().is_adjusting_layout:
-            QTimer.singleShot(100, self._delayed_update)
-            return
-            
-        if not self.is_redrawing:
-            self.last_redraw_time = QTime.currentTime().msecsSinceStartOfDay()
-            super().update()
+        def release():
+            if thread in cls._detached_threads:
+                cls._detached_threads.discard(thread)
+                thread.deleteLater()
 
-    def load_more_songs(self):
-        """加载更多歌曲，优化批量加载性能"""
-        if not self.remaining_tracks or self.is_loading_more:
-            return
-            
-        # 标记为正在加载中
-        self.is_loading_more = True
-            
-        # 获取当前歌曲容器
-        songs_container = self.findChild(QWidget, "songs_container")
-        if not songs_container:
-            self.is_loading_more = False
-            return
-        
-        # 暂停UI更新以提高性能
-        songs_container.setUpdatesEnabled(False)
-            
-        # 获取当前已加载的歌曲数量
-        songs_container_layout = songs_container.layout()
-        current_count = songs_container_layout.count()
-        
-        # 加载下一批歌曲（每次加载30首，对大播放列表更友好）
-        next_batch = self.remaining_tracks[:30]
-        self.remaining_tracks = self.remaining_tracks[30:]
-        
-        logger.debug(f"加载下一批歌曲: {len(next_batch)}首, 剩余: {len(self.remaining_tracks)}首")
-        
-        # 添加下一批歌曲
-        for i, item in enumerate(next_batch):
-            track = item['track']
-            if track:
-                row = self.create_song_row(i, item)
-                songs_container_layout.addWidget(row)
-        
-        # 恢复UI更新
-        songs_container.setUpdatesEnabled(True)
-        
-        # 延迟加载可见图片
-        QTimer.singleShot(100, self.lazy_load_visible_images)
-        
-        # 检查是否还有剩余歌曲需要加载
-        if not self.remaining_tracks:
-            # 直接调用清理方法，避免重复清理
-            logger.info("所有歌曲加载完成，清理底部加载指示器")
-            self._cleanup_bottom_loading_indicators()
-            # 设置已清理标志为True
-            self._bottom_indicators_cleaned = True
-        
-        # 标记加载完成
-        self.is_loading_more = False
+        thread.finished.connect(release)
+        # 断开连接和连接finished之间线程可能已经结束
+        if thread.isFinished():
+            release()
 
-    def showEvent(self, event):
-        """显示事件处理，当视图变为可见时优化性能"""
-        super().showEvent(event)
-        # 延迟加载图片，避免一次性加载太多图片导致卡顿
-        QTimer.singleShot(100, self.lazy_load_visible_images)
-        
-    def hideEvent(self, event):
-        """隐藏事件处理，优化资源使用"""
-        super().hideEvent(event)
-        # 停止不必要的线程
-        self.stop_background_threads()
-        
-    def lazy_load_visible_images(self):
-        """延迟加载当前可见的图片"""
-        # 仅在页面可见时加载
-        if not self.isVisible():
+    def save_view_state(self):
+        """保存滚动锚点、搜索文本、排序设置、导出模式和勾选"""
+        if not self.loaded or self.saved_view_state is not None:
+            # 歌曲还没加载完（之前保存的状态尚未恢复），不覆盖
             return
+        state = {
+            'sort_key': self.sort_key,
+            'sort_reverse': self.sort_reverse,
+            'sort_secondary': self.sort_secondary,
+            'search': self.search_box.text(),
+            'export_mode': self.export_mode,
+        }
+        if self.export_mode:
+            state['selection'] = self.song_model.selection.snapshot(self.songs)
+        # 锚点按歌曲身份记录，歌单刷新或重新排序后仍能找到
+        anchor = self.song_list.scroll_anchor()
+        if anchor is not None:
+            state['anchor'] = list(song_identity(self.song_model.songs()[anchor[0]]))
+            state['offset'] = anchor[1]
+        get_view_state_store().save(self.playlist_id, state)
 
-        # 遍历所有可见的歌曲行，加载所有图片
-        for i in range(self.songs_layout.count()):
-            widget_item = self.songs_layout.itemAt(i)
-            if widget_item and widget_item.widget():
-                songs_container = widget_item.widget()
-                if isinstance(songs_container, QWidget) and songs_container.objectName() == "songs_container":
-                    # 遍历歌曲容器中的所有行
-                    container_layout = songs_container.layout()
-                    if container_layout:
-                        for j in range(container_layout.count()):
-                            item = container_layout.itemAt(j)
-                            if item and item.widget():
-                                row_widget = item.widget()
-                                
-                                # 跳过加载更多按钮和其他非歌曲行小部件
-                                if not row_widget.findChild(QWidget, f"checkbox_container_{j}"):
-                                    continue
-                                
-                                # 获取歌曲封面
-                                cover_label = row_widget.findChild(QLabel, "cover_label")
-                                if cover_label and j < len(self.tracks):
-                                    # 根据索引从 tracks 中获取歌曲信息
-                                    track = self.tracks[j]['track']
-                                    if track and track['album']['images']:
-                                        image_url = track['album']['images'][-1]['url']
-                                        image_id = f"track_{track['id']}"
-                                        # 仅当封面未加载过时加载图片
-                                        if cover_label.text() == "...":
-                                            self.load_image(image_url, image_id, cover_label, 50, 50)
-
-    def stop_background_threads(self):
-        """停止所有后台线程"""
-        for thread in self.threads:
-            thread.quit()
-            thread.wait()
+    def restore_view_state(self, state):
+        """
+        恢复保存的导出模式和勾选，并从滚动锚点附近开始显示列表
+        :param state: save_view_state 保存的状态
+        """
+        if state.get('export_mode') and not self.export_mode:
+            self.toggle_export_mode()
+        if state.get('selection'):
+            self.song_model.selection.restore(state['selection'], self.songs)
+        anchor = state.get('anchor')
+        self.create_song_list(tuple(anchor) if anchor else None, state.get('offset', 0))
 
-        self.threads.clear() 
+    def estimated_memory(self):
+        """估算视图占用的内存（字节），主页据此限制缓存的视图"""
+        return len(self.songs) * self.SONG_MEMORY_ESTIMATE + self.song_model.cover_memory()
 
     def on_select_all_changed(self, state):
         """处理全选复选框状态变化"""
-        for checkbox in self.song_checkboxes:
-            if checkbox and checkbox.parent() is not None:
-                checkbox.setChecked(state == Qt.Checked)
-    
-    def select_all_songs(self):
-        """选择所有歌曲"""
-        if hasattr(self, 'select_all_checkbox'):
-            self.select_all_checkbox.setChecked(True)
-    
-    def clear_song_selection(self):
-        """清除所有歌曲选择"""
-        if hasattr(self, 'select_all_checkbox'):
-            self.select_all_checkbox.setChecked(False)
-            for checkbox in self.song_checkboxes:
-                if checkbox and checkbox.parent() is not None:
-                    checkbox.setChecked(False)
+        self.set_all_songs_selected(state == Qt.Checked)
+
+    def set_all_songs_selected(self, selected):
+        """勾选或取消勾选当前显示的全部歌曲，搜索时只影响搜索结果
+        :param selected: 是否勾选
+        """
+        selection = self.song_model.selection
+        if self.search_text:
+            selection.set_songs_selected(self.visible_songs, selected)
+        elif selected:
+            selection.select_all()
+        else:
+            selection.clear()
+        self.song_model.refresh_check_states()
+
+    def invert_song_selection(self):
+        """反选当前显示的歌曲，搜索时只影响搜索结果"""
+        selection = self.song_model.selection
+        if self.search_text:
+            selection.invert_songs(self.visible_songs)
+        else:
+            selection.invert()
+        self.song_model.refresh_check_states()
+
+    def update_select_all_state(self):
+        """当前显示的歌曲全部勾选时同步勾选全选复选框"""
+        if not hasattr(self, 'select_all_checkbox'):
+            return
+        selection = self.song_model.selection
+        songs = [song for song in self.visible_songs if song.get('track')]
+        all_selected = bool(songs) and all(selection.is_selected(song) for song in songs)
+        self.select_all_checkbox.blockSignals(True)
+        self.select_all_checkbox.setChecked(all_selected)
+        self.select_all_checkbox.blockSignals(False)
+
+    def get_selected_songs(self):
+        """按当前排序获取勾选的歌曲，包括被搜索隐藏的歌曲"""
+        order = self.get_song_sorter().order(sort_chain(self.sort_key, self.sort_secondary or None),
+                                             self.sort_reverse)
+        songs = [self.songs[i] for i in order]
+        return self.song_model.selection.selected([song for song in songs if song.get('track')])
     
     def export_selected(self):
         """导出选中的歌曲"""
@@ -1043,41 +735,16 @@ class PlaylistView(QWidget):
             self.toggle_export_mode()
             return
 
-        # 获取所选歌曲索引
-        selected_indices = []
-        for i, checkbox in enumerate(self.song_checkboxes):
-            if checkbox and checkbox.parent() is not None and checkbox.isChecked():
-                selected_indices.append(i)
+        # 获取所选歌曲（按当前排序，搜索隐藏的已选歌曲也会导出）
+        selected_songs = self.get_selected_songs()
 
         # 如果没有选中任何歌曲
-        if not selected_indices:
+        if not selected_songs:
             msg_box = QMessageBox(self)
             msg_box.setWindowTitle(self.get_text('common.warning', '警告'))
             msg_box.setText(self.get_text('playlist.no_selection', '请至少选择一首歌曲'))
             msg_box.setIcon(QMessageBox.Warning)
-            msg_box.setStyleSheet("""
-                QMessageBox {
-                    background-color: #1E1E1E;
-                }
-                QMessageBox QLabel {
-                    color: #FFFFFF;
-                    font-size: 14px;
-                    padding: 10px;
-                    min-width: 300px;
-                }
-                QPushButton {
-                    background-color: #333;
-                    color: #FFFFFF;
-                    border: none;
-                    border-radius: 4px;
-                    padding: 5px 15px;
-                    font-size: 13px;
-                    min-width: 80px;
-                }
-                QPushButton:hover {
-                    background-color: #404040;
-                }
-            """)
+            msg_box.setObjectName("darkDialog")
             msg_box.exec_()
             return
 
@@ -1099,50 +766,48 @@ class PlaylistView(QWidget):
 
             # 准备要导出的歌曲
             selected_tracks = []
-            for idx in selected_indices:
+            for track_data in selected_songs:
                 try:
-                    if idx < len(self.visible_songs):
-                        track_data = self.visible_songs[idx]
-                        if not isinstance(track_data, dict):
-                            continue
-                        track = track_data.get('track')
-                        if not isinstance(track, dict):
-                            continue
-                            
-                        # 获取艺术家名称
-                        artists = []
-                        for artist in track.get('artists', []):
-                            if isinstance(artist, dict):
-                                artist_name = artist.get('name')
-                                if artist_name:
-                                    artists.append(artist_name)
-                        artists_str = ', '.join(artists)
-                        
-                        # 获取专辑信息
-                        album = track.get('album', {})
-                        album_name = album.get('name', '') if isinstance(album, dict) else ''
-                        album_date = album.get('release_date', '') if isinstance(album, dict) else ''
+                    if not isinstance(track_data, dict):
+                        continue
+                    track = track_data.get('track')
+                    if not isinstance(track, dict):
+                        continue
                         
-                        # 获取时长
-                        duration_ms = track.get('duration_ms', 0)
-                        minutes = duration_ms // 60000
-                        seconds = (duration_ms % 60000) // 1000
-                        duration = f'{minutes}:{seconds:02d}'
-                        
-                        # 获取歌曲名称和URL
-                        name = track.get('name', '')
-                        url = track.get('external_urls', {}).get('spotify', '')
-                        
-                        if name:  # 只添加有名称的歌曲
-                            track_info = {
-                                'name': name,
-                                'artists': artists_str,
-                                'album': album_name,
-                                'release_date': album_date,
-                                'duration': duration,
-                                'url': url
-                            }
-                            selected_tracks.append(track_info)
+                    # 获取艺术家名称
+                    artists = []
+                    for artist in track.get('artists', []):
+                        if isinstance(artist, dict):
+                            artist_name = artist.get('name')
+                            if artist_name:
+                                artists.append(artist_name)
+                    artists_str = ', '.join(artists)
+                    
+                    # 获取专辑信息
+                    album = track.get('album', {})
+                    album_name = album.get('name', '') if isinstance(album, dict) else ''
+                    album_date = album.get('release_date', '') if isinstance(album, dict) else ''
+                    
+                    # 获取时长
+                    duration_ms = track.get('duration_ms', 0)
+                    minutes = duration_ms // 60000
+                    seconds = (duration_ms % 60000) // 1000
+                    duration = f'{minutes}:{seconds:02d}'
+                    
+                    # 获取歌曲名称和URL
+                    name = track.get('name', '')
+                    url = track.get('external_urls', {}).get('spotify', '')
+                    
+                    if name:  # 只添加有名称的歌曲
+                        track_info = {
+                            'name': name,
+                            'artists': artists_str,
+                            'album': album_name,
+                            'release_date': album_date,
+                            'duration': duration,
+                            'url': url
+                        }
+                        selected_tracks.append(track_info)
                 except Exception as e:
                     logger.error(f"处理歌曲数据时出错: {str(e)}")
                     continue
@@ -1202,58 +867,15 @@ class PlaylistView(QWidget):
                 msg_box.setText(self.get_text('playlist.export_success', '已成功导出 {0} 首歌曲到 {1}').format(
                     len(selected_tracks), file_path))
                 msg_box.setIcon(QMessageBox.Information)
-                msg_box.setStyleSheet("""
-                    QMessageBox {
-                        background-color: #1E1E1E;
-                    }
-                    QMessageBox QLabel {
-                        color: #FFFFFF;
-                        font-size: 14px;
-                        padding: 10px;
-                        min-width: 300px;
-                    }
-                    QPushButton {
-                        background-color: #1DB954;
-                        color: #FFFFFF;
-                        border: none;
-                        border-radius: 4px;
-                        padding: 5px 15px;
-                        font-size: 13px;
-                        min-width: 80px;
-                    }
-                    QPushButton:hover {
-                        background-color: #1ED760;
-                    }
-                """)
+                msg_box.setObjectName("darkDialog")
+                msg_box.setProperty("variant", "success")
                 msg_box.exec_()
             else:
                 msg_box = QMessageBox(self)
                 msg_box.setWindowTitle(self.get_text('common.warning', '警告'))
                 msg_box.setText(self.get_text('playlist.no_valid_tracks', '没有有效的歌曲数据'))
                 msg_box.setIcon(QMessageBox.Warning)
-                msg_box.setStyleSheet("""
-                    QMessageBox {
-                        background-color: #1E1E1E;
-                    }
-                    QMessageBox QLabel {
-                        color: #FFFFFF;
-                        font-size: 14px;
-                        padding: 10px;
-                        min-width: 300px;
-                    }
-                    QPushButton {
-                        background-color: #333;
-                        color: #FFFFFF;
-                        border: none;
-                        border-radius: 4px;
-                        padding: 5px 15px;
-                        font-size: 13px;
-                        min-width: 80px;
-                    }
-                    QPushButton:hover {
-                        background-color: #404040;
-                    }
-                """)
+                msg_box.setObjectName("darkDialog")
                 msg_box.exec_()
 
         except Exception as e:
@@ -1262,29 +884,7 @@ class PlaylistView(QWidget):
             msg_box.setWindowTitle(self.get_text('common.error', '错误'))
             msg_box.setText(self.get_text('playlist.export_error', '导出失败: {0}').format(str(e)))
             msg_box.setIcon(QMessageBox.Critical)
-            msg_box.setStyleSheet("""
-                QMessageBox {
-                    background-color: #1E1E1E;
-                }
-                QMessageBox QLabel {
-                    color: #FFFFFF;
-                    font-size: 14px;
-                    padding: 10px;
-                    min-width: 300px;
-                }
-                QPushButton {
-                    background-color: #333;
-                    color: #FFFFFF;
-                    border: none;
-                    border-radius: 4px;
-                    padding: 5px 15px;
-                    font-size: 13px;
-                    min-width: 80px;
-                }
-                QPushButton:hover {
-                    background-color: #404040;
-                }
-            """)
+            msg_box.setObjectName("darkDialog")
             msg_box.exec_()
 
         # 导出完成后，返回正常模式
@@ -1358,6 +958,8 @@ class PlaylistView(QWidget):
                 self.cancel_export_button.show()
             if hasattr(self, 'select_all_button'):
                 self.select_all_button.show()
+            if hasattr(self, 'invert_selection_button'):
+                self.invert_selection_button.show()
             if hasattr(self, 'clear_selection_button'):
                 self.clear_selection_button.show()
             if hasattr(self, 'select_all_container'):
@@ -1378,6 +980,8 @@ class PlaylistView(QWidget):
                 self.cancel_export_button.hide()
             if hasattr(self, 'select_all_button'):
                 self.select_all_button.hide()
+            if hasattr(self, 'invert_selection_button'):
+                self.invert_selection_button.hide()
             if hasattr(self, 'clear_selection_button'):
                 self.clear_selection_button.hide()
             if hasattr(self, 'select_all_container'):
@@ -1392,11 +996,7 @@ class PlaylistView(QWidget):
         
         # 清除所有选择
         if not self.export_mode:
-            for checkbox in self.song_checkboxes:
-                if checkbox and checkbox.parent() is not None:
-                    checkbox.setChecked(False)
-            if hasattr(self, 'select_all_checkbox'):
-                self.select_all_checkbox.setChecked(False)
+            self.clear_song_selection()
                 
     def refresh_export_format(self):
         """刷新导出格式设置"""
@@ -1408,18 +1008,9 @@ class PlaylistView(QWidget):
         self.export_format = export_format
     
     def update_checkbox_visibility(self, visible):
-        """更新所有复选框容器的可见性"""
-        songs_container = self.findChild(QWidget, "songs_container")
-        if songs_container and songs_container.layout():
-            container_layout = songs_container.layout()
-            for i in range(container_layout.count()):
-                item = container_layout.itemAt(i)
-                if item and item.widget():
-                    row_widget = item.widget()
-                    # 查找checkbox_container
-                    checkbox_container = row_widget.findChild(QWidget, f"checkbox_container_{i}")
-                    if checkbox_container:
-                        checkbox_container.setVisible(visible)
+        """更新歌曲列表中复选框的可见性"""
+        # 列布局变化后表头和列表会自动重绘
+        self.song_columns.export_mode = visible
     
     def on_sort_changed(self, index):
         """排序方式改变事件"""
@@ -1440,77 +1031,13 @@ class PlaylistView(QWidget):
     
     def reload_songs(self):
         """重新加载歌曲列表"""
-        # 清空现有布局
-        for i in reversed(range(self.songs_layout.count())):
-            item = self.songs_layout.itemAt(i)
-            if item is not None:
-                widget = item.widget()
-                if widget is not None:
-                    widget.deleteLater()
-        
-        # 重新创建歌曲列表
         self.create_song_list()
     
-    def sort_tracks_by_key(self, tracks, key, reverse):
-        """根据指定键排序歌曲列表"""
-        def get_sort_value(item):
-            track = item.get('track', {})
-            if not track:
-                return ""
-                
-            if key == "name":
-                return track.get('name', "").lower()
-            elif key == "artist":
-                artists = track.get('artists', [])
-                return artists[0].get('name', "").lower() if artists else ""
-            elif key == "album":
-                album = track.get('album', {})
-                return album.get('name', "").lower() if album else ""
-            elif key == "duration":
-                return track.get('duration_ms', 0)
-            elif key == "added_at":
-                return item.get('added_at', "")
-            else:
-                return ""
-                
-        return sorted(tracks, key=get_sort_value, reverse=reverse) 
-
-    def check_for_load_more(self):
-        """检查是否需要加载更多歌曲，并加载可见图片"""
-        # 加载可见图片
-        self.lazy_load_visible_images()
-        
-        # 如果没有更多歌曲，清理所有底部加载动画并返回
-        if not self.remaining_tracks:
-            # 定义一个静态属性，用于跟踪指示器清理状态，避免重复清理
-            if not hasattr(self, '_bottom_indicators_cleaned'):
-                self._bottom_indicators_cleaned = False
-                
-            if not self._bottom_indicators_cleaned:
-                # 直接调用清理方法并根据返回结果设置标志
-                if self._cleanup_bottom_loading_indicators():
-                    logger.info("底部加载指示器已清理完成")
-                    self._bottom_indicators_cleaned = True
-            return
-        else:
-            # 如果有更多歌曲要加载，重置清理标志
-            self._bottom_indicators_cleaned = False
-            
-        # 如果已经在加载中，直接返回
-        if self.is_loading_more:
-            return
-            
-        # 获取滚动区域和滚动条
-        scrollbar = self.scroll_area.verticalScrollBar()
-        
-        # 计算滚动区域底部位置
-        max_value = scrollbar.maximum()
-        current_value = scrollbar.value()
-        
-        # 如果滚动到接近底部(在底部90%的区域)，自动加载更多歌曲
-        if max_value > 0 and current_value > max_value * 0.9:
-            logger.info(f"滚动到底部区域，准备加载更多歌曲")
-            self.load_more_songs()
+    def get_song_sorter(self):
+        """获取当前歌曲的排序器，不存在时生成"""
+        if self.song_sorter is None:
+            self.song_sorter = SongSorter(self.songs)
+        return self.song_sorter
 
     def validate_custom_format(self, format_string):
         """验证自定义格式是否有效
@@ -1551,410 +1078,92 @@ class PlaylistView(QWidget):
                     ).format(len(self.songs))
                 )
 
-    def create_song_row(self, index, song):
-        """创建歌曲行
-        :param index: 歌曲在当前视图中的索引
-        :param song: 歌曲数据
-        :return: 歌曲行控件
+    def load_track_cover(self, url):
+        """异步加载歌曲封面（由列表在行绘制时请求，此时行一定可见）
+        :param url: 图片URL
         """
-        track = song.get('track', {})
-        if not track:
-            return None
-            
-        # 创建歌曲行容器
-        song_container = QWidget()
-        song_container.setFixedHeight(60)  # 统一高度
-        song_container.setStyleSheet("""
-            QWidget {
-                background-color: #121212;
-                border-radius: 4px;
-            }
-            QWidget:hover {
-                background-color: #282828;
-            }
-        """)
-        
-        # 歌曲行布局
-        song_layout = QHBoxLayout(song_container)
-        song_layout.setContentsMargins(20, 5, 20, 5)
-        song_layout.setSpacing(10)
-        
-        # 歌曲选择复选框（导出模式下）
-        checkbox_container = QWidget()
-        checkbox_container.setObjectName(f"checkbox_container_{index}")
-        checkbox_container.setFixedWidth(40)
-        checkbox_container.setStyleSheet("background-color: transparent;")
-        checkbox_layout = QHBoxLayout(checkbox_container)
-        checkbox_layout.setContentsMargins(0, 0, 0, 0)
-        checkbox_layout.setAlignment(Qt.AlignCenter)
-        
-        # 创建复选框
-        checkbox = QCheckBox()
-        checkbox.setStyleSheet("""
-            QCheckBox {
-                background-color: transparent;
-            }
-            QCheckBox::indicator {
-                width: 20px;
-                height: 20px;
-            }
-            QCheckBox::indicator:unchecked {
-                border: 2px solid #b3b3b3;
-                border-radius: 4px;
-                background-color: transparent;
-            }
-            QCheckBox::indicator:checked {
-                border: 2px solid #1DB954;
-                border-radius: 4px;
-                background-color: #1DB954;
-                image: url(./assets/check.png);
-            }
-        """)
-        
-        # 存储复选框引用
-        if track.get('id'):
-            self.song_checkboxes.append(checkbox)
-        
-        # 将复选框添加到容器中
-        checkbox_layout.addWidget(checkbox)
-        
-        # 默认隐藏复选框容器
-        checkbox_container.setVisible(self.export_mode)
-        
-        # 将复选框容器添加到布局的最左侧
-        song_layout.addWidget(checkbox_container)
-        
-        # 创建一个透明背景的序号容器
-        number_container = QWidget()
-        number_container.setStyleSheet("background-color: transparent;")
-        number_container.setFixedWidth(30)
-        number_layout = QHBoxLayout(number_container)
-        number_layout.setContentsMargins(0, 0, 0, 0)
-        number_layout.setSpacing(0)
-        
-        # 歌曲序号添加到容器中
-        number_label = QLabel(str(song.get('original_index', index + 1)))
-        number_label.setStyleSheet("color: #b3b3b3; font-size: 14px; background-color: transparent;")
-        number_label.setAlignment(Qt.AlignCenter)
-        number_layout.addWidget(number_label)
-        
-        # 添加序号容器到主布局
-        song_layout.addWidget(number_container)
-        
-        # 根据用户设置决定是否显示专辑封面
-        if self.settings.value("playlist_show_artwork", True, type=bool):
-            # 创建固定大小的封面图片容器
-            artwork_container = QLabel()
-            artwork_container.setObjectName(f"artwork_{track.get('id', '')}")
-            # 固定大小，不随窗口自适应改变
-            artwork_container.setFixedSize(50, 50)
-            artwork_container.setAlignment(Qt.AlignCenter)
-            artwork_container.setStyleSheet("background-color: #333; border-radius: 4px;")
-            
-            # 获取专辑封面URL
-            album = track.get('album', {})
-            if album and album.get('images'):
-                image_url = album['images'][-1]['url']  # 使用最小的图片
-                
-                # 尝试从缓存加载
-                cached_image = self.cache_manager.get_cached_image(image_url, 'track')
-                if cached_image:
-                    pixmap = QPixmap.fromImage(cached_image)
-                    # 使用固定大小缩放
-                    scaled_pixmap = pixmap.scaled(50, 50, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-                    artwork_container.setPixmap(scaled_pixmap)
-                else:
-                    # 设置占位符
-                    artwork_container.setText("...")
-                    
-                    # 创建加载线程
-                    loader = ImageLoader(image_url, track.get('id', ''), self.cache_manager)
-                    loader.image_loaded.connect(self.on_track_image_loaded)
-                    self.threads.append(loader)
-                    loader.start()
-            else:
-                # 没有图片时显示默认图标
-                artwork_container.setText("🎵")
-            
-            # 添加固定大小的封面容器
-            song_layout.addWidget(artwork_container)
-        
-        # 歌曲标题和艺术家信息
-        title_container = QWidget()
-        title_container.setStyleSheet("background-color: transparent;")
-        title_layout = QVBoxLayout(title_container)
-        title_layout.setContentsMargins(0, 0, 0, 0)
-        title_layout.setSpacing(2)
-        
-        # 歌曲标题
-        title_label = QLabel(track.get('name', '未知歌曲'))
-        title_label.setStyleSheet("color: white; font-size: 14px; background-color: transparent;")
-        title_label.setWordWrap(True)
-        title_label.setTextFormat(Qt.PlainText)  # 使用纯文本格式，避免HTML注入
-        title_layout.addWidget(title_label)
-        
-        # 艺术家
-        artist_names = []
-        for artist in track.get('artists', []):
-            artist_names.append(artist.get('name', ''))
-        
-        artists_label = QLabel(', '.join(artist_names) if artist_names else '未知艺术家')
-        artists_label.setStyleSheet("color: #b3b3b3; font-size: 12px; background-color: transparent;")
-        artists_label.setWordWrap(True)
-        artists_label.setTextFormat(Qt.PlainText)  # 使用纯文本格式，避免HTML注入
-        title_layout.addWidget(artists_label)
-        
-        # 根据宽度因子计算标题容器的宽度
-        title_width = int(0.4 * self.width_factor * self.width())
-        title_container.setMinimumWidth(title_width)
-        
-        song_layout.addWidget(title_container, 1)
-        
-        # 专辑
-        album_container = QWidget()
-        album_container.setStyleSheet("background-color: transparent;")
-        album_layout = QVBoxLayout(album_container)
-        album_layout.setContentsMargins(0, 0, 0, 0)
-        album_layout.setSpacing(2)
-        
-        # 专辑名称
-        album_name = track.get('album', {}).get('name', '未知专辑')
-        album_label = QLabel(album_name)
-        album_label.setStyleSheet("color: #b3b3b3; font-size: 14px; background-color: transparent;")
-        album_label.setWordWrap(True)
-        album_label.setTextFormat(Qt.PlainText)  # 使用纯文本格式，避免HTML注入
-        album_layout.addWidget(album_label)
-        
-        # 专辑发行年份
-        release_date = track.get('album', {}).get('release_date', '')
-        if release_date:
-            try:
-                # 尝试提取年份
-                year = release_date.split('-')[0]
-                release_label = QLabel(year)
-                release_label.setStyleSheet("color: #b3b3b3; font-size: 12px; background-color: transparent;")
-                album_layout.addWidget(release_label)
-            except:
-                # 如果格式不是YYYY-MM-DD，则直接显示原始日期
-                release_label = QLabel(release_date)
-                release_label.setStyleSheet("color: #b3b3b3; font-size: 12px; background-color: transparent;")
-                album_layout.addWidget(release_label)
-        
-        # 根据宽度因子计算专辑容器的宽度
-        album_width = int(0.3 * self.width_factor * self.width())
-        album_container.setMinimumWidth(album_width)
-        
-        song_layout.addWidget(album_container, 1)
-        
-        # 创建一个透明背景的时长容器
-        duration_container = QWidget()
-        duration_container.setStyleSheet("background-color: transparent;")
-        duration_container.setFixedWidth(80)
-        duration_layout = QHBoxLayout(duration_container)
-        duration_layout.setContentsMargins(0, 0, 0, 0)
-        duration_layout.setSpacing(0)
-        duration_layout.setAlignment(Qt.AlignRight | Qt.AlignVCenter)
-        
-        # 歌曲时长
-        duration_ms = track.get('duration_ms', 0)
-        minutes = duration_ms // 60000
-        seconds = (duration_ms % 60000) // 1000
-        duration_str = f"{minutes}:{seconds:02d}"
-        
-        duration_label = QLabel(duration_str)
-        duration_label.setStyleSheet("color: #b3b3b3; font-size: 14px; background-color: transparent;")
-        duration_label.setAlignment(Qt.AlignRight | Qt.AlignVCenter)
-        duration_layout.addWidget(duration_label)
-        
-        # 添加时长容器到主布局
-        song_layout.addWidget(duration_container)
-        
-        return song_container
+        self.cover_pool.request(url, ImageWorkerPool.PRIORITY_VISIBLE)
 
-    def on_track_image_loaded(self, image, track_id):
+    def update_cover_priorities(self):
+        """按与可见区域的距离重排封面加载队列，预取附近的行，取消滚远的行"""
+        visible = self.song_list.visible_rows()
+        if visible is None or not self.song_delegate.show_artwork:
+            self.song_model.forget_cover_requests(self.cover_pool.cancel_all())
+            return
+        first, last = visible
+        
+        # 上下各预取一屏，只看这个范围内的行
+        nearby_first, nearby_last = self.song_list.visible_rows(self.song_list.viewport().height())
+        priorities = {}
+        for row in range(nearby_first, nearby_last + 1):
+            url = self.song_model.row_data(row).cover_url
+            if not url or self.song_model.has_cover(url):
+                continue
+            distance = first - row if row < first else max(0, row - last)
+            if distance < priorities.get(url, distance + 1):
+                priorities[url] = distance
+        
+        self.song_model.forget_cover_requests(self.cover_pool.reprioritize(priorities))
+
+    def on_track_image_loaded(self, image, url):
         """歌曲图片加载完成回调
         :param image: 加载的图片
-        :param track_id: 歌曲ID
+        :param url: 图片URL
         """
-        try:
-            # 详细日志
-            logger.debug(f"歌曲封面加载完成: track_id={track_id}")
-            
-            # 检查图片是否有效
-            if not image or image.isNull():
-                logger.debug(f"歌曲封面无效: track_id={track_id}")
-                return
-            
-            # 查找对应的图片容器
-            artwork_container = self.findChild(QLabel, f"artwork_{track_id}")
-            if not artwork_container:
-                logger.debug(f"找不到图片容器: artwork_{track_id}")
-                return
-                
-            # 缩放图片并设置 - 使用固定大小
-            try:
-                pixmap = QPixmap.fromImage(image)
-                if pixmap.isNull():
-                    logger.debug(f"创建QPixmap失败: track_id={track_id}")
-                    artwork_container.setText("🎵")
-                    return
-                    
-                # 始终缩放为50x50，不受窗口大小影响
-                scaled_pixmap = pixmap.scaled(50, 50, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-                artwork_container.setPixmap(scaled_pixmap)
-                logger.debug(f"设置歌曲封面成功: track_id={track_id}")
-            except Exception as pixmap_err:
-                logger.error(f"处理图片时出错: {str(pixmap_err)}")
-                artwork_container.setText("🎵")
-                
-            # 确保画面尺寸始终保持固定
-            artwork_container.setFixedSize(50, 50)
-        except Exception as e:
-            import traceback
-            logger.error(f"处理歌曲封面时出错: {str(e)}")
-            logger.error(traceback.format_exc())
-
-    def create_song_list(self):
-        """创建歌曲列表，支持自适应布局"""
-        # 确保歌曲容器布局存在
-        if not hasattr(self, 'songs_layout') or not self.songs_layout:
+        if not image or image.isNull():
+            logger.debug(f"歌曲封面无效: {url}")
             return
-            
-        # 清空布局中的所有项（保留最后的stretch）
-        logger.info(f"创建歌曲列表: 共{len(self.visible_songs)}首歌曲")
-        while self.songs_layout.count() > 1:
-            item = self.songs_layout.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
-                
-        # 重置图片加载队列
-        self.image_queue = []
-                
-        # 根据搜索文本过滤歌曲列表
-        if self.search_text:
-            # 如果有搜索条件，筛选匹配的歌曲
-            search_text = self.search_text.lower()
-            self.visible_songs = []
-            
-            for song in self.songs:
-                track = song.get('track', {})
-                if not track:
-                    continue
-                    
-                # 匹配歌曲名、专辑名、艺术家名
-                song_name = track.get('name', '').lower()
-                album_name = track.get('album', {}).get('name', '').lower()
-                
-                artists = []
-                for artist in track.get('artists', []):
-                    artists.append(artist.get('name', '').lower())
-                
-                # 如果任一字段包含搜索文本，添加到可见列表
-                if (search_text in song_name or 
-                    search_text in album_name or 
-                    any(search_text in artist for artist in artists)):
-                    self.visible_songs.append(song)
+        
+        # 始终缩放为固定大小，不受窗口大小影响
+        self.song_model.set_cover(url, scaled_pixmap(image, SongItemDelegate.ARTWORK_SIZE))
+
+    def create_song_list(self, anchor=None, offset=0):
+        """创建歌曲列表
+        :param anchor: 需要滚动到视口顶部的歌曲身份（song_identity），为None时从第一行开始
+        :param offset: 锚点歌曲顶部在视口之上的像素
+        """
+        logger.info(f"创建歌曲列表: 共{len(self.songs)}首歌曲")
+        songs = self.get_display_songs()
+        anchor_row = None
+        if anchor is not None:
+            anchor_row = next((row for row, song in enumerate(songs) if song_identity(song) == anchor), None)
+        # 分帧填充，首屏立即显示，其余行在事件循环空隙中追加；有锚点时从锚点向两侧生成
+        self.song_builder.start(songs, anchor_row)
+            
+        # 更新歌曲计数和全选复选框（勾选状态在搜索和排序之间保留）
+        self.update_song_count()
+        self.update_select_all_state()
+        
+        # 停止加载指示器并显示列表
+        self.songs_loading_indicator.stop()
+        self.song_stack.setCurrentWidget(self.song_page)
+        if anchor_row is not None:
+            self.song_list.restore_scroll_anchor(anchor_row, offset)
+
+    def get_display_songs(self):
+        """按当前的搜索文本和排序设置生成列表中显示的歌曲（同时更新visible_songs）
+        :return: 按显示顺序排列的歌曲列表
+        """
+        # 根据搜索文本模糊匹配歌曲名、艺术家名、专辑名，结果按相关度排列
+        matches = self.get_search_index().search(self.search_text) if self.search_text else None
+        if matches is not None:
+            self.visible_songs = [self.songs[i] for i in matches]
         else:
             # 如果没有搜索条件，所有歌曲可见
             self.visible_songs = self.songs
             
-        # 根据排序设置排序歌曲
-        sorted_songs = self.sort_tracks_by_key(self.visible_songs, self.sort_key, self.sort_reverse)
-            
-        # 更新歌曲计数
-        self.update_song_count()
-            
-        # 添加歌曲行
-        for i, song in enumerate(sorted_songs):
-            # 创建歌曲行
-            row = self.create_song_row(i, song)
-            if row:
-                self.songs_layout.insertWidget(i, row)
-                
-                # 应用当前的自适应缩放设置
-                if self.width_factor != 1.0:
-                    # 获取行中的标题和专辑容器，调整其宽度
-                    for j in range(row.layout().count()):
-                        item = row.layout().itemAt(j)
-                        if item and item.widget():
-                            widget = item.widget()
-                            
-                            # 根据位置判断是图片容器、标题容器还是专辑容器
-                            if j == 2 and widget.objectName().startswith("artwork_"):  # 图片容器
-                                # 确保保持固定大小
-                                widget.setFixedSize(50, 50)
-                            elif j == 3:  # 标题容器
-                                title_width = int(0.4 * self.width_factor * self.width())
-                                widget.setMinimumWidth(title_width)
-                            elif j == 4:  # 专辑容器
-                                album_width = int(0.3 * self.width_factor * self.width())
-                                widget.setMinimumWidth(album_width)
-                
-                # 控制选择框的可见性
-                checkbox_container = row.findChild(QWidget, f"checkbox_container_{i}")
-                if checkbox_container:
-                    checkbox_container.setVisible(self.export_mode)
-        
-        # 加载完成后，强制刷新UI以确保正确显示
-        QTimer.singleShot(50, self.update_song_item_widths)
-        
-        # 停止加载指示器
-        if hasattr(self, 'loading_indicator') and self.loading_indicator:
-            self.loading_indicator.stop()
-            if hasattr(self, 'loading_container') and self.loading_container:
-                self.loading_container.hide()
-        
-        # 确保定义_bottom_indicators_cleaned属性
-        if not hasattr(self, '_bottom_indicators_cleaned'):
-            self._bottom_indicators_cleaned = False
-        
-        # 清理底部加载指示器并设置标志
-        if self._cleanup_bottom_loading_indicators():
-            logger.debug("歌曲列表创建完成：底部加载指示器已清理")
-            self._bottom_indicators_cleaned = True
-        
-        # 标记没有剩余歌曲要加载
-        if not self.remaining_tracks:
-            logger.debug("没有剩余歌曲需要加载")
-            self._bottom_indicators_cleaned = True
-
-    def _cleanup_bottom_loading_indicators(self):
-        """清理底部加载指示器"""
-        # 查找底部加载指示器
-        songs_container = self.findChild(QWidget, "songs_container")
-        if not songs_container or not songs_container.layout():
-            logger.debug("未找到歌曲容器，无法清理底部加载指示器")
-            return False
-            
-        cleaned = False
-        # 收集需要删除的widget，避免在迭代时修改布局
-        widgets_to_remove = []
-        
-        for i in range(songs_container.layout().count()):
-            item = songs_container.layout().itemAt(i)
-            if item and item.widget():
-                widget = item.widget()
-                if widget.objectName() == "loading_song_list_widget" or widget.objectName() == "bottom_loading_indicator":
-                    logger.debug(f"找到底部加载指示器: {widget.objectName()}")
-                    # 停止加载动画
-                    for child in widget.findChildren(LoadingIndicator):
-                        if child:
-                            child.stop()
-                    # 隐藏部件
-                    widget.hide()
-                    # 添加到待删除列表
-                    widgets_to_remove.append(widget)
-                    cleaned = True
-        
-        # 从布局中移除收集到的widget
-        for widget in widgets_to_remove:
-            songs_container.layout().removeWidget(widget)
-            widget.deleteLater()
-            
-        if cleaned:
-            logger.debug("底部加载指示器清理完成")
-            
-        return cleaned
+        # 根据排序设置排序歌曲，跳过没有歌曲数据的条目；按默认顺序时搜索结果保持相关度顺序
+        if matches is not None and self.sort_key == "order" and not self.sort_reverse:
+            sorted_songs = self.visible_songs
+        else:
+            sorter = self.get_song_sorter()
+            sort_keys = sort_chain(self.sort_key, self.sort_secondary or None)
+            if matches is not None:
+                order = sorter.sort_indices(matches, sort_keys, self.sort_reverse)
+            else:
+                order = sorter.order(sort_keys, self.sort_reverse)
+            sorted_songs = [self.songs[i] for i in order]
+        return [song for song in sorted_songs if song.get('track')]
 
     def load_songs(self, force_refresh=False):
         """加载歌曲列表
@@ -1965,6 +1174,11 @@ class PlaylistView(QWidget):
             logger.info(f"歌曲正在加载中，忽略重复的加载请求: {self.playlist_id}")
             return
         
+        # 已经显示歌曲时在后台刷新，列表保持可见，完成后只更新有变化的行
+        if force_refresh and self.loaded and self.songs:
+            self.start_background_refresh()
+            return
+        
         # 设置加载状态
         self.is_loading = True
         self.loaded = False
@@ -1977,52 +1191,100 @@ class PlaylistView(QWidget):
             self.status_label.setText(self.get_text('playlist.loading', "加载中..."))
             logger.info(f"开始加载播放列表: {self.playlist_id} - {self.playlist_name}")
         
-        # 显示加载指示器并隐藏歌曲列表
-        if hasattr(self, 'songs_layout'):
-            # 清空现有歌曲列表
-            while self.songs_layout.count() > 0:
-                item = self.songs_layout.takeAt(0)
-                if item and item.widget():
-                    item.widget().deleteLater()
-                    
-            # 添加加载中提示
-            loading_widget = QWidget()
-            loading_layout = QVBoxLayout(loading_widget)
-            
-            # 创建加载指示器
-            loading_indicator = LoadingIndicator(self)
-            loading_indicator.setFixedSize(48, 48)
-            loading_layout.addWidget(loading_indicator, 0, Qt.AlignCenter)
-            
-            # 创建加载文本
-            loading_text = QLabel(
-                self.get_text('playlist.refreshing_songs', "刷新歌曲中...") if force_refresh 
-                else self.get_text('playlist.loading_songs', "加载歌曲中...")
-            )
-            loading_text.setStyleSheet("color: white; font-size: 16px; margin-top: 10px;")
-            loading_text.setAlignment(Qt.AlignCenter)
-            loading_layout.addWidget(loading_text, 0, Qt.AlignCenter)
-            
-            # 开始动画
-            loading_indicator.start()
-            
-            # 添加到歌曲布局
-            self.songs_layout.addWidget(loading_widget, 0, Qt.AlignCenter)
+        # 显示加载页并清空歌曲列表
+        self.songs_loading_text.setText(
+            self.get_text('playlist.refreshing_songs', "刷新歌曲中...") if force_refresh 
+            else self.get_text('playlist.loading_songs', "加载歌曲中...")
+        )
+        self.songs_loading_indicator.start()
+        self.song_stack.setCurrentWidget(self.songs_loading_page)
                 
         # 清空现有数据
         self.songs = []
         self.visible_songs = []
+        self.search_index = None
+        self.song_sorter = None
+        self.song_builder.stop()
+        self.cover_pool.cancel_all()
+        self.song_model.set_songs([])
+        # 重新加载后歌曲位置可能变化，之前的勾选不再适用
+        self.song_model.selection.clear()
+        self.song_model.refresh_check_states()
         
         # 创建加载线程
-        self.threads = []
-        loader = SongLoader(self.sp, self.playlist_id, self.cache_manager, force_refresh)
+        loader = SongLoader(self.sp, self.playlist_id, self.cache_manager, force_refresh,
+                            build_search_index=True)
+        loader.search_index_ready.connect(self.on_search_index_ready)
         loader.songs_loaded.connect(self.load_songs_completed)
         loader.load_error.connect(self.on_load_error)
         
         # 添加线程并启动
-        self.threads.append(loader)
+        self.track_thread(loader)
+        loader.start()
+
+    def start_background_refresh(self):
+        """从API重新获取歌曲，期间保留当前列表、滚动位置和勾选"""
+        self.is_loading = True
+        self.refreshed_search_index = None
+        self.status_label.setText(self.get_text('playlist.refreshing', "正在刷新歌曲..."))
+        logger.info(f"后台刷新播放列表: {self.playlist_id} - {self.playlist_name}")
+
+        loader = SongLoader(self.sp, self.playlist_id, self.cache_manager, True,
+                            build_search_index=True)
+        # 新的搜索索引先暂存，当前列表在刷新完成前仍使用旧索引
+        loader.search_index_ready.connect(self.on_refreshed_search_index_ready)
+        loader.songs_loaded.connect(self.refresh_songs_completed)
+        loader.load_error.connect(self.on_load_error)
+
+        self.track_thread(loader)
         loader.start()
 
+    def on_refreshed_search_index_ready(self, search_index):
+        """后台刷新生成的搜索索引
+        :param search_index: SongSearchIndex
+        """
+        self.refreshed_search_index = search_index
+
+    def refresh_songs_completed(self, tracks, from_cache):
+        """后台刷新完成回调，按歌曲身份与当前列表比较，只更新插入、删除和变化的行"""
+        self.is_loading = False
+        old_songs = self.songs
+
+        self.songs = tracks
+        self.song_sorter = None
+        self.search_index = self.refreshed_search_index
+        self.refreshed_search_index = None
+        if self.search_index is not None and len(self.search_index) != len(tracks):
+            self.search_index = None
+        # 勾选跟随歌曲而不是位置
+        self.song_model.selection.carry_over(old_songs, tracks)
+
+        if self.song_builder.is_running():
+            # 列表还没填充完，直接按新数据重新填充
+            self.create_song_list()
+        else:
+            self.update_song_list()
+
+        logger.info(f"歌曲刷新完成: 共{len(tracks)}首歌曲, 数据来源: {'缓存' if from_cache else 'API'}")
+        self.status_label.setText(self.get_text('playlist.song_count', "{0} 首歌曲").format(len(tracks)))
+
+    def update_song_list(self):
+        """在现有列表上应用新的歌曲数据，保持视口顶部的歌曲位置不变"""
+        # 行号将要变化，停止按行号预先生成行数据（剩下的行在绘制时生成）
+        self.song_builder.stop()
+        anchor = self.song_list.scroll_anchor()
+        moved, row = self.song_model.update_songs(self.get_display_songs(), song_identity,
+                                                  anchor[0] if anchor is not None else None)
+        logger.info(f"歌曲列表已更新: 插入和删除{moved}行")
+
+        # 插入和删除行后列表会重新布局，需要让原来顶部的歌曲回到原位
+        if moved and row is not None:
+            self.song_list.restore_scroll_anchor(row, anchor[1])
+
+        self.song_model.refresh_check_states()
+        self.update_song_count()
+        self.update_select_all_state()
+
     def on_load_error(self, error_message):
         """歌曲加载错误回调
         :param error_message: 错误信息
@@ -2039,29 +1301,7 @@ class PlaylistView(QWidget):
         msg_box.setWindowTitle(self.get_text('common.error', '错误'))
         msg_box.setText(self.get_text('playlist.load_songs_failed', '加载歌曲失败') + f": {error_message}")
         msg_box.setIcon(QMessageBox.Critical)
-        msg_box.setStyleSheet("""
-            QMessageBox {
-                background-color: #1E1E1E;
-            }
-            QMessageBox QLabel {
-                color: #FFFFFF;
-                font-size: 14px;
-                padding: 10px;
-                min-width: 300px;
-            }
-            QPushButton {
-                background-color: #333;
-                color: #FFFFFF;
-                border: none;
-                border-radius: 4px;
-                padding: 5px 15px;
-                font-size: 13px;
-                min-width: 80px;
-            }
-            QPushButton:hover {
-                background-color: #404040;
-            }
-        """)
+        msg_box.setObjectName("darkDialog")
         msg_box.exec_()
 
     def load_songs_completed(self, tracks, from_cache):
@@ -2071,25 +1311,25 @@ class PlaylistView(QWidget):
         
         # 存储歌曲数据
         self.songs = tracks
+        self.song_sorter = None
+        if self.search_index is not None and len(self.search_index) != len(tracks):
+            self.search_index = None
         
         # 记录加载完成
         logger.info(f"歌曲加载完成: 共{len(tracks)}首歌曲, 数据来源: {'缓存' if from_cache else 'API'}")
         
-        # 初始化底部加载指示器清理标志
-        if not hasattr(self, '_bottom_indicators_cleaned'):
-            self._bottom_indicators_cleaned = False
-        
-        # 创建歌曲列表
-        self.create_song_list()
+        # 创建歌曲列表，有保存的视图状态时回到上次离开的位置
+        state, self.saved_view_state = self.saved_view_state, None
+        if state:
+            self.restore_view_state(state)
+        else:
+            self.create_song_list()
         
-        # 更新加载状态
-        self.status_label.setText(self.get_text('playlist.song_count', "{0} 首歌曲").format(len(tracks)))
+        # 更新加载状态（恢复了搜索文本时显示搜索结果数量）
+        self.update_song_count()
         
         # 在加载完成后自动应用自适应布局设置
         self.adjust_responsive_ui()
-        
-        # 确保所有底部加载指示器都被清理
-        QTimer.singleShot(100, self._cleanup_bottom_loading_indicators)
 
     def refresh_songs(self):
         """刷新歌曲列表（强制从API获取最新数据）"""
@@ -2105,85 +1345,13 @@ class PlaylistView(QWidget):
         # 确保文本自动换行并设置足够大的最小高度
         msg_box.setMinimumHeight(150)
         
-        # 更全面的样式，确保所有元素都正确显示
-        msg_box.setStyleSheet("""
-            QMessageBox {
-                background-color: #1E1E1E;
-                color: white;
-                min-width: 400px;
-                min-height: 150px;
-            }
-            QLabel {
-                color: white;
-                font-size: 14px;
-                padding: 10px;
-                background-color: #1E1E1E;
-                min-width: 380px;
-                max-width: 380px;
-                min-height: 60px;
-                qproperty-wordWrap: true;
-                qproperty-alignment: AlignLeft;
-            }
-            QPushButton {
-                background-color: #333;
-                color: white;
-                border: none;
-                border-radius: 4px;
-                padding: 5px 15px;
-                font-size: 13px;
-                min-width: 80px;
-                margin: 5px;
-            }
-            QPushButton:hover {
-                background-color: #404040;
-            }
-            QDialog, QWidget {
-                background-color: #1E1E1E;
-                color: white;
-            }
-            QDialogButtonBox {
-                background-color: #1E1E1E;
-                button-layout: 2;
-                min-height: 40px;
-                margin-top: 10px;
-            }
-        """)
-        
-        # 获取按钮并单独设置样式
-        yes_button = msg_box.button(QMessageBox.Yes)
-        no_button = msg_box.button(QMessageBox.No)
+        msg_box.setObjectName("darkDialog")
+        msg_box.setProperty("variant", "confirm")
         
+        # 确认按钮使用绿色
+        yes_button = msg_box.button(QMessageBox.Yes)
         if yes_button:
-            yes_button.setStyleSheet("""
-                QPushButton {
-                    background-color: #1DB954;
-                    color: white;
-                    border: none;
-                    border-radius: 4px;
-                    padding: 5px 15px;
-                    font-size: 13px;
-                    min-width: 80px;
-                }
-                QPushButton:hover {
-                    background-color: #1ED760;
-                }
-            """)
-            
-        if no_button:
-            no_button.setStyleSheet("""
-                QPushButton {
-                    background-color: #333;
-                    color: white;
-                    border: none;
-                    border-radius: 4px;
-                    padding: 5px 15px;
-                    font-size: 13px;
-                    min-width: 80px;
-                }
-                QPushButton:hover {
-                    background-color: #404040;
-                }
-            """)
+            yes_button.setProperty("variant", "primary")
             
         # 获取并调整标签样式，确保文本完全可见
         label = msg_box.findChild(QLabel)
@@ -2214,46 +1382,35 @@ class PlaylistView(QWidget):
         :param playlist: 播放列表数据
         :return: 最佳封面图片URL
         """
-        if not playlist or not playlist.get('images'):
+        if not playlist:
             return None
-            
-        # 优先使用第一张图片（通常是最大的封面）
-        return playlist['images'][0]['url'] 
+        return pick_image_url(playlist.get('images'), self.COVER_SIZE) or None
 
     def load_playlist_image(self):
         """加载播放列表封面图片"""
         if not self.playlist_image_url:
             # 没有封面图片，设置默认样式
             self.playlist_image.setText(self.get_text('playlist.no_image', "无封面"))
-            self.playlist_image.setStyleSheet("""
-                background-color: #333;
-                color: white;
-                font-size: 14px;
-                border-radius: 4px;
-                text-align: center;
-            """)
+            set_style_property(self.playlist_image, "state", "placeholder")
             return
             
         # 首先尝试从缓存加载
         cached_image = self.cache_manager.get_cached_image(self.playlist_image_url, 'playlist')
         if cached_image:
             # 如果有缓存，直接设置
-            pixmap = QPixmap.fromImage(cached_image)
-            scaled_pixmap = pixmap.scaled(192, 192, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-            self.playlist_image.setPixmap(scaled_pixmap)
+            self.playlist_image.setPixmap(scaled_pixmap(cached_image, self.COVER_SIZE))
         else:
             # 否则异步加载
             self.playlist_image.setText("")
-            self.threads = getattr(self, 'threads', [])
             loader = ImageLoader(self.playlist_image_url, 'playlist_cover', self.cache_manager)
             loader.image_loaded.connect(self.on_playlist_image_loaded)
-            self.threads.append(loader)
+            self.track_thread(loader)
             loader.start()
             
-    def on_playlist_image_loaded(self, image_id, image):
+    def on_playlist_image_loaded(self, image, image_id):
         """播放列表封面图片加载完成回调
-        :param image_id: 图片标识符
         :param image: 加载的图片
+        :param image_id: 图片标识符
         """
         try:
             if image_id != 'playlist_cover' or not hasattr(self, 'playlist_image'):
@@ -2264,13 +1421,7 @@ class PlaylistView(QWidget):
             if image.isNull():
                 logger.warning(f"播放列表封面图片无效")
                 self.playlist_image.setText(self.get_text('playlist.load_failed', "加载失败"))
-                self.playlist_image.setStyleSheet("""
-                    background-color: #333;
-                    color: white;
-                    font-size: 14px;
-                    border-radius: 4px;
-                    text-align: center;
-                """)
+                set_style_property(self.playlist_image, "state", "placeholder")
                 return
             
             try:
@@ -2280,8 +1431,7 @@ class PlaylistView(QWidget):
                     logger.debug(f"播放列表封面图片已缓存: {self.playlist_image_url}")
                 
                 # 缩放图片并设置
-                scaled_image = image.scaled(192, 192, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-                pixmap = QPixmap.fromImage(scaled_image)
+                pixmap = scaled_pixmap(image, self.COVER_SIZE)
                 
                 if pixmap.isNull():
                     logger.warning("无法从图片创建像素图")
@@ -2307,81 +1457,34 @@ class PlaylistView(QWidget):
             except:
                 pass
 
-    def update_ui(self):
-        """更新UI状态"""
-        # 更新歌曲计数
-        self.update_song_count()
-        
-        # 检查是否需要加载更多歌曲
-        self.check_for_load_more()
-        
-        # 延迟加载可见区域内的图片
-        self.lazy_load_visible_images() 
-
-    def on_scroll_end(self):
-        """滚动结束时触发的方法"""
-        # 记录当前滚动位置
-        self.scroll_position = self.scroll_area.verticalScrollBar().value()
-        
-        # 延迟加载可见区域内的图片
-        self.lazy_load_visible_images()
-        
-        # 检查是否需要加载更多歌曲
-        self.check_for_load_more()
-
     def on_search_changed(self, text):
         """处理搜索框文本变化
         :param text: 搜索文本
         """
-        self.search_text = text.strip().lower()
-        if not self.search_text and hasattr(self, 'in_search_mode') and self.in_search_mode:
-            # 如果文本清空且正处于搜索状态，退出搜索状态
-            self.in_search_mode = False
-            self.visible_songs = self.songs
-            self.create_song_list()
-            # 更新状态标签，显示已退出搜索
-            self.status_label.setText(self.language_manager.get_text(
-                'playlist.song_count', 
-                "{0} 首歌曲"
-            ).format(len(self.songs)))
-        else:
-            # 执行过滤
+        self.search_text = text.strip()
+        if not self.search_text:
+            # 清空搜索时立即显示全部歌曲
+            self.search_timer.stop()
             self.filter_songs()
+        else:
+            # 输入停顿后再执行过滤
+            self.search_timer.start()
+    
+    def on_search_index_ready(self, search_index):
+        """加载线程生成的搜索索引
+        :param search_index: SongSearchIndex
+        """
+        self.search_index = search_index
+    
+    def get_search_index(self):
+        """获取当前歌曲的搜索索引，不存在时生成"""
+        if self.search_index is None:
+            self.search_index = SongSearchIndex(self.songs)
+        return self.search_index
     
     def filter_songs(self):
         """根据搜索文本过滤歌曲"""
-        if not self.search_text:
-            # 如果没有搜索文本，显示所有歌曲
-            self.visible_songs = self.songs
-            if hasattr(self, 'in_search_mode'):
-                self.in_search_mode = False
-        else:
-            # 标记为搜索模式
-            self.in_search_mode = True
-            
-            # 根据搜索文本过滤，仅匹配歌曲名称
-            self.visible_songs = []
-            for song in self.songs:
-                track = song.get('track', {})
-                if not track:
-                    continue
-                
-                # 获取歌曲名称
-                track_name = track.get('name', '').lower()
-                
-                # 如果搜索文本出现在歌曲名中，保留该歌曲
-                if self.search_text in track_name:
-                    self.visible_songs.append(song)
-            
-            # 更新状态标签，显示搜索结果数量
-            self.status_label.setText(
-                self.language_manager.get_text(
-                    'playlist.search_results', 
-                    "显示 {0}/{1} 首歌曲"
-                ).format(len(self.visible_songs), len(self.songs))
-            )
-            
-        # 重新创建歌曲列表
+        # 重新创建歌曲列表（过滤和计数都在其中完成）
         self.create_song_list()
 
     def get_text(self, key, default_text):
@@ -2408,28 +1511,7 @@ class PlaylistView(QWidget):
         """显示排序菜单"""
         # 创建菜单
         menu = QMenu(self)
-        menu.setStyleSheet("""
-            QMenu {
-                background-color: #282828;
-                border: 1px solid #333;
-                border-radius: 4px;
-                padding: 5px;
-            }
-            QMenu::item {
-                color: #b3b3b3;
-                padding: 5px 30px 5px 20px;
-                border-radius: 2px;
-            }
-            QMenu::item:selected {
-                background-color: #333;
-                color: white;
-            }
-            QMenu::separator {
-                height: 1px;
-                background: #333;
-                margin: 5px 0px;
-            }
-        """)
+        menu.setObjectName("sortMenu")
         
         # 添加排序选项
         sort_options = {
@@ -2437,6 +1519,8 @@ class PlaylistView(QWidget):
             'name': self.get_text('playlist.sort_name', '歌曲名'),
             'artist': self.get_text('playlist.sort_artist', '艺术家'),
             'album': self.get_text('playlist.sort_album', '专辑'),
+            'release_date': self.get_text('playlist.sort_release_date', '发行日期'),
+            'popularity': self.get_text('playlist.sort_popularity', '热度'),
             'duration': self.get_text('playlist.sort_duration', '时长'),
             'added_at': self.get_text('playlist.sort_added', '添加时间')
         }
@@ -2452,6 +1536,24 @@ class PlaylistView(QWidget):
             action.triggered.connect(lambda checked, k=key: self.change_sort_key(k))
             menu.addAction(action)
         
+        # 次要排序键，主键相同的歌曲按它继续排序
+        if current_sort != 'order':
+            then_menu = menu.addMenu(self.get_text('playlist.sort_then_by', '然后按'))
+            then_menu.setObjectName("sortMenu")
+            auto_action = QAction(self.get_text('playlist.sort_auto', '自动'), self)
+            auto_action.setCheckable(True)
+            auto_action.setChecked(not self.sort_secondary)
+            auto_action.triggered.connect(lambda: self.change_sort_secondary(""))
+            then_menu.addAction(auto_action)
+            for key, text in sort_options.items():
+                if key == current_sort:
+                    continue
+                action = QAction(text, self)
+                action.setCheckable(True)
+                action.setChecked(key == self.sort_secondary)
+                action.triggered.connect(lambda checked, k=key: self.change_sort_secondary(k))
+                then_menu.addAction(action)
+        
         # 添加分隔线
         menu.addSeparator()
         
@@ -2480,6 +1582,15 @@ class PlaylistView(QWidget):
             self.settings.setValue("playlist_sort_key", key)
             self.reload_songs()
     
+    def change_sort_secondary(self, key):
+        """改变次要排序键
+        :param key: 排序键，为空时自动选择
+        """
+        if key != self.sort_secondary:
+            self.sort_secondary = key
+            self.settings.setValue("playlist_sort_secondary", key)
+            self.reload_songs()
+    
     def change_sort_order(self, reverse):
         """改变排序顺序
         :param reverse: 是否降序
@@ -2489,66 +1600,11 @@ class PlaylistView(QWidget):
             self.settings.setValue("playlist_sort_reverse", "true" if reverse else "false")
             self.reload_songs()
 
-    def on_scroll(self, value):
-        """滚动事件处理
-        :param value: 滚动条位置
-        """
-        # 记录当前滚动位置
-        self.scroll_position = value
-        
-        # 重置滚动计时器
-        self.scroll_timer.stop()
-        self.scroll_timer.start()
-        
-        # 检查是否需要加载更多歌曲
-        self.check_for_load_more()
-        
-        # 延迟加载可见区域内的图片
-        self.lazy_load_visible_images()
-        
     def select_all_songs(self):
         """选择所有歌曲"""
-        if hasattr(self, 'select_all_checkbox'):
-            self.select_all_checkbox.setChecked(True)
+        self.set_all_songs_selected(True)
     
     def clear_song_selection(self):
-        """清除所有歌曲选择"""
-        if hasattr(self, 'select_all_checkbox'):
-            self.select_all_checkbox.setChecked(False)
-            for checkbox in self.song_checkboxes:
-                if checkbox and checkbox.parent() is not None:
-                    checkbox.setChecked(False)
-    
-    def create_header_labels(self):
-        """创建表头标签"""
-        # 复选框列（导出模式下显示但不再放在标题栏）
-        checkbox_header = QLabel()
-        checkbox_header.setFixedWidth(40)
-        checkbox_header.setAlignment(Qt.AlignCenter)
-        self.header_layout.addWidget(checkbox_header)
-        
-        # 序号列
-        number_header = QLabel("#")
-        number_header.setFixedWidth(30)
-        number_header.setStyleSheet("color: #b3b3b3; font-size: 14px;")
-        number_header.setAlignment(Qt.AlignCenter)
-        self.header_layout.addWidget(number_header)
-        
-        # 如果设置显示专辑封面，添加封面列
-        if self.settings.value("playlist_show_artwork", True, type=bool):
-            artwork_header = QLabel()
-            # 固定宽度，与歌曲行中的封面图片宽度一致
-            artwork_header.setFixedWidth(50)
-            self.header_layout.addWidget(artwork_header)
-        
-        # 标题列
-        title_header = QLabel(self.get_text("playlist.title", "标题"))
-        title_header.setStyleSheet("color: #b3b3b3; font-size: 14px;")
-        self.header_layout.addWidget(title_header, 1)  # 1表示伸展因子
-        
-        # 时长列
-        duration_header = QLabel(self.get_text("playlist.duration_field", "时长"))
-        duration_header.setFixedWidth(80)
-        duration_header.setStyleSheet("color: #b3b3b3; font-size: 14px;")
-        duration_header.setAlignment(Qt.AlignRight | Qt.AlignVCenter)
-        self.header_layout.addWidget(duration_header)
\ No newline at end of file
+        """清除所有歌曲选择，包括被搜索隐藏的歌曲"""
+        self.song_model.selection.clear()
+        self.song_model.refresh_check_states()
@@ -10,8 +10,6 @@ from src.utils.language_manager import LanguageManager
 from src.utils.logger import logger
 import os
 from PyQt5.QtCore import QSettings, QEvent
-from PyQt5.QtWidgets import QApplication
-from PyQt5.QtCore import QTimer
 from src.config import settings
 
 class SettingsView(QWidget):
@@ -53,8 +51,8 @@ class SettingsView(QWidget):
         
     def init_ui(self):
         """初始化UI"""
-        # 设置背景颜色
-        self.setStyleSheet("background-color: #040404;")
+        # 样式由主题按 objectName 和 role/variant 属性匹配（见 src/ui/theme.py）
+        self.setObjectName("settingsView")
         
         # 创建外层布局
         outer_layout = QVBoxLayout(self)
@@ -66,32 +64,9 @@ class SettingsView(QWidget):
         scroll_area.setWidgetResizable(True)
         scroll_area.setFrameShape(QFrame.NoFrame)
         scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
-        scroll_area.setStyleSheet("""
-            QScrollArea {
-                background-color: #040404;
-                border: none;
-            }
-            QScrollBar:vertical {
-                background-color: #121212;
-                width: 10px;
-                margin: 0px;
-            }
-            QScrollBar::handle:vertical {
-                background-color: #535353;
-                min-height: 20px;
-                border-radius: 5px;
-            }
-            QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {
-                height: 0px;
-            }
-            QScrollBar::add-page:vertical, QScrollBar::sub-page:vertical {
-                background: none;
-            }
-        """)
         
         # 创建内容容器
         content_widget = QWidget()
-        content_widget.setStyleSheet("background-color: #040404;")
         
         # 创建内容布局
         main_layout = QVBoxLayout(content_widget)
@@ -101,7 +76,6 @@ class SettingsView(QWidget):
         # 设置标题
         self.title_label = QLabel(self.language_manager.get_text("settings.title"))
         self.title_label.setFont(QFont("PingFang SC", 24, QFont.Bold))
-        self.title_label.setStyleSheet("color: white;")
         main_layout.addWidget(self.title_label)
         
         # ====== 语言设置部分 ======
@@ -120,12 +94,11 @@ class SettingsView(QWidget):
         # 语言设置标题
         self.lang_title = QLabel(self.language_manager.get_text("settings.language.title"))
         self.lang_title.setFont(QFont("PingFang SC", 16, QFont.Bold))
-        self.lang_title.setStyleSheet("color: white;")
         lang_text_layout.addWidget(self.lang_title)
         
         # 语言设置描述
         self.lang_desc = QLabel(self.language_manager.get_text("settings.language.label"))
-        self.lang_desc.setStyleSheet("color: #b3b3b3; font-size: 13px;")
+        self.lang_desc.setProperty("role", "description")
         self.lang_desc.setWordWrap(True)
         lang_text_layout.addWidget(self.lang_desc)
         
@@ -143,89 +116,6 @@ class SettingsView(QWidget):
         self.language_combo.addItem(self.language_manager.get_text("settings.language.en_US"), "en_US")
         self.language_combo.setMinimumWidth(180)  # 减小最小宽度
         self.language_combo.setFixedHeight(40)
-        self.language_combo.setStyleSheet("""
-            QComboBox {
-                background-color: #282828;
-                color: white;
-                border: none;
-                border-radius: 4px;
-                padding: 5px 15px;
-                font-size: 14px;
-            }
-            QComboBox:hover {
-                background-color: #333333;
-            }
-            QComboBox::drop-down {
-                border: none;
-                width: 30px;
-                subcontrol-origin: padding;
-                subcontrol-position: right center;
-            }
-            QComboBox::down-arrow {
-                image: none;
-                width: 0;
-            }
-            QComboBox QAbstractItemView {
-                background-color: #282828;
-                color: white;
-                selection-background-color: #1DB954;
-                selection-color: white;
-                border: none;
-                padding: 0px;
-                margin: 0px;
-                outline: none;
-                border-radius: 4px;
-                margin-top: -1px;  /* 去除顶部间隙 */
-                /* 强制样式覆盖Qt默认行为 */
-                border-top: 0px solid transparent;
-                border-bottom: 0px solid transparent;
-            }
-            /* 使用QListView的样式更精确地控制下拉列表 */
-            QComboBox QListView {
-                background-color: #282828;
-                outline: none;
-                padding: 0px;
-                margin: 0px;
-            }
-            QComboBox QListView::item {
-                min-height: 30px;
-                height: 30px;
-                padding: 5px 15px;
-                margin: 0px;
-                border: none;
-                color: white;
-            }
-            QComboBox QListView::item:selected {
-                background-color: #1DB954;
-                color: white;
-            }
-            QComboBox QListView::item:hover {
-                background-color: #333333;
-            }
-            QComboBox QListView QScrollBar:vertical {
-                width: 8px;
-                background: #282828;
-                border: none;
-                margin: 0px;
-            }
-            QComboBox QListView QScrollBar::handle:vertical {
-                background: #535353;
-                min-height: 20px;
-                border-radius: 4px;
-            }
-            QComboBox QListView QScrollBar::add-line:vertical, 
-            QComboBox QListView QScrollBar::sub-line:vertical {
-                height: 0px;
-                border: none;
-                background: none;
-            }
-            QComboBox QListView QScrollBar::add-page:vertical,
-            QComboBox QListView QScrollBar::sub-page:vertical {
-                background: none;
-                height: 0px;
-                width: 0px;
-            }
-        """)
         
         # 先阻止信号触发，避免初始化时自动切换语言
         self.language_combo.blockSignals(True)
@@ -266,12 +156,11 @@ class SettingsView(QWidget):
         # 导出格式设置标题
         self.export_title = QLabel(self.language_manager.get_text("settings.export.title", "导出设置"))
         self.export_title.setFont(QFont("PingFang SC", 16, QFont.Bold))
-        self.export_title.setStyleSheet("color: white;")
         export_text_layout.addWidget(self.export_title)
         
         # 导出格式设置描述
         self.export_desc = QLabel(self.language_manager.get_text("settings.export.desc", "设置歌曲导出的默认格式和文件类型"))
-        self.export_desc.setStyleSheet("color: #b3b3b3; font-size: 13px;")
+        self.export_desc.setProperty("role", "description")
         self.export_desc.setWordWrap(True)
         export_text_layout.addWidget(self.export_desc)
         
@@ -285,7 +174,7 @@ class SettingsView(QWidget):
         
         # 格式选择标签
         format_label = QLabel(self.language_manager.get_text("settings.export.format_label", "导出格式:"))
-        format_label.setStyleSheet("color: white; font-size: 14px;")
+        format_label.setProperty("role", "field")
         format_label.setObjectName("format_label")  # 设置objectName
         self.format_label = format_label  # 保存为类成员变量
         
@@ -297,89 +186,6 @@ class SettingsView(QWidget):
         
         self.export_format_combo.setMinimumWidth(180)  # 减小最小宽度
         self.export_format_combo.setFixedHeight(40)
-        self.export_format_combo.setStyleSheet("""
-            QComboBox {
-                background-color: #282828;
-                color: white;
-                border: none;
-                border-radius: 4px;
-                padding: 5px 15px;
-                font-size: 14px;
-            }
-            QComboBox:hover {
-                background-color: #333333;
-            }
-            QComboBox::drop-down {
-                border: none;
-                width: 30px;
-                subcontrol-origin: padding;
-                subcontrol-position: right center;
-            }
-            QComboBox::down-arrow {
-                image: none;
-                width: 0;
-            }
-            QComboBox QAbstractItemView {
-                background-color: #282828;
-                color: white;
-                selection-background-color: #1DB954;
-                selection-color: white;
-                border: none;
-                padding: 0px;
-                margin: 0px;
-                outline: none;
-                border-radius: 4px;
-                margin-top: -1px;  /* 去除顶部间隙 */
-                /* 强制样式覆盖Qt默认行为 */
-                border-top: 0px solid transparent;
-                border-bottom: 0px solid transparent;
-            }
-            /* 使用QListView的样式更精确地控制下拉列表 */
-            QComboBox QListView {
-                background-color: #282828;
-                outline: none;
-                padding: 0px;
-                margin: 0px;
-            }
-            QComboBox QListView::item {
-                min-height: 30px;
-                height: 30px;
-                padding: 5px 15px;
-                margin: 0px;
-                border: none;
-                color: white;
-            }
-            QComboBox QListView::item:selected {
-                background-color: #1DB954;
-                color: white;
-            }
-            QComboBox QListView::item:hover {
-                background-color: #333333;
-            }
-            QComboBox QListView QScrollBar:vertical {
-                width: 8px;
-                background: #282828;
-                border: none;
-                margin: 0px;
-            }
-            QComboBox QListView QScrollBar::handle:vertical {
-                background: #535353;
-                min-height: 20px;
-                border-radius: 4px;
-            }
-            QComboBox QListView QScrollBar::add-line:vertical, 
-            QComboBox QListView QScrollBar::sub-line:vertical {
-                height: 0px;
-                border: none;
-                background: none;
-            }
-            QComboBox QListView QScrollBar::add-page:vertical,
-            QComboBox QListView QScrollBar::sub-page:vertical {
-                background: none;
-                height: 0px;
-                width: 0px;
-            }
-        """)
         
         # 获取当前格式设置，如果是自定义格式，改为默认格式
         current_format = self.settings.value("export_format", "name-artists")
@@ -396,7 +202,7 @@ class SettingsView(QWidget):
         
         # 添加文件格式选择
         file_format_label = QLabel(self.language_manager.get_text("settings.export.file_format_label", "文件格式:"))
-        file_format_label.setStyleSheet("color: white; font-size: 14px; margin-top: 15px;")
+        file_format_label.setProperty("role", "field")
         file_format_label.setObjectName("file_format_label")  # 设置objectName以便后续查找
         self.file_format_label = file_format_label  # 保存为类成员变量
         
@@ -407,10 +213,8 @@ class SettingsView(QWidget):
         file_format_layout.setSpacing(15)  # 减小间距
         
         self.txt_radio = QRadioButton(self.language_manager.get_text("settings.export.txt_format", "文本文件 (.txt)"))
-        self.txt_radio.setStyleSheet("color: white; font-size: 14px;")
         
         self.csv_radio = QRadioButton(self.language_manager.get_text("settings.export.csv_format", "CSV文件 (.csv)"))
-        self.csv_radio.setStyleSheet("color: white; font-size: 14px;")
         
         # 创建按钮组
         self.file_format_group = QButtonGroup(self)
@@ -463,12 +267,11 @@ class SettingsView(QWidget):
         # 缓存标题
         self.cache_title = QLabel(self.language_manager.get_text("settings.cache.title"))
         self.cache_title.setFont(QFont("PingFang SC", 16, QFont.Bold))
-        self.cache_title.setStyleSheet("color: white;")
         cache_text_layout.addWidget(self.cache_title)
         
         # 缓存描述
         self.cache_desc = QLabel(self.language_manager.get_text("settings.cache.desc"))
-        self.cache_desc.setStyleSheet("color: #b3b3b3; font-size: 13px;")
+        self.cache_desc.setProperty("role", "description")
         self.cache_desc.setWordWrap(True)
         cache_text_layout.addWidget(self.cache_desc)
         
@@ -476,7 +279,8 @@ class SettingsView(QWidget):
         total_size = self.get_cache_size()
         size_str = self.format_size(total_size)
         self.cache_size_label = QLabel(self.language_manager.get_text("settings.cache.size").format(size_str))
-        self.cache_size_label.setStyleSheet("color: #b3b3b3; font-size: 13px; margin-top: 10px;")
+        self.cache_size_label.setObjectName("cache_size_label")
+        self.cache_size_label.setProperty("role", "description")
         cache_text_layout.addWidget(self.cache_size_label)
         
         cache_layout.addWidget(cache_text_area, 3)  # 左侧占比减少
@@ -490,18 +294,7 @@ class SettingsView(QWidget):
         # 清除缓存按钮
         self.clear_cache_btn = QPushButton(self.language_manager.get_text("settings.cache.clear_btn"))
         self.clear_cache_btn.setFixedSize(120, 40)
-        self.clear_cache_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #E91429;
-                color: white;
-                border: none;
-                border-radius: 4px;
-                font-size: 14px;
-            }
-            QPushButton:hover {
-                background-color: #FF1622;
-            }
-        """)
+        self.clear_cache_btn.setProperty("variant", "danger")
         self.clear_cache_btn.clicked.connect(self.clear_cache)
         
         cache_control_layout.addWidget(self.clear_cache_btn)
@@ -526,12 +319,11 @@ class SettingsView(QWidget):
         # 日志设置标题
         self.log_title = QLabel(self.language_manager.get_text("settings.log.title", "日志设置"))
         self.log_title.setFont(QFont("PingFang SC", 16, QFont.Bold))
-        self.log_title.setStyleSheet("color: white;")
         log_text_layout.addWidget(self.log_title)
         
         # 日志设置描述
         self.log_desc = QLabel(self.language_manager.get_text("settings.log.desc", "设置日志记录的详细程度和查看日志文件"))
-        self.log_desc.setStyleSheet("color: #b3b3b3; font-size: 13px;")
+        self.log_desc.setProperty("role", "description")
         self.log_desc.setWordWrap(True)
         log_text_layout.addWidget(self.log_desc)
         
@@ -551,7 +343,7 @@ class SettingsView(QWidget):
         
         # 日志级别标签
         self.log_level_label = QLabel(self.language_manager.get_text("settings.log.level", "日志级别:"))
-        self.log_level_label.setStyleSheet("color: white; font-size: 14px;")
+        self.log_level_label.setProperty("role", "field")
         log_level_layout.addWidget(self.log_level_label)
         
         # 日志级别下拉框
@@ -562,89 +354,6 @@ class SettingsView(QWidget):
         self.log_level_combo.addItem(self.language_manager.get_text("settings.log.level.error", "错误"), "error")
         self.log_level_combo.setMinimumWidth(120)  # 减小最小宽度
         self.log_level_combo.setFixedHeight(40)
-        self.log_level_combo.setStyleSheet("""
-            QComboBox {
-                background-color: #282828;
-                color: white;
-                border: none;
-                border-radius: 4px;
-                padding: 5px 15px;
-                font-size: 14px;
-            }
-            QComboBox:hover {
-                background-color: #333333;
-            }
-            QComboBox::drop-down {
-                border: none;
-                width: 30px;
-                subcontrol-origin: padding;
-                subcontrol-position: right center;
-            }
-            QComboBox::down-arrow {
-                image: none;
-                width: 0;
-            }
-            QComboBox QAbstractItemView {
-                background-color: #282828;
-                color: white;
-                selection-background-color: #1DB954;
-                selection-color: white;
-                border: none;
-                padding: 0px;
-                margin: 0px;
-                outline: none;
-                border-radius: 4px;
-                margin-top: -1px;  /* 去除顶部间隙 */
-                /* 强制样式覆盖Qt默认行为 */
-                border-top: 0px solid transparent;
-                border-bottom: 0px solid transparent;
-            }
-            /* 使用QListView的样式更精确地控制下拉列表 */
-            QComboBox QListView {
-                background-color: #282828;
-                outline: none;
-                padding: 0px;
-                margin: 0px;
-            }
-            QComboBox QListView::item {
-                min-height: 30px;
-                height: 30px;
-                padding: 5px 15px;
-                margin: 0px;
-                border: none;
-                color: white;
-            }
-            QComboBox QListView::item:selected {
-                background-color: #1DB954;
-                color: white;
-            }
-            QComboBox QListView::item:hover {
-                background-color: #333333;
-            }
-            QComboBox QListView QScrollBar:vertical {
-                width: 8px;
-                background: #282828;
-                border: none;
-                margin: 0px;
-            }
-            QComboBox QListView QScrollBar::handle:vertical {
-                background: #535353;
-                min-height: 20px;
-                border-radius: 4px;
-            }
-            QComboBox QListView QScrollBar::add-line:vertical, 
-            QComboBox QListView QScrollBar::sub-line:vertical {
-                height: 0px;
-                border: none;
-                background: none;
-            }
-            QComboBox QListView QScrollBar::add-page:vertical,
-            QComboBox QListView QScrollBar::sub-page:vertical {
-                background: none;
-                height: 0px;
-                width: 0px;
-            }
-        """)
         
         # 连接信号
         self.log_level_combo.currentIndexChanged.connect(self.on_log_level_changed)
@@ -660,18 +369,6 @@ class SettingsView(QWidget):
         # 查看日志按钮
         self.view_log_btn = QPushButton(self.language_manager.get_text("settings.log.view_btn", "查看日志"))
         self.view_log_btn.setFixedSize(120, 40)
-        self.view_log_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #282828;
-                color: white;
-                border: none;
-                border-radius: 4px;
-                font-size: 14px;
-            }
-            QPushButton:hover {
-                background-color: #333333;
-            }
-        """)
         self.view_log_btn.clicked.connect(self.view_log)
         
         # 添加各组件到布局
@@ -686,8 +383,9 @@ class SettingsView(QWidget):
         # 添加底部空间
         main_layout.addStretch()
         
-        # 应用特殊设置确保下拉框没有空白
-        self._apply_combo_box_fixes()
+        # 下拉框不响应滚轮，避免滚动页面时误改选项
+        for combo_box in (self.language_combo, self.export_format_combo, self.log_level_combo):
+            combo_box.installEventFilter(self)
         
         # 设置滚动区域的内容
         scroll_area.setWidget(content_widget)
@@ -695,165 +393,11 @@ class SettingsView(QWidget):
         # 将滚动区域添加到外层布局
         outer_layout.addWidget(scroll_area)
     
-    def _apply_combo_box_fixes(self):
-        """应用ComboBox特殊修复，解决下拉框空白问题"""
-        try:
-            # 设置全局样式以覆盖所有可能的白色背景区域
-            additional_style = """
-                QComboBoxPrivateContainer, QComboBox QAbstractItemView {
-                    background-color: #282828;
-                    color: white;
-                    border: none;
-                    outline: none;
-                    padding: 0px;
-                    margin: 0px;
-                    border-radius: 0px;
-                    selection-background-color: #1DB954;
-                    selection-color: white;
-                }
-                QListView, QListView::item, QTreeView, QTreeView::item, QTableView {
-                    background-color: #282828;
-                    color: white;
-                    border: none;
-                    outline: none;
-                }
-                QListView::item:hover, QTreeView::item:hover {
-                    background-color: #333333;
-                }
-                QListView::item:selected, QTreeView::item:selected {
-                    background-color: #1DB954;
-                    color: white;
-                }
-                QScrollBar:vertical {
-                    background-color: #282828;
-                    width: 8px;
-                    margin: 0px;
-                }
-                QScrollBar::handle:vertical {
-                    background-color: #535353;
-                    min-height: 20px;
-                    border-radius: 4px;
-                }
-                QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical,
-                QScrollBar::add-page:vertical, QScrollBar::sub-page:vertical {
-                    background: none;
-                    height: 0px;
-                    width: 0px;
-                }
-                /* 针对标准部件容器的显式样式 */
-                QWidget#qt_scrollarea_viewport, QWidget#qt_scrollarea_hcontainer, 
-                QWidget#qt_scrollarea_vcontainer {
-                    background-color: #282828;
-                    border: none;
-                }
-                /* 处理QMenu下的视图 */
-                QMenu, QMenu::item, QMenu QWidget {
-                    background-color: #040404;
-                    color: #b3b3b3;
-                }
-                QMenu::item:selected {
-                    background-color: #282828;
-                    color: white;
-                }
-            """
-            QApplication.instance().setStyleSheet(QApplication.instance().styleSheet() + additional_style)
-            
-            # 为所有ComboBox应用设置
-            for combo_box in [self.language_combo, self.export_format_combo, self.log_level_combo]:
-                if combo_box:
-                    # 安装事件过滤器捕获弹出事件
-                    combo_box.installEventFilter(self)
-                    # 设置视图属性
-                    popup = combo_box.view()
-                    if popup:
-                        popup.viewport().setAutoFillBackground(False)
-                        popup.viewport().setStyleSheet("background-color: #282828; border: none;")
-                        # 设置视图边框和边距
-                        popup.setFrameShape(QFrame.NoFrame)
-                        popup.setContentsMargins(0, 0, 0, 0)
-                        
-                        # 递归设置所有子控件
-                        for child in popup.findChildren(QWidget):
-                            child.setAutoFillBackground(False)
-                            if "viewport" in child.objectName().lower():
-                                child.setStyleSheet("background-color: #282828; border: none;")
-        except Exception as e:
-            print(f"应用ComboBox修复失败: {str(e)}")
-            import traceback
-            traceback.print_exc()
-    
     def eventFilter(self, obj, event):
-        """事件过滤器，用于处理ComboBox弹出事件"""
-        # 阻止鼠标滚轮事件改变下拉框选项
+        """事件过滤器，阻止鼠标滚轮事件改变下拉框选项"""
         if event.type() == QEvent.Wheel and isinstance(obj, QComboBox):
-            # 拦截滚轮事件，防止滚动改变选项
             return True
-            
-        if event.type() == QEvent.Show and isinstance(obj, QComboBox):
-            # 当下拉框显示时调整其视图
-            popup = obj.view()
-            if popup:
-                # 确保视图没有空白
-                popup.setContentsMargins(0, 0, 0, 0)
-                popup.setFrameShape(QFrame.NoFrame)
-                popup.viewport().setAutoFillBackground(False)
-                popup.viewport().setStyleSheet("background-color: #282828; border: none;")
-                
-                # 设置窗口标志，防止阴影和透明
-                container = obj.findChild(QWidget, "QComboBoxPrivateContainer")
-                if container:
-                    container.setWindowFlags(container.windowFlags() | Qt.NoDropShadowWindowHint)
-                    container.setAttribute(Qt.WA_TranslucentBackground, True)
-                    container.setStyleSheet("background-color: #282828; border: none;")
-                
-                # 延迟执行一些额外的样式设置，确保dropdown真正显示后应用
-                QTimer.singleShot(10, lambda: self._apply_additional_dropdown_fixes(popup))
-                # 设置另一个延迟，确保所有子控件都创建完毕
-                QTimer.singleShot(50, lambda: self._apply_additional_dropdown_fixes(popup))
         return super().eventFilter(obj, event)
-        
-    def _apply_additional_dropdown_fixes(self, widget):
-        """应用额外的下拉框修复"""
-        try:
-            # 对视图的所有子部件设置样式
-            for child in widget.findChildren(QWidget):
-                # 禁用自动填充背景，这是导致白色区域的主要原因之一
-                child.setAutoFillBackground(False)
-                
-                if "viewport" in child.objectName().lower():
-                    child.setStyleSheet("background-color: #282828; border: none;")
-                
-                # 处理可能的滚动区域viewport
-                if child.objectName() == "qt_scrollarea_viewport":
-                    child.setAutoFillBackground(False)
-                    child.setStyleSheet("background-color: #282828; border: none;")
-                    
-                # 递归处理这个控件的子控件
-                for grandchild in child.findChildren(QWidget):
-                    grandchild.setAutoFillBackground(False)
-                    if "viewport" in grandchild.objectName().lower():
-                        grandchild.setStyleSheet("background-color: #282828; border: none;")
-                
-            # 设置容器小部件的样式
-            parent = widget.parentWidget()
-            if parent:
-                parent.setAutoFillBackground(False)
-                parent.setStyleSheet("background-color: #282828; border: none;")
-                
-                # 查找并处理QComboBoxPrivateContainer
-                container = parent.findChild(QWidget, "QComboBoxPrivateContainer")
-                if container:
-                    container.setAutoFillBackground(False)
-                    container.setStyleSheet("background-color: #282828; border: none;")
-                    
-                    # 处理容器的所有子控件
-                    for child in container.findChildren(QWidget):
-                        child.setAutoFillBackground(False)
-                        child.setStyleSheet("background-color: #282828; border: none;")
-        except Exception as e:
-            print(f"应用额外下拉框修复失败: {str(e)}")
-            import traceback
-            traceback.print_exc()
     
     def update_ui_texts(self):
         """更新UI文本，但不重新创建UI"""
@@ -971,15 +515,11 @@ class SettingsView(QWidget):
     
     def get_cache_size(self):
         """获取缓存大小"""
-        total_size = 0
         try:
-            for dirpath, dirnames, filenames in os.walk(self.cache_manager.cache_dir):
-                for f in filenames:
-                    fp = os.path.join(dirpath, f)
-                    total_size += os.path.getsize(fp)
+            return self.cache_manager.get_cache_size()
         except Exception as e:
             print(f"计算缓存大小失败: {str(e)}")
-        return total_size
+            return 0
     
     def format_size(self, size):
         """格式化文件大小"""
@@ -7,238 +7,65 @@ import sys
 
 from PyQt5.QtWidgets import (
     QWidget, QLabel, QPushButton, QVBoxLayout, 
-    QHBoxLayout, QFrame, QScrollArea, QSizePolicy, 
-    QStackedWidget, QProgressBar
+    QHBoxLayout, QFrame, QStackedWidget, QProgressBar, QLineEdit
 )
-from PyQt5.QtGui import QPixmap, QImage, QIcon
-from PyQt5.QtCore import Qt, pyqtSignal, QThread, QSize, QPropertyAnimation, QEasingCurve
+from PyQt5.QtGui import QPixmap, QIcon
+from PyQt5.QtCore import Qt, pyqtSignal, QThread, QSize, QPropertyAnimation, QEasingCurve, QTimer
 
+from src.ui.playlist_list import PlaylistListModel, PlaylistItemDelegate, PlaylistListView
+from src.ui.playlist_view import SongLoader
+from src.utils.cache_manager import CacheManager
+from src.utils.image_manager import get_image_manager
+from src.utils.image_pool import ImageWorkerPool
+from src.utils.image_utils import scaled_pixmap
 from src.utils.language_manager import LanguageManager
 from src.utils.logger import logger
-
-class ImageLoader(QThread):
-    """图片加载线程"""
-    image_loaded = pyqtSignal(QImage, str)
-    
-    def __init__(self, url, cache_manager):
-        super().__init__()
-        self.url = url
-        self.cache_manager = cache_manager
-    
-    def run(self):
-        try:
-            # 尝试从缓存加载
-            image = self.cache_manager.get_cached_image(self.url)
-            
-            if not image:
-                # 从网络加载
-                import requests
-                from io import BytesIO
-                from requests.adapters import HTTPAdapter
-                from urllib3.util.retry import Retry
-                
-                session = requests.Session()
-                retries = Retry(total=3, backoff_factor=0.5)
-                session.mount('https://', HTTPAdapter(max_retries=retries))
-                
-                response = session.get(self.url, timeout=10)
-                response.raise_for_status()
-                
-                image_data = BytesIO(response.content)
-                
-                image = QImage()
-                image.loadFromData(image_data.getvalue())
-                
-                # 缓存图片
-                if not image.isNull():
-                    self.cache_manager.cache_image(self.url, image)
-            
-            if image and not image.isNull():
-                self.image_loaded.emit(image, self.url)
-        
-        except Exception as e:
-            logger.error(f"加载图片失败: {str(e)}")
-
-class PlaylistItem(QWidget):
-    """播放列表项组件"""
-    clicked = pyqtSignal(object)  # 发送点击信号和播放列表数据
-    
-    def __init__(self, playlist_data, parent=None):
-        super().__init__(parent)
-        self.playlist_data = playlist_data
-        self.is_selected = False
-        self.init_ui()
-    
-    def init_ui(self):
-        layout = QHBoxLayout(self)
-        layout.setContentsMargins(10, 5, 10, 5)
-        
-        # 播放列表图标（默认图标）
-        self.icon_label = QLabel()
-        self.icon_label.setFixedSize(QSize(40, 40))
-        
-        # 使用父级的get_resource_path方法获取图标路径
-        parent_view = self.parent()
-        while parent_view and not hasattr(parent_view, 'get_resource_path'):
-            parent_view = parent_view.parent()
-            
-        if parent_view and hasattr(parent_view, 'get_resource_path'):
-            icon_path = parent_view.get_resource_path("app_icon.png")
-        else:
-            # 回退方案：直接使用相对路径
-            icon_path = os.path.join("src", "assets", "app_icon.png")
-            
-        default_icon = QPixmap(icon_path)
-        
-        if not default_icon.isNull():
-            self.icon_label.setPixmap(default_icon.scaled(40, 40, Qt.KeepAspectRatio, Qt.SmoothTransformation))
-        else:
-            # 如果图标加载失败，显示文本占位符
-            self.icon_label.setText("🎵")
-            self.icon_label.setAlignment(Qt.AlignCenter)
-            self.icon_label.setStyleSheet("background-color: #282828; border-radius: 4px;")
-        layout.addWidget(self.icon_label)
-        
-        # 播放列表标题
-        self.title_label = QLabel(self.playlist_data.get("name", "未知播放列表"))
-        self.title_label.setStyleSheet("""
-            QLabel {
-                color: #FFFFFF;
-                font-weight: 600;
-                font-size: 14px;
-            }
-        """)
-        layout.addWidget(self.title_label)
-        
-        # 固定高度
-        self.setFixedHeight(50)
-        self.setMouseTracking(True)  # 跟踪鼠标移动
-        
-        # 设置样式
-        self.update_style()
-        
-        # 尝试加载图像（如果有）
-        self._set_playlist_image()
-    
-    def _set_playlist_image(self):
-        """设置播放列表封面图像"""
-        images = self.playlist_data.get("images", [])
-        if images and len(images) > 0:
-            image_url = images[0].get("url", "")
-            if image_url:
-                try:
-                    # 尝试异步加载封面图像
-                    from PyQt5.QtCore import QThread, pyqtSignal
-                    
-                    class SimpleImageLoader(QThread):
-                        image_loaded = pyqtSignal(QPixmap)
-                        
-                        def __init__(self, url):
-                            super().__init__()
-                            self.url = url
-                        
-                        def run(self):
-                            try:
-                                import requests
-                                from io import BytesIO
-                                from requests.adapters import HTTPAdapter
-                                from urllib3.util.retry import Retry
-                                
-                                session = requests.Session()
-                                retries = Retry(total=3, backoff_factor=0.5)
-                                session.mount('https://', HTTPAdapter(max_retries=retries))
-                                
-                                response = session.get(self.url, timeout=10)
-                                response.raise_for_status()
-                                
-                                image_data = BytesIO(response.content)
-                                pixmap = QPixmap()
-                                pixmap.loadFromData(image_data.getvalue())
-                                
-                                if not pixmap.isNull():
-                                    self.image_loaded.emit(pixmap)
-                            except Exception as e:
-                                logger.error(f"加载播放列表封面失败: {str(e)}")
-                    
-                    # 创建并启动加载器
-                    self.img_loader = SimpleImageLoader(image_url)
-                    self.img_loader.image_loaded.connect(self._on_image_loaded)
-                    self.img_loader.start()
-                except Exception as e:
-                    logger.error(f"初始化图片加载器失败: {str(e)}")
-    
-    def _on_image_loaded(self, pixmap):
-        """图片加载完成回调"""
-        if self.icon_label and not pixmap.isNull():
-            scaled_pixmap = pixmap.scaled(40, 40, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-            self.icon_label.setPixmap(scaled_pixmap)
-            
-    def set_selected(self, selected):
-        """设置是否选中状态"""
-        self.is_selected = selected
-        self.update_style()
-    
-    def update_style(self):
-        """更新样式"""
-        if self.is_selected:
-            self.setStyleSheet("""
-                QWidget {
-                    background-color: #282828;
-                    border-radius: 4px;
-                }
-            """)
-        else:
-            self.setStyleSheet("")
-    
-    def enterEvent(self, event):
-        """鼠标进入事件"""
-        if not self.is_selected:
-            self.setStyleSheet("""
-                QWidget {
-                    background-color: #1A1A1A;
-                    border-radius: 4px;
-                }
-            """)
-        super().enterEvent(event)
-    
-    def leaveEvent(self, event):
-        """鼠标离开事件"""
-        if not self.is_selected:
-            self.setStyleSheet("")
-        super().leaveEvent(event)
-    
-    def mousePressEvent(self, event):
-        """鼠标点击事件"""
-        self.clicked.emit(self.playlist_data)
-        super().mousePressEvent(event)
+from src.utils.search_index import PlaylistNameIndex
 
 class SidebarView(QWidget):
     """侧边栏视图"""
     playlist_selected = pyqtSignal(object)  # 发送选中的播放列表数据
     collapsed_changed = pyqtSignal(bool)    # 侧边栏折叠状态变化信号
+    playlists_ready = pyqtSignal(list)      # 播放列表显示完成信号（按显示顺序）
     
     # 添加内部信号用于线程通信
     _playlists_loaded = pyqtSignal(list)  # 播放列表加载完成信号
     _loading_error = pyqtSignal()         # 加载错误信号
     
-    def __init__(self, spotify_client):
+    # 鼠标在播放列表项上停留多久后开始预取歌曲（毫秒）
+    HOVER_PREFETCH_DELAY = 250
+    
+    def __init__(self, spotify_client, cache_manager=None):
         super().__init__()
         
         # 基础设置
         self.sp = spotify_client
+        self.cache_manager = cache_manager or CacheManager()
         self.playlists_loaded = False
         self.language_manager = LanguageManager()
         self.is_collapsed = False
-        self.playlist_items = []  # 保存所有播放列表项
-        self.selected_item = None  # 当前选中的项
         
         # 设置固定宽度
         self.expanded_width = 200  # 减小展开宽度，原为220
         self.collapsed_width = 50  # 折叠宽度 - 与图片宽度相同
         self.setFixedWidth(self.expanded_width)
         
-        # 缓存折叠状态下的图标按钮
-        self.cached_icon_buttons = []
+        # 悬停预取
+        self.hover_playlist = None     # 当前悬停等待预取的播放列表
+        self.prefetch_loaders = {}     # 播放列表ID -> 正在预取的SongLoader
+        self.hover_timer = QTimer(self)
+        self.hover_timer.setSingleShot(True)
+        self.hover_timer.timeout.connect(self._start_hover_prefetch)
+        
+        # 播放列表封面，只加载可见行，通过共享的下载管理器和磁盘缓存加载
+        self.image_pool = ImageWorkerPool(
+            lambda url: get_image_manager().fetch(url, 'playlist', self.cache_manager),
+            max_workers=4, parent=self)
+        self.image_pool.image_loaded.connect(self._on_playlist_image_loaded)
+        self.cover_priority_timer = QTimer(self)
+        self.cover_priority_timer.setSingleShot(True)
+        self.cover_priority_timer.setInterval(50)
+        self.cover_priority_timer.timeout.connect(self._update_cover_priorities)
         
         # 初始化UI
         self.init_ui()
@@ -293,57 +120,21 @@ class SidebarView(QWidget):
         self.main_layout.setContentsMargins(0, 0, 0, 0)
         self.main_layout.setSpacing(0)
         
-        # 设置样式
-        self.setStyleSheet("""
-            QWidget {
-                background-color: #000000;
-            }
-            QLabel {
-                color: #B3B3B3;
-            }
-            QScrollArea {
-                border: none;
-                background-color: transparent;
-            }
-            QScrollBar:vertical {
-                border: none;
-                background: #121212;
-                width: 8px;
-                margin: 0px 0px 0px 0px;
-            }
-            QScrollBar::handle:vertical {
-                background: #535353;
-                min-height: 20px;
-                border-radius: 4px;
-            }
-            QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {
-                border: none;
-                background: none;
-            }
-        """)
+        # 样式由主题按 objectName 匹配（见 src/ui/theme.py）
+        self.setObjectName("sidebar")
         
         # 移除顶部标题区域
         # 直接添加分隔线作为顶部边界
         separator = QFrame()
         separator.setFrameShape(QFrame.HLine)
         separator.setFrameShadow(QFrame.Sunken)
-        separator.setStyleSheet("background-color: #282828;")
+        separator.setObjectName("sidebarSeparator")
         separator.setFixedHeight(1)
         self.main_layout.addWidget(separator)
         
-        # 为折叠状态创建一个垂直容器 - 使用QScrollArea支持滚动
-        self.collapsed_scroll = QScrollArea()
-        self.collapsed_scroll.setWidgetResizable(True)
-        self.collapsed_scroll.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
-        self.collapsed_scroll.setStyleSheet("""
-            QScrollArea {
-                border: none;
-                background-color: transparent;
-            }
-        """)
-        
-        self.collapsed_container = QWidget()
-        self.collapsed_layout = QVBoxLayout(self.collapsed_container)
+        # 折叠状态的顶部按钮区域，歌单图标由下方同一个列表显示
+        self.collapsed_header = QWidget()
+        self.collapsed_layout = QVBoxLayout(self.collapsed_header)
         self.collapsed_layout.setContentsMargins(0, 10, 0, 10)
         self.collapsed_layout.setSpacing(8)
         self.collapsed_layout.setAlignment(Qt.AlignHCenter | Qt.AlignTop)
@@ -357,17 +148,8 @@ class SidebarView(QWidget):
             self.collapsed_button.setIcon(QIcon())
             logger.warning(f"警告: 找不到图标文件 {icon_path}")
         self.collapsed_button.setFixedSize(QSize(30, 30))
-        self.collapsed_button.setStyleSheet("""
-            QPushButton {
-                background-color: transparent;
-                border: none;
-                color: #FFFFFF;
-            }
-            QPushButton:hover {
-                background-color: #282828;
-                border-radius: 15px;
-            }
-        """)
+        self.collapsed_button.setObjectName("sidebarCollapsedButton")
+        self.collapsed_button.setProperty("variant", "icon")
         self.collapsed_button.clicked.connect(self.toggle_sidebar)
         
         # 将折叠按钮添加到折叠容器
@@ -376,17 +158,14 @@ class SidebarView(QWidget):
         # 添加一个小间隔
         spacer = QFrame()
         spacer.setFrameShape(QFrame.HLine)
-        spacer.setStyleSheet("background-color: #282828;")
+        spacer.setObjectName("sidebarSeparator")
         spacer.setFixedHeight(1)
         spacer.setFixedWidth(30)  # 与按钮宽度接近
         self.collapsed_layout.addWidget(spacer, 0, Qt.AlignHCenter)
         
-        # 设置滚动区域的内容
-        self.collapsed_scroll.setWidget(self.collapsed_container)
-        
-        # 将折叠滚动区域添加到主布局，但初始时隐藏
-        self.main_layout.addWidget(self.collapsed_scroll)
-        self.collapsed_scroll.hide()
+        # 将折叠按钮区域添加到主布局，但初始时隐藏
+        self.main_layout.addWidget(self.collapsed_header)
+        self.collapsed_header.hide()
         
         # 添加"我的播放列表"标题
         self.playlist_header = QWidget()
@@ -394,13 +173,7 @@ class SidebarView(QWidget):
         self.playlist_header_layout.setContentsMargins(12, 10, 12, 10)  # 减小左右边距
         
         self.playlist_title = QLabel("我的播放列表")
-        self.playlist_title.setStyleSheet("""
-            QLabel {
-                color: #B3B3B3;
-                font-size: 14px;
-                font-weight: bold;
-            }
-        """)
+        self.playlist_title.setObjectName("sidebarTitle")
         self.playlist_header_layout.addWidget(self.playlist_title)
         
         # 添加刷新按钮
@@ -408,18 +181,8 @@ class SidebarView(QWidget):
         # 如果没有refresh_icon.png，使用文本代替
         self.refresh_button.setText("↻")
         self.refresh_button.setFixedSize(QSize(20, 20))
-        self.refresh_button.setStyleSheet("""
-            QPushButton {
-                background-color: transparent;
-                border: none;
-                color: #FFFFFF;
-                font-size: 16px;
-            }
-            QPushButton:hover {
-                background-color: #282828;
-                border-radius: 10px;
-            }
-        """)
+        self.refresh_button.setObjectName("sidebarRefreshButton")
+        self.refresh_button.setProperty("variant", "icon")
         self.refresh_button.clicked.connect(self.reload_playlists)
         self.playlist_header_layout.addWidget(self.refresh_button)
         
@@ -432,17 +195,7 @@ class SidebarView(QWidget):
             self.toggle_button.setIcon(QIcon())
             self.toggle_button.setIconSize(QSize(16, 16))
         self.toggle_button.setFixedSize(QSize(20, 20))
-        self.toggle_button.setStyleSheet("""
-            QPushButton {
-                background-color: transparent;
-                border: none;
-                color: #FFFFFF;
-            }
-            QPushButton:hover {
-                background-color: #282828;
-                border-radius: 10px;
-            }
-        """)
+        self.toggle_button.setProperty("variant", "icon")
         self.toggle_button.clicked.connect(self.toggle_sidebar)
         
         # 将折叠按钮添加到播放列表标题栏
@@ -450,17 +203,30 @@ class SidebarView(QWidget):
         
         self.main_layout.addWidget(self.playlist_header)
         
-        # 添加播放列表容器（使用QScrollArea实现滚动）
-        self.playlist_container = QScrollArea()
-        self.playlist_container.setWidgetResizable(True)
-        self.playlist_container.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
-        
-        # 创建内容控件
-        self.playlist_content = QWidget()
-        self.playlist_content_layout = QVBoxLayout(self.playlist_content)
-        self.playlist_content_layout.setContentsMargins(5, 0, 5, 0)
-        self.playlist_content_layout.setSpacing(2)
-        self.playlist_content_layout.setAlignment(Qt.AlignTop)
+        # 歌单筛选框，每次按键直接在预先建立的名称索引中筛选
+        self.filter_widget = QWidget()
+        self.filter_layout = QHBoxLayout(self.filter_widget)
+        self.filter_layout.setContentsMargins(12, 0, 12, 8)
+        self.filter_edit = QLineEdit()
+        self.filter_edit.setClearButtonEnabled(True)
+        self.filter_edit.setFixedHeight(28)
+        self.filter_edit.setObjectName("sidebarFilter")
+        self.filter_edit.textChanged.connect(self._on_filter_text_changed)
+        self.filter_layout.addWidget(self.filter_edit)
+        self.main_layout.addWidget(self.filter_widget)
+        self.playlist_index = PlaylistNameIndex()
+        
+        # 歌单列表（模型/视图，只绘制可见行，封面在行第一次绘制时才加载）
+        self.playlist_model = PlaylistListModel(self)
+        self.playlist_model.cover_requested.connect(self._load_playlist_cover)
+        self.playlist_list = PlaylistListView()
+        self.playlist_list.setModel(self.playlist_model)
+        self.playlist_list.setItemDelegate(
+            PlaylistItemDelegate(QPixmap(self.get_resource_path("app_icon.png")), self.playlist_list))
+        self.playlist_list.playlist_clicked.connect(self._on_playlist_item_clicked)
+        self.playlist_list.hover_started.connect(self._on_playlist_item_hovered)
+        self.playlist_list.hover_ended.connect(self._on_playlist_item_unhovered)
+        self.playlist_list.verticalScrollBar().valueChanged.connect(self.cover_priority_timer.start)
         
         # 添加加载指示器容器
         self.loading_widget = QWidget()
@@ -472,28 +238,12 @@ class SidebarView(QWidget):
         self.progress_bar.setRange(0, 0)  # 不确定进度
         self.progress_bar.setFixedHeight(4)
         self.progress_bar.setTextVisible(False)
-        self.progress_bar.setStyleSheet("""
-            QProgressBar {
-                background-color: #535353;
-                border-radius: 2px;
-                border: none;
-            }
-            QProgressBar::chunk {
-                background-color: #1DB954;
-                border-radius: 2px;
-            }
-        """)
         self.loading_layout.addWidget(self.progress_bar)
         
         # 加载文字
         self.loading_label = QLabel("正在加载播放列表...")
         self.loading_label.setAlignment(Qt.AlignCenter)
-        self.loading_label.setStyleSheet("""
-            QLabel {
-                color: #B3B3B3;
-                font-size: 13px;
-            }
-        """)
+        self.loading_label.setObjectName("sidebarLoadingLabel")
         self.loading_layout.addWidget(self.loading_label)
         
         # 创建空提示控件
@@ -505,34 +255,26 @@ class SidebarView(QWidget):
         self.empty_icon = QLabel()
         empty_icon_text = "📂"
         self.empty_icon.setText(empty_icon_text)
-        self.empty_icon.setStyleSheet("font-size: 32px; color: #B3B3B3;")
+        self.empty_icon.setObjectName("sidebarEmptyIcon")
         self.empty_icon.setAlignment(Qt.AlignCenter)
         self.empty_layout.addWidget(self.empty_icon)
         
         # 空提示文字
         self.empty_label = QLabel("没有找到播放列表")
         self.empty_label.setAlignment(Qt.AlignCenter)
-        self.empty_label.setStyleSheet("""
-            QLabel {
-                color: #B3B3B3;
-                font-size: 13px;
-                margin-top: 10px;
-            }
-        """)
+        self.empty_label.setObjectName("sidebarEmptyLabel")
         self.empty_layout.addWidget(self.empty_label)
         
         # 播放列表容器的堆栈控件
         self.playlist_stack = QStackedWidget()
         self.playlist_stack.addWidget(self.loading_widget)  # 0: 加载中
-        self.playlist_stack.addWidget(self.playlist_content)  # 1: 播放列表内容
+        self.playlist_stack.addWidget(self.playlist_list)  # 1: 播放列表内容
         self.playlist_stack.addWidget(self.empty_widget)  # 2: 空提示
         
         # 默认显示加载中状态
         self.playlist_stack.setCurrentIndex(0)
         
-        # 将堆栈控件设置为ScrollArea的内容
-        self.playlist_container.setWidget(self.playlist_stack)
-        self.main_layout.addWidget(self.playlist_container)
+        self.main_layout.addWidget(self.playlist_stack)
     
     def update_ui_texts(self):
         """更新UI文本"""
@@ -544,6 +286,9 @@ class SidebarView(QWidget):
         
         # 更新空提示
         self.empty_label.setText(self.language_manager.get_text('sidebar.no_playlists', '没有找到播放列表'))
+        
+        # 更新筛选框提示
+        self.filter_edit.setPlaceholderText(self.language_manager.get_text('sidebar.filter_placeholder', '筛选歌单'))
     
     def load_playlists(self):
         """加载用户播放列表"""
@@ -591,61 +336,142 @@ class SidebarView(QWidget):
         # 清空现有内容
         self._clear_playlists()
         
-        # 添加播放列表
+        # 添加播放列表，只有可见的行会被绘制和加载封面
         if playlists and len(playlists) > 0:
-            for playlist in playlists:
-                self._add_playlist_item(playlist)
+            self.playlist_model.set_playlists(playlists)
+            self.playlist_index.set_playlists(playlists)
             
-            # 显示播放列表内容
-            self.playlist_stack.setCurrentIndex(1)
-            
-            # 如果是折叠状态，调整播放列表项显示
-            if self.is_collapsed:
-                self._update_playlist_items_collapsed(True)
+            # 重新加载后保留用户输入的筛选
+            if self.filter_edit.text():
+                self._on_filter_text_changed(self.filter_edit.text())
+            else:
+                self.playlist_stack.setCurrentIndex(1)
         else:
             # 显示空状态
+            self.empty_label.setText(self.language_manager.get_text('sidebar.no_playlists', '没有找到播放列表'))
             self.playlist_stack.setCurrentIndex(2)
         
         # 标记为已加载
         self.playlists_loaded = True
+        self.playlists_ready.emit(playlists or [])
     
     def _clear_playlists(self):
         """清空播放列表"""
-        # 清除内容布局中的所有控件
-        while self.playlist_content_layout.count():
-            item = self.playlist_content_layout.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
-        
-        # 清空播放列表项列表
-        self.playlist_items = []
-        self.selected_item = None
+        # 取消尚未完成的封面加载
+        self.image_pool.cancel_all()
+        self.playlist_model.set_playlists([])
+        self.playlist_index.set_playlists([])
     
-    def _add_playlist_item(self, playlist_data):
-        """添加播放列表项"""
-        item = PlaylistItem(playlist_data)
-        item.clicked.connect(self._on_playlist_item_clicked)
-        self.playlist_content_layout.addWidget(item)
-        self.playlist_items.append(item)
+    def _on_filter_text_changed(self, text):
+        """筛选文本变化，只改变列表显示哪些歌单
+        :param text: 筛选文本
+        """
+        if not self.playlist_model.playlists():
+            return
+        rows = self.playlist_index.filter(text)
+        self.playlist_list.set_filter_rows(rows)
+        
+        if rows is not None and not rows:
+            self.empty_label.setText(self.language_manager.get_text('sidebar.no_matches', '没有匹配的歌单'))
+            self.playlist_stack.setCurrentIndex(2)
+        else:
+            self.playlist_stack.setCurrentIndex(1)
+        # 可见的歌单变了，取消不再可见的封面加载
+        self.cover_priority_timer.start()
+    
+    def _load_playlist_cover(self, url):
+        """加载播放列表封面（由列表在行绘制时请求，此时行一定可见）
+        :param url: 图片URL
+        """
+        self.image_pool.request(url, ImageWorkerPool.PRIORITY_VISIBLE)
+    
+    def _update_cover_priorities(self):
+        """滚动后按与可见区域的距离重排封面加载队列，取消滚远的行"""
+        visible = self.playlist_list.visible_rows()
+        if visible is None:
+            self.playlist_model.forget_cover_requests(self.image_pool.cancel_all())
+            return
+        first, last = visible
+        
+        # 上下各预取一屏
+        nearby_first, nearby_last = self.playlist_list.visible_rows(self.playlist_list.viewport().height())
+        priorities = {}
+        for row in range(nearby_first, nearby_last + 1):
+            url = self.playlist_model.cover_url(row)
+            if not url or self.playlist_model.has_cover(url):
+                continue
+            distance = first - row if row < first else max(0, row - last)
+            if distance < priorities.get(url, distance + 1):
+                priorities[url] = distance
+        
+        self.playlist_model.forget_cover_requests(self.image_pool.reprioritize(priorities))
+    
+    def _on_playlist_image_loaded(self, image, url):
+        """播放列表封面加载完成"""
+        if image.isNull():
+            return
+        self.playlist_model.set_cover(url, scaled_pixmap(image, PlaylistItemDelegate.ICON_SIZE))
+    
+    def _on_playlist_item_hovered(self, playlist_data):
+        """鼠标进入播放列表项，停留一段时间后开始预取"""
+        self.hover_playlist = playlist_data
+        self.hover_timer.start(self.HOVER_PREFETCH_DELAY)
+    
+    def _on_playlist_item_unhovered(self, playlist_data):
+        """鼠标离开播放列表项，取消尚未完成的预取"""
+        if self.hover_playlist is playlist_data:
+            self.hover_timer.stop()
+            self.hover_playlist = None
+        
+        loader = self.prefetch_loaders.get(playlist_data.get("id"))
+        if loader and not self._is_prefetch_claimed(playlist_data):
+            loader.requestInterruption()
+    
+    def _is_prefetch_claimed(self, playlist_data):
+        """预取的播放列表已被点击选中时，让预取继续完成"""
+        return self.playlist_model.selected_id() is not None and \
+            self.playlist_model.selected_id() == playlist_data.get("id")
+    
+    def _start_hover_prefetch(self):
+        """以低优先级在后台预取悬停的播放列表歌曲到缓存"""
+        playlist_data = self.hover_playlist
+        self.hover_playlist = None
+        if not playlist_data or self._is_prefetch_claimed(playlist_data):
+            return
+        
+        playlist_id = playlist_data.get("id")
+        if not playlist_id or playlist_id in self.prefetch_loaders:
+            return
+        
+        logger.debug(f"悬停预取播放列表: {playlist_data.get('name')}")
+        loader = SongLoader(self.sp, playlist_id, self.cache_manager)
+        loader.finished.connect(lambda: self._on_prefetch_finished(playlist_id, loader))
+        self.prefetch_loaders[playlist_id] = loader
+        loader.start(QThread.LowestPriority)
+    
+    def _on_prefetch_finished(self, playlist_id, loader):
+        """预取线程结束后释放引用"""
+        if self.prefetch_loaders.get(playlist_id) is loader:
+            del self.prefetch_loaders[playlist_id]
+        loader.deleteLater()
+    
+    def stop_prefetch(self):
+        """停止所有预取线程"""
+        self.hover_timer.stop()
+        self.hover_playlist = None
+        for loader in list(self.prefetch_loaders.values()):
+            loader.requestInterruption()
+            loader.wait(1000)
+        self.image_pool.shutdown()
     
     def _on_playlist_item_clicked(self, playlist_data):
         """处理播放列表项点击事件"""
         # 检查是否点击了已选中的项
-        is_same_item = False
-        if self.selected_item and self.selected_item.playlist_data["id"] == playlist_data["id"]:
-            is_same_item = True
+        if self.playlist_model.selected_id() == playlist_data["id"]:
             logger.info(f"重复点击同一个播放列表项: {playlist_data['name']}")
         
-        # 清除上一个选中项
-        if self.selected_item:
-            self.selected_item.set_selected(False)
-        
-        # 找到当前点击的项
-        for item in self.playlist_items:
-            if item.playlist_data == playlist_data:
-                self.selected_item = item
-                item.set_selected(True)
-                break
+        # 更新选中项
+        self.playlist_model.set_selected_id(playlist_data["id"])
         
         # 发出播放列表选中信号（标记是否是同一个播放列表的重复点击）
         self.playlist_selected.emit(playlist_data)
@@ -681,6 +507,9 @@ class SidebarView(QWidget):
         
         # 预准备UI状态，但不立即显示/隐藏控件
         if self.is_collapsed:
+            # 折叠后看不到筛选框，恢复显示全部歌单
+            self.filter_edit.clear()
+
             # 折叠状态 - 准备UI
             # 使用展开图标
             icon_path = self.get_resource_path("expand.svg")
@@ -689,10 +518,6 @@ class SidebarView(QWidget):
             else:
                 logger.warning(f"警告: 找不到图标文件 {icon_path}")
                 
-            # 创建并准备折叠状态下的图标按钮（如果尚未创建）
-            if not self.cached_icon_buttons:
-                self._prepare_collapsed_icons()
-                
             # 暂时不显示折叠容器，等动画开始后再显示
         else:
             # 展开状态
@@ -736,20 +561,20 @@ class SidebarView(QWidget):
             self.setUpdatesEnabled(False)
             
             if self.is_collapsed:
-                # 隐藏常规控件，显示折叠控件
+                # 隐藏常规控件，显示折叠控件，歌单列表只显示图标
                 self.playlist_header.hide()
-                self.playlist_container.hide()
-                
-                # 显示折叠容器
-                self.collapsed_scroll.show()
+                self.filter_widget.hide()
+                self.collapsed_header.show()
+                self.playlist_list.set_collapsed(True)
             else:
                 # 隐藏折叠控件
-                self.collapsed_scroll.hide()
+                self.collapsed_header.hide()
                 
                 # 准备但暂不显示常规控件，等动画快结束时再显示
                 if progress > 0.7:
                     self.playlist_header.show()
-                    self.playlist_container.show()
+                    self.filter_widget.show()
+                    self.playlist_list.set_collapsed(False)
             
             # 恢复UI更新
             self.setUpdatesEnabled(True)
@@ -761,7 +586,8 @@ class SidebarView(QWidget):
             if not self.is_collapsed:
                 # 确保展开状态下的控件可见
                 self.playlist_header.show()
-                self.playlist_container.show()
+                self.filter_widget.show()
+                self.playlist_list.set_collapsed(False)
         
     def _finish_toggle_sidebar(self):
         """完成侧边栏折叠/展开的后续操作"""
@@ -782,19 +608,15 @@ class SidebarView(QWidget):
             if self.is_collapsed:
                 # 折叠状态 - 确保正常显示控件隐藏，折叠控件显示
                 self.playlist_header.hide()
-                self.playlist_container.hide()
-                
-                self.collapsed_scroll.show()
-                self.collapsed_container.show()
+                self.filter_widget.hide()
+                self.collapsed_header.show()
                 
                 # 应用折叠状态样式
                 self._update_playlist_items_collapsed(True)
             else:
                 # 展开状态 - 确保折叠控件隐藏，正常控件显示
-                self.collapsed_scroll.hide()
-                
                 self.playlist_header.show()
-                self.playlist_container.show()
+                self.filter_widget.show()
                 
                 # 显示常规控件
                 self._show_expanded_controls()
@@ -811,7 +633,7 @@ class SidebarView(QWidget):
     def _show_expanded_controls(self):
         """在展开状态下显示控件"""
         # 确保折叠控件隐藏
-        self.collapsed_scroll.hide()
+        self.collapsed_header.hide()
         
         # 确保按钮可见，无需再移动
         self.toggle_button.show()
@@ -820,118 +642,6 @@ class SidebarView(QWidget):
         """更新播放列表项目的显示状态
         :param collapsed: 是否折叠
         """
-        # 如果只是更新已有状态，不做任何操作
-        if collapsed == self.is_collapsed and (collapsed and self.cached_icon_buttons):
-            return
-            
-        # 暂停UI更新以减少重绘
-        if hasattr(self, 'playlist_content'):
-            self.playlist_content.setUpdatesEnabled(False)
-        if hasattr(self, 'playlist_container'):
-            self.playlist_container.setUpdatesEnabled(False)
-        
-        try:
-            if collapsed:
-                # 如果没有缓存的图标按钮，则创建
-                if not self.cached_icon_buttons:
-                    self._prepare_collapsed_icons()
-                
-                if hasattr(self, 'playlist_content_layout'):
-                    # 设置内容区域的对齐方式为居中
-                    self.playlist_content_layout.setAlignment(Qt.AlignHCenter)
-                
-                # 隐藏正常播放列表项
-                for item in self.playlist_items:
-                    if item:
-                        item.hide()
-            else:
-                if hasattr(self, 'playlist_content_layout'):
-                    # 展开状态 - 恢复正常显示，调整内容边距以适应较窄的侧边栏
-                    self.playlist_content_layout.setContentsMargins(4, 0, 4, 0)  # 减小边距
-                    self.playlist_content_layout.setAlignment(Qt.AlignTop)
-                
-                # 显示所有播放列表项
-                for item in self.playlist_items:
-                    if not item:
-                        continue
-                        
-                    item.show()
-                    
-                    # 确保标题可见
-                    if hasattr(item, 'title_label'):
-                        item.title_label.show()
-                    
-                    # 恢复图标大小
-                    if hasattr(item, 'icon_label'):
-                        item.icon_label.setFixedSize(QSize(40, 40))
-                    
-                    # 恢复布局设置，减小内容边距
-                    if hasattr(item, 'layout'):
-                        item.layout().setContentsMargins(8, 5, 8, 5)  # 减小边距
-                        item.layout().setAlignment(Qt.AlignLeft)
-                    
-                    # 恢复大小策略，调整为新的宽度
-                    item.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
-                    item.setMinimumWidth(self.expanded_width - 16)  # 调整为新宽度
-        except Exception as e:
-            logger.error(f"更新播放列表项目显示状态失败: {str(e)}")
-        finally:
-            # 恢复UI更新
-            if hasattr(self, 'playlist_content'):
-                self.playlist_content.setUpdatesEnabled(True)
-            if hasattr(self, 'playlist_container'):
-                self.playlist_container.setUpdatesEnabled(True)
-    
-    def _prepare_collapsed_icons(self):
-        """提前准备好折叠状态下的图标按钮，避免在切换时创建"""
-        # 清空缓存
-        self.cached_icon_buttons = []
-        
-        # 清空折叠容器中除了折叠按钮和分隔线外的所有内容
-        while self.collapsed_layout.count() > 2:
-            item = self.collapsed_layout.takeAt(2)
-            if item.widget():
-                item.widget().deleteLater()
-        
-        # 为每个播放列表创建图标按钮并添加到容器
-        for item in self.playlist_items:
-            if hasattr(item, 'icon_label'):
-                # 获取图标
-                icon = None
-                if hasattr(item.icon_label, 'pixmap') and item.icon_label.pixmap():
-                    icon = item.icon_label.pixmap()
-                else:
-                    try:
-                        app_icon_path = self.get_resource_path(os.path.join("assets", "app_icon.png"))
-                        if os.path.exists(app_icon_path):
-                            icon = QPixmap(app_icon_path)
-                        else:
-                            print(f"警告: 找不到应用图标文件 {app_icon_path}")
-                    except Exception as e:
-                        print(f"加载应用图标失败: {str(e)}")
-                        
-                if icon and not icon.isNull():
-                    # 创建按钮
-                    icon_button = QPushButton()
-                    icon_button.setIcon(QIcon(icon))
-                    icon_button.setIconSize(QSize(36, 36))
-                    icon_button.setFixedSize(QSize(40, 40))
-                    icon_button.setStyleSheet("""
-                        QPushButton {
-                            background-color: transparent;
-                            border: none;
-                        }
-                        QPushButton:hover {
-                            background-color: #282828;
-                            border-radius: 20px;
-                        }
-                    """)
-                    # 存储播放列表数据以便点击时使用
-                    icon_button.playlist_data = item.playlist_data
-                    icon_button.clicked.connect(lambda checked, data=item.playlist_data: self._on_playlist_item_clicked(data))
-                    
-                    # 添加到折叠容器
-                    self.collapsed_layout.addWidget(icon_button, 0, Qt.AlignHCenter)
-                    
-                    # 缓存按钮以便后续使用
-                    self.cached_icon_buttons.append(icon_button)
\ No newline at end of file
+        # 同一个列表切换绘制方式，不需要逐项调整控件
+        self.playlist_list.set_collapsed(collapsed)
+        self.cover_priority_timer.start()
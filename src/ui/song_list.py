@@ -0,0 +1,802 @@
+"""
+歌曲列表 - 基于模型/视图的虚拟化列表
+
+只有可见的行会被绘制，封面在行第一次绘制时才请求加载，
+歌曲数量再多也不会创建额外的控件。
+大歌单的行数据由 SongListBuilder 分帧生成，首屏立即显示，其余在事件循环空隙中补齐；
+恢复离开时的位置时，所有行一次插入，行数据从锚点附近开始向两侧生成。
+各列的位置由 SongColumnLayout 按列表宽度计算一次，表头和所有行共用，
+调整窗口大小的开销与歌曲数量无关。
+"""
+import time
+import difflib
+from collections import namedtuple
+
+from PyQt5.QtWidgets import QListView, QStyledItemDelegate, QStyle, QAbstractItemView, QWidget
+from PyQt5.QtGui import QColor, QFont, QPainter, QPen, QFontMetrics
+from PyQt5.QtCore import (Qt, QAbstractListModel, QModelIndex, QRect, QPoint, QSize, QEvent,
+                          QObject, QTimer, pyqtSignal)
+
+from src.utils.image_utils import SONG_ARTWORK_SIZE, device_pixel_ratio, song_cover_url
+from src.utils.song_selection import SongSelection
+from src.ui.virtual_list import CoverCacheMixin, UniformRowsMixin
+
+# 一行歌曲需要绘制的数据，首次绘制时从歌曲字典中提取
+SongRow = namedtuple('SongRow', ['number', 'title', 'artists', 'album', 'year', 'duration', 'cover_url'])
+
+SongRole = Qt.UserRole + 1
+SongRowRole = Qt.UserRole + 2
+
+
+def build_song_row(song, index):
+    """
+    从歌曲数据中提取一行需要显示的内容
+    :param song: 歌曲数据
+    :param index: 歌曲在列表中的索引
+    :return: SongRow
+    """
+    track = song.get('track') or {}
+    album = track.get('album') or {}
+
+    artist_names = [artist.get('name', '') for artist in track.get('artists', [])]
+    release_date = album.get('release_date', '')
+
+    duration_ms = track.get('duration_ms', 0)
+    minutes = duration_ms // 60000
+    seconds = (duration_ms % 60000) // 1000
+
+    return SongRow(
+        number=str(song.get('original_index', index + 1)),
+        title=track.get('name', '未知歌曲'),
+        artists=', '.join(artist_names) if artist_names else '未知艺术家',
+        album=album.get('name', '未知专辑'),
+        year=release_date.split('-')[0] if release_date else '',
+        duration=f"{minutes}:{seconds:02d}",
+        cover_url=song_cover_url(song)
+    )
+
+
+class SongListModel(CoverCacheMixin, QAbstractListModel):
+    """歌曲列表模型"""
+    cover_requested = pyqtSignal(str)  # 需要加载封面的图片URL
+    check_state_changed = pyqtSignal()  # 勾选状态变化
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._songs = []
+        self._rows = []  # 按需生成的SongRow
+        self.selection = SongSelection()  # 按歌曲记录勾选，重新生成列表时保留
+        self._init_covers()
+
+    def set_songs(self, songs):
+        """
+        替换列表中的全部歌曲
+        :param songs: 按显示顺序排列的歌曲列表
+        """
+        self.beginResetModel()
+        self._songs = list(songs)
+        self._rows = [None] * len(self._songs)
+        self._reset_url_rows()
+        self.endResetModel()
+
+    def append_songs(self, songs, rows=None):
+        """
+        在列表末尾追加歌曲
+        :param songs: 要追加的歌曲列表
+        :param rows: 预先生成的SongRow列表，为None时在绘制时生成
+        """
+        if not songs:
+            return
+        first = len(self._songs)
+        last = first + len(songs) - 1
+        self.beginInsertRows(QModelIndex(), first, last)
+        self._songs.extend(songs)
+        self._rows.extend(rows if rows is not None else [None] * len(songs))
+        self._add_url_rows(first, last + 1)
+        self.endInsertRows()
+
+    def fill_rows(self, rows):
+        """
+        填入预先生成的行数据，已经生成过的行保持不变；行内容不变，不需要通知视图
+        :param rows: (行号, SongRow) 列表
+        """
+        for row, data in rows:
+            if self._rows[row] is None:
+                self._rows[row] = data
+
+    def update_songs(self, songs, key, anchor_row=None):
+        """
+        把列表更新为新的歌曲列表，只插入、删除和重绘有变化的行，
+        封面缓存和悬停状态不受影响
+        :param songs: 按显示顺序排列的新歌曲列表
+        :param key: 从歌曲获取身份的函数，身份相同的歌曲视为同一行
+        :param anchor_row: 需要跟踪位置的行号（如视口顶部的行）
+        :return: (插入和删除的行数, anchor_row对应歌曲的新行号，已删除或未指定时为None)
+        """
+        songs = list(songs)
+        old_keys = [key(song) for song in self._songs]
+        new_keys = [key(song) for song in songs]
+
+        # 刷新通常只改动少数几首，先去掉相同的开头和结尾再比较中间部分
+        start = 0
+        limit = min(len(old_keys), len(new_keys))
+        while start < limit and old_keys[start] == new_keys[start]:
+            start += 1
+        end = 0
+        while end < limit - start and old_keys[-1 - end] == new_keys[-1 - end]:
+            end += 1
+
+        opcodes = [('equal', 0, start, 0, start)]
+        if start < len(old_keys) - end or start < len(new_keys) - end:
+            matcher = difflib.SequenceMatcher(None, old_keys[start:len(old_keys) - end],
+                                              new_keys[start:len(new_keys) - end], autojunk=False)
+            opcodes += [(tag, i1 + start, i2 + start, j1 + start, j2 + start)
+                        for tag, i1, i2, j1, j2 in matcher.get_opcodes()]
+        opcodes.append(('equal', len(old_keys) - end, len(old_keys), len(new_keys) - end, len(new_keys)))
+
+        new_anchor = None
+        structural = 0
+        # 从后往前处理，前面各段的行号不受影响
+        for tag, i1, i2, j1, j2 in reversed(opcodes):
+            if tag == 'equal':
+                if anchor_row is not None and i1 <= anchor_row < i2:
+                    new_anchor = j1 + anchor_row - i1
+                self._replace_equal_rows(i1, songs[j1:j2])
+                continue
+            if i2 > i1:
+                self.beginRemoveRows(QModelIndex(), i1, i2 - 1)
+                del self._songs[i1:i2]
+                del self._rows[i1:i2]
+                self.endRemoveRows()
+            if j2 > j1:
+                self.beginInsertRows(QModelIndex(), i1, i1 + j2 - j1 - 1)
+                self._songs[i1:i1] = songs[j1:j2]
+                self._rows[i1:i1] = [None] * (j2 - j1)
+                self.endInsertRows()
+            structural += (i2 - i1) + (j2 - j1)
+
+        if structural:
+            self._remap_url_rows(opcodes)
+        return structural, new_anchor
+
+    def _row_cover_urls(self, first, last):
+        """
+        获取一段行的封面URL，已生成的行直接使用其中的URL
+        :param first: 第一行的行号
+        :param last: 最后一行之后的行号
+        :return: 图片URL列表
+        """
+        ratio = device_pixel_ratio()
+        return [data.cover_url if data is not None else song_cover_url(song, ratio)
+                for song, data in zip(self._songs[first:last], self._rows[first:last])]
+
+    def _replace_equal_rows(self, first, songs):
+        """
+        替换身份相同的一段歌曲，只重绘内容（如序号、曲目信息）变化的行
+        :param first: 第一行的行号
+        :param songs: 新的歌曲数据
+        """
+        run_start = None  # 连续变化的行合并为一次dataChanged
+        for offset, song in enumerate(songs + [None]):
+            row = first + offset
+            if song is not None and self._songs[row] != song:
+                # 曲目信息变化时封面也可能换了
+                self._remove_url_row(row)
+                self._songs[row] = song
+                self._rows[row] = None
+                self._add_url_rows(row, row + 1)
+                if run_start is None:
+                    run_start = row
+            elif run_start is not None:
+                self.dataChanged.emit(self.index(run_start), self.index(row - 1))
+                run_start = None
+
+    def songs(self):
+        """获取按显示顺序排列的歌曲列表"""
+        return self._songs
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._songs)
+
+    def row_data(self, row):
+        """
+        获取一行的显示数据
+        :param row: 行号
+        :return: SongRow
+        """
+        data = self._rows[row]
+        if data is None:
+            data = build_song_row(self._songs[row], row)
+            self._rows[row] = data
+        return data
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or index.row() >= len(self._songs):
+            return None
+        row = index.row()
+
+        if role == Qt.DisplayRole:
+            return self.row_data(row).title
+        if role == SongRowRole:
+            return self.row_data(row)
+        if role == SongRole:
+            return self._songs[row]
+        if role == Qt.CheckStateRole:
+            return Qt.Checked if self.selection.is_selected(self._songs[row]) else Qt.Unchecked
+        return None
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if role != Qt.CheckStateRole or not index.isValid():
+            return False
+
+        self.selection.set_selected(self._songs[index.row()], value == Qt.Checked)
+        self.dataChanged.emit(index, index, [Qt.CheckStateRole])
+        self.check_state_changed.emit()
+        return True
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        return Qt.ItemIsEnabled | Qt.ItemIsUserCheckable
+
+    # ---------- 勾选 ----------
+
+    def refresh_check_states(self):
+        """直接修改 selection 后调用，刷新所有行的勾选框"""
+        if self._songs:
+            self.dataChanged.emit(self.index(0), self.index(len(self._songs) - 1), [Qt.CheckStateRole])
+        self.check_state_changed.emit()
+
+    def checked_songs(self):
+        """按显示顺序获取列表中勾选的歌曲"""
+        return self.selection.selected(self._songs)
+
+
+class SongListBuilder(QObject):
+    """
+    分帧向模型中填充歌曲
+
+    第一屏的行立即插入，其余的行在定时器回调中按时间预算分批生成并追加，
+    每批之间把控制权交还事件循环，滚动、输入和调整窗口大小都不会被阻塞。
+    指定锚点时所有行一次插入（列表可以直接滚动到锚点），行数据从锚点开始交替向下、向上分批生成。
+    """
+    progress = pyqtSignal(int, int)  # 已插入的行数，总行数
+    finished = pyqtSignal()
+
+    FIRST_CHUNK = 30  # 首屏立即插入的行数
+    FRAME_BUDGET_MS = 8  # 每次回调最多占用的时间
+
+    def __init__(self, model, parent=None):
+        super().__init__(parent)
+        self.model = model
+        self._pending = []
+        self._position = 0
+        self._order = None  # 锚点模式下待生成行数据的行号序列
+        self._paused = False
+        self._timer = QTimer(self)
+        self._timer.setInterval(0)
+        self._timer.timeout.connect(self._build_slice)
+
+    def start(self, songs, anchor_row=None):
+        """
+        开始填充歌曲，会取消正在进行的填充
+        :param songs: 按显示顺序排列的歌曲列表
+        :param anchor_row: 需要最先显示的行（如恢复的滚动位置），为None时从第一行开始追加
+        """
+        self._timer.stop()
+        songs = list(songs)
+
+        if anchor_row is None:
+            first = songs[:self.FIRST_CHUNK]
+            self.model.set_songs([])
+            self.model.append_songs(first, [build_song_row(song, i) for i, song in enumerate(first)])
+            self._order = None
+        else:
+            # 所有行一次插入，行数据未生成的行在绘制时生成
+            self.model.set_songs(songs)
+            self._order = self._outward(anchor_row, len(songs))
+            first = self._next_rows(songs, self.FIRST_CHUNK)
+            self.model.fill_rows(first)
+
+        self._pending = songs
+        self._position = len(first)
+        self.progress.emit(self._position, len(self._pending))
+        if self._position < len(self._pending):
+            if not self._paused:
+                self._timer.start()
+        else:
+            self._finish()
+
+    def stop(self):
+        """取消尚未完成的填充"""
+        self._timer.stop()
+        self._pending = []
+        self._position = 0
+        self._order = None
+
+    def pause(self):
+        """暂停填充（列表隐藏时），之后调用 resume 从暂停处继续"""
+        self._paused = True
+        self._timer.stop()
+
+    def resume(self):
+        """继续暂停的填充"""
+        self._paused = False
+        if self._position < len(self._pending):
+            self._timer.start()
+
+    def is_running(self):
+        """是否还有歌曲未插入（包括暂停中的填充）；锚点模式下所有行已经插入，只是行数据还在生成"""
+        return self._order is None and self._position < len(self._pending)
+
+    def _build_slice(self):
+        """在时间预算内生成一批行并追加到模型"""
+        deadline = time.perf_counter() + self.FRAME_BUDGET_MS / 1000.0
+        total = len(self._pending)
+        if self._order is not None:
+            while self._position < total:
+                rows = self._next_rows(self._pending, 50)
+                self.model.fill_rows(rows)
+                self._position += len(rows)
+                if time.perf_counter() >= deadline:
+                    break
+            self.progress.emit(self._position, total)
+            if self._position >= total:
+                self._finish()
+            return
+
+        songs = []
+        rows = []
+
+        # 每生成一小段检查一次时间，避免频繁调用计时函数
+        while self._position < total:
+            end = min(self._position + 50, total)
+            for i in range(self._position, end):
+                song = self._pending[i]
+                songs.append(song)
+                rows.append(build_song_row(song, i))
+            self._position = end
+            if time.perf_counter() >= deadline:
+                break
+
+        self.model.append_songs(songs, rows)
+        self.progress.emit(self._position, total)
+        if self._position >= total:
+            self._finish()
+
+    def _next_rows(self, songs, count):
+        """
+        按锚点模式的顺序生成接下来的若干行数据
+        :param songs: 全部歌曲
+        :param count: 最多生成的行数
+        :return: (行号, SongRow) 列表
+        """
+        rows = []
+        for row in self._order:
+            rows.append((row, build_song_row(songs[row], row)))
+            if len(rows) >= count:
+                break
+        return rows
+
+    @staticmethod
+    def _outward(anchor_row, total):
+        """
+        从锚点开始交替向下、向上的行号序列；视口在锚点下方，向下每次多取一些
+        :param anchor_row: 锚点行号
+        :param total: 总行数
+        """
+        below = max(0, min(anchor_row, total))
+        above = below - 1
+        while below < total or above >= 0:
+            for _ in range(2):
+                if below < total:
+                    yield below
+                    below += 1
+            if above >= 0:
+                yield above
+                above -= 1
+
+    def _finish(self):
+        self._timer.stop()
+        self._pending = []
+        self._order = None
+        self.finished.emit()
+
+
+class SongColumnLayout(QObject):
+    """歌曲列表的列布局，宽度或显示的列变化时重新计算一次"""
+    changed = pyqtSignal()  # 列的位置变化，表头和列表需要重绘
+
+    PADDING = 20
+    SPACING = 10
+    CHECKBOX_WIDTH = 40
+    NUMBER_WIDTH = 30
+    ARTWORK_SIZE = SONG_ARTWORK_SIZE
+    DURATION_WIDTH = 80
+
+    COLUMNS = ('checkbox', 'number', 'artwork', 'title', 'album', 'duration')
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._export_mode = False
+        self._show_artwork = True
+        self._width = 0
+        self._spans = None  # 缓存的 (宽度, 各列位置)
+
+    @property
+    def export_mode(self):
+        """导出模式下显示复选框列"""
+        return self._export_mode
+
+    @export_mode.setter
+    def export_mode(self, value):
+        if value != self._export_mode:
+            self._export_mode = value
+            self._invalidate()
+
+    @property
+    def show_artwork(self):
+        """是否显示专辑封面列"""
+        return self._show_artwork
+
+    @show_artwork.setter
+    def show_artwork(self, value):
+        if value != self._show_artwork:
+            self._show_artwork = value
+            self._invalidate()
+
+    def width(self):
+        """当前的列表宽度"""
+        return self._width
+
+    def set_width(self, width):
+        """
+        设置列表宽度（列表视口大小变化时调用）
+        :param width: 视口宽度
+        """
+        if width != self._width:
+            self._width = width
+            self._invalidate()
+
+    def spans(self, width=None):
+        """
+        获取各列的水平位置
+        :param width: 行宽，为None时使用当前的列表宽度
+        :return: 列名 -> (相对行左边的x, 宽度)，未显示的列为None
+        """
+        if width is None:
+            width = self._width
+        if self._spans is None or self._spans[0] != width:
+            self._spans = (width, self._compute(width))
+        return self._spans[1]
+
+    def _invalidate(self):
+        self._spans = None
+        self.changed.emit()
+
+    def _compute(self, width):
+        x = self.PADDING
+        right = width - 1 - self.PADDING
+        spans = {}
+
+        if self._export_mode:
+            spans['checkbox'] = (x, self.CHECKBOX_WIDTH)
+            x += self.CHECKBOX_WIDTH + self.SPACING
+        else:
+            spans['checkbox'] = None
+
+        spans['number'] = (x, self.NUMBER_WIDTH)
+        x += self.NUMBER_WIDTH + self.SPACING
+
+        if self._show_artwork:
+            spans['artwork'] = (x, self.ARTWORK_SIZE)
+            x += self.ARTWORK_SIZE + self.SPACING
+        else:
+            spans['artwork'] = None
+
+        spans['duration'] = (right - self.DURATION_WIDTH, self.DURATION_WIDTH)
+
+        # 标题和专辑平分剩余宽度
+        remaining = max(0, right - self.DURATION_WIDTH - self.SPACING - x)
+        text_width = max(0, (remaining - self.SPACING) // 2)
+        spans['title'] = (x, text_width)
+        spans['album'] = (x + text_width + self.SPACING, text_width)
+        return spans
+
+
+class SongItemDelegate(QStyledItemDelegate):
+    """绘制歌曲行：复选框、序号、封面、标题和艺术家、专辑和年份、时长"""
+
+    ROW_HEIGHT = 60
+    ROW_SPACING = 5
+    ARTWORK_SIZE = SongColumnLayout.ARTWORK_SIZE
+
+    def __init__(self, columns=None, parent=None):
+        """
+        :param columns: 共用的列布局，为None时单独创建
+        :param parent: 父对象
+        """
+        super().__init__(parent)
+        self.columns = columns if columns is not None else SongColumnLayout(self)
+
+        self.primary_font = QFont()
+        self.primary_font.setPixelSize(14)
+        self.secondary_font = QFont()
+        self.secondary_font.setPixelSize(12)
+        self.primary_metrics = QFontMetrics(self.primary_font)
+        self.secondary_metrics = QFontMetrics(self.secondary_font)
+
+    @property
+    def export_mode(self):
+        """导出模式下显示复选框"""
+        return self.columns.export_mode
+
+    @export_mode.setter
+    def export_mode(self, value):
+        self.columns.export_mode = value
+
+    @property
+    def show_artwork(self):
+        """是否显示专辑封面"""
+        return self.columns.show_artwork
+
+    @show_artwork.setter
+    def show_artwork(self, value):
+        self.columns.show_artwork = value
+
+    def sizeHint(self, option, index):
+        return QSize(option.rect.width(), self.ROW_HEIGHT + self.ROW_SPACING)
+
+    def _layout(self, rect):
+        """
+        把共用的列位置平移到一行上
+        :param rect: 行的矩形区域（不含行间距）
+        :return: 各列矩形的字典，未显示的列为None
+        """
+        left = rect.left()
+        top = rect.top()
+        height = rect.height()
+        columns = {}
+        for name, span in self.columns.spans(rect.width()).items():
+            if span is None:
+                columns[name] = None
+            elif name == 'artwork':
+                columns[name] = QRect(left + span[0], top + (height - span[1]) // 2, span[1], span[1])
+            else:
+                columns[name] = QRect(left + span[0], top, span[1], height)
+        return columns
+
+    def _row_rect(self, option):
+        """行的绘制区域（去掉底部行间距）"""
+        return option.rect.adjusted(0, 0, 0, -self.ROW_SPACING)
+
+    def paint(self, painter, option, index):
+        row = index.data(SongRowRole)
+        if row is None:
+            return
+
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        rect = self._row_rect(option)
+
+        # 背景
+        hovered = option.state & QStyle.State_MouseOver
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(QColor("#282828") if hovered else QColor("#121212"))
+        painter.drawRoundedRect(rect, 4, 4)
+
+        columns = self._layout(rect)
+
+        if columns['checkbox'] is not None:
+            self._paint_checkbox(painter, columns['checkbox'], index.data(Qt.CheckStateRole) == Qt.Checked)
+
+        # 序号
+        painter.setFont(self.primary_font)
+        painter.setPen(QColor("#b3b3b3"))
+        painter.drawText(columns['number'], Qt.AlignCenter, row.number)
+
+        if columns['artwork'] is not None:
+            self._paint_artwork(painter, columns['artwork'], index.model(), row.cover_url)
+
+        # 标题和艺术家
+        self._paint_two_lines(painter, columns['title'], row.title, "#FFFFFF", row.artists)
+
+        # 专辑和发行年份
+        self._paint_two_lines(painter, columns['album'], row.album, "#b3b3b3", row.year)
+
+        # 时长
+        painter.setFont(self.primary_font)
+        painter.setPen(QColor("#b3b3b3"))
+        painter.drawText(columns['duration'], Qt.AlignRight | Qt.AlignVCenter, row.duration)
+
+        painter.restore()
+
+    def _paint_two_lines(self, painter, rect, primary, primary_color, secondary):
+        """绘制上下两行文字，超出宽度时省略"""
+        if rect.width() <= 0:
+            return
+
+        primary_height = self.primary_metrics.height()
+        secondary_height = self.secondary_metrics.height() if secondary else 0
+        spacing = 2 if secondary else 0
+        top = rect.top() + (rect.height() - primary_height - spacing - secondary_height) // 2
+
+        painter.setFont(self.primary_font)
+        painter.setPen(QColor(primary_color))
+        painter.drawText(QRect(rect.left(), top, rect.width(), primary_height),
+                         Qt.AlignLeft | Qt.AlignVCenter,
+                         self.primary_metrics.elidedText(primary, Qt.ElideRight, rect.width()))
+
+        if secondary:
+            painter.setFont(self.secondary_font)
+            painter.setPen(QColor("#b3b3b3"))
+            painter.drawText(QRect(rect.left(), top + primary_height + spacing, rect.width(), secondary_height),
+                             Qt.AlignLeft | Qt.AlignVCenter,
+                             self.secondary_metrics.elidedText(secondary, Qt.ElideRight, rect.width()))
+
+    def _paint_artwork(self, painter, rect, model, url):
+        """绘制专辑封面，未加载时显示占位"""
+        pixmap = model.cover(url) if url else None
+        if pixmap is not None and not pixmap.isNull():
+            # 高分屏的封面像素更多，按逻辑尺寸绘制
+            ratio = pixmap.devicePixelRatio()
+            target = QRect(0, 0, round(pixmap.width() / ratio), round(pixmap.height() / ratio))
+            target.moveCenter(rect.center())
+            painter.drawPixmap(target, pixmap)
+            return
+
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(QColor("#333333"))
+        painter.drawRoundedRect(rect, 4, 4)
+        painter.setPen(QColor("#b3b3b3"))
+        painter.setFont(self.primary_font)
+        painter.drawText(rect, Qt.AlignCenter, "..." if url else "🎵")
+
+    def _paint_checkbox(self, painter, rect, checked):
+        """绘制导出模式下的复选框"""
+        box = QRect(0, 0, 20, 20)
+        box.moveCenter(rect.center())
+
+        if checked:
+            painter.setPen(QPen(QColor("#1DB954"), 2))
+            painter.setBrush(QColor("#1DB954"))
+            painter.drawRoundedRect(box, 4, 4)
+            painter.setPen(QPen(QColor("#FFFFFF"), 2, Qt.SolidLine, Qt.RoundCap, Qt.RoundJoin))
+            origin = box.topLeft()
+            painter.drawPolyline(origin + QPoint(5, 10), origin + QPoint(9, 14), origin + QPoint(15, 6))
+        else:
+            painter.setPen(QPen(QColor("#b3b3b3"), 2))
+            painter.setBrush(Qt.NoBrush)
+            painter.drawRoundedRect(box, 4, 4)
+
+    def editorEvent(self, event, model, option, index):
+        """导出模式下点击复选框列切换勾选状态"""
+        if not self.export_mode or event.type() != QEvent.MouseButtonRelease or event.button() != Qt.LeftButton:
+            return False
+
+        checkbox_rect = self._layout(self._row_rect(option))['checkbox']
+        if checkbox_rect is None or not checkbox_rect.contains(event.pos()):
+            return False
+
+        checked = index.data(Qt.CheckStateRole) == Qt.Checked
+        return model.setData(index, Qt.Unchecked if checked else Qt.Checked, Qt.CheckStateRole)
+
+
+class SongListHeader(QWidget):
+    """歌曲列表的表头，与列表共用列布局，只绘制文字不创建子控件"""
+
+    HEIGHT = 32
+
+    def __init__(self, view, parent=None):
+        """
+        :param view: 对应的歌曲列表视图，表头与其视口左右对齐
+        :param parent: 父控件
+        """
+        super().__init__(parent)
+        self.view = view
+        self.columns = view.columns
+        self.titles = {'number': '#', 'title': '', 'album': '', 'duration': ''}
+        self.title_font = QFont()
+        self.title_font.setPixelSize(13)
+        self.setFixedHeight(self.HEIGHT)
+        self.columns.changed.connect(self.update)
+
+    def set_titles(self, titles):
+        """
+        设置列标题
+        :param titles: 列名 -> 标题文本
+        """
+        self.titles.update(titles)
+        self.update()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), QColor("#121212"))
+
+        # 表头与列表视口左对齐（列表有左右边距）
+        viewport = self.view.viewport()
+        left = self.mapFromGlobal(viewport.mapToGlobal(QPoint(0, 0))).x()
+        spans = self.columns.spans(viewport.width())
+        height = self.height() - 1
+
+        painter.setFont(self.title_font)
+        painter.setPen(QColor("#b3b3b3"))
+        metrics = painter.fontMetrics()
+        for name, align in (('number', Qt.AlignCenter),
+                            ('title', Qt.AlignLeft | Qt.AlignVCenter),
+                            ('album', Qt.AlignLeft | Qt.AlignVCenter),
+                            ('duration', Qt.AlignRight | Qt.AlignVCenter)):
+            span = spans.get(name)
+            text = self.titles.get(name)
+            if span is None or not text or span[1] <= 0:
+                continue
+            painter.drawText(QRect(left + span[0], 0, span[1], height), align,
+                             metrics.elidedText(text, Qt.ElideRight, span[1]))
+
+        # 底部分隔线
+        painter.setPen(QColor("#282828"))
+        painter.drawLine(left, height, left + viewport.width() - 1, height)
+        painter.end()
+
+
+class SongListView(UniformRowsMixin, QListView):
+    """虚拟化的歌曲列表视图，所有行等高"""
+
+    def __init__(self, columns=None, parent=None):
+        """
+        :param columns: 共用的列布局，视口宽度变化时更新，为None时单独创建
+        :param parent: 父控件
+        """
+        super().__init__(parent)
+        self.columns = columns if columns is not None else SongColumnLayout(self)
+        self.columns.changed.connect(self.viewport().update)
+        self.setUniformItemSizes(True)
+        # 分批布局，追加大量行时不会一次性重新计算所有行的位置
+        self.setLayoutMode(QListView.Batched)
+        self.setBatchSize(500)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.verticalScrollBar().setSingleStep(20)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.setSelectionMode(QAbstractItemView.NoSelection)
+        self.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.setFocusPolicy(Qt.NoFocus)
+        self.setMouseTracking(True)
+        self.viewport().setAttribute(Qt.WA_Hover)
+        self.setViewportMargins(20, 10, 20, 10)
+        self.setFrameShape(QListView.NoFrame)
+        # 列表和滚动条的样式在 theme.py 中按对象名设置
+        self.setObjectName('songList')
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        # 列位置只在这里随宽度计算一次，所有行绘制时直接使用
+        self.columns.set_width(self.viewport().width())
+
+    def dataChanged(self, top_left, bottom_right, roles=()):
+        # 所有行等高，内容变化不影响布局；跳过QListView的重新布局，
+        # 否则分批布局过程中滚动范围变小，勾选一行就会让列表跳回前面
+        QAbstractItemView.dataChanged(self, top_left, bottom_right, roles)
+
+    def scroll_anchor(self):
+        """
+        记录视口顶部的行及其偏移，列表内容变化后用 restore_scroll_anchor 回到原来的位置
+        :return: (行号, 行顶部在视口之上的像素)，没有行时返回None
+        """
+        visible = self.visible_rows()
+        if visible is None:
+            return None
+        first = visible[0]
+        return first, self.verticalScrollBar().value() - first * self.sizeHintForRow(0)
+
+    def restore_scroll_anchor(self, row, offset):
+        """
+        立即完成布局并滚动到指定行，避免分批布局过程中滚动范围变小导致位置被截断
+        :param row: 行号
+        :param offset: 行顶部在视口之上的像素
+        """
+        self.setLayoutMode(QListView.SinglePass)
+        self.doItemsLayout()
+        self.setLayoutMode(QListView.Batched)
+        self.verticalScrollBar().setValue(row * self.sizeHintForRow(0) + offset)
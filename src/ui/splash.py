@@ -3,12 +3,16 @@ from PyQt5.QtWidgets import QSplashScreen, QProgressBar, QLabel, QVBoxLayout, QW
 from PyQt5.QtGui import QFont, QPainter, QColor, QPixmap
 from PyQt5.QtCore import Qt, QTimer, pyqtSignal, QDateTime
 import os
+from src.utils.animation_clock import get_animation_clock
 from src.utils.logger import logger
 
 class SplashWindow(QSplashScreen):
     # 添加完成信号
     finished = pyqtSignal()
     
+    FRAME_MS = 30  # 进度条更新间隔
+    SAFETY_MS = 3000  # 超过这个时间强制完成，防止动画卡住
+    
     def __init__(self):
         super().__init__()
         self.setFixedSize(400, 300)
@@ -60,37 +64,35 @@ class SplashWindow(QSplashScreen):
         self.progress_bar.setMaximum(100)
         self.progress_bar.setValue(0)
         
-        # 创建定时器
-        self.timer = QTimer()
-        self.timer.timeout.connect(self.update_progress)
-        
         # 设置进度控制参数
         self.min_display_time = 1200  # 最小显示时间(毫秒)，减少为1.2秒
         self.start_time = 0
+        self.done = False  # 是否已经发出完成信号
         
-        # 添加安全定时器，防止动画卡住
-        self.safety_timer = QTimer()
+        # 安全定时器，防止动画卡住；动画时钟在启动窗口被隐藏时会暂停，所以单独计时
+        self.safety_timer = QTimer(self)
         self.safety_timer.setSingleShot(True)
         self.safety_timer.timeout.connect(self.force_finish)
         
     def start(self):
-        """启动动画"""
+        """启动动画（由共享动画时钟驱动）"""
         self.start_time = QDateTime.currentMSecsSinceEpoch()
         self.show()
-        self.timer.start(30)  # 更新频率
+        get_animation_clock().register(self, self.update_progress, self.FRAME_MS)
         
         # 启动安全定时器，3秒后强制完成
-        self.safety_timer.start(3000)
+        self.safety_timer.start(self.SAFETY_MS)
     
     def force_finish(self):
         """强制完成启动动画，防止卡住"""
-        if self.timer.isActive():
+        if not self.done:
             logger.warning("启动动画安全定时器触发")
-            self.timer.stop()
+            get_animation_clock().unregister(self)
             self.progress_bar.setValue(100)
+            self.done = True
             self.finished.emit()
     
-    def update_progress(self):
+    def update_progress(self, now=None):
         """更新进度条"""
         current_time = QDateTime.currentMSecsSinceEpoch()
         elapsed_time = current_time - self.start_time
@@ -112,14 +114,17 @@ class SplashWindow(QSplashScreen):
             
             # 如果达到100%，发出完成信号
             if new_value == 100:
-                # 延迟很短的时间再发送完成信号，确保UI能够更新
+                # 不再需要时钟驱动，延迟很短的时间再发送完成信号，确保UI能够更新
+                get_animation_clock().unregister(self)
                 QTimer.singleShot(100, self.complete_animation)
         
     def complete_animation(self):
         """完成动画"""
-        self.timer.stop()
+        get_animation_clock().unregister(self)
         self.safety_timer.stop()  # 停止安全定时器
-        self.finished.emit()  # 发出完成信号
+        if not self.done:
+            self.done = True
+            self.finished.emit()  # 发出完成信号
     
     def paintEvent(self, event):
         """重写绘制事件，保持背景纯黑"""
@@ -0,0 +1,564 @@
+"""
+界面主题
+
+应用的全部样式集中在这里，启动时编译成一份应用级样式表，Qt 只解析一次。
+控件通过 objectName 和动态属性匹配规则，状态变化（如窄屏尺寸、封面加载失败）
+只用 set_style_property 修改属性并重新应用样式，不再为单个控件生成新的样式表字符串。
+
+注意：控件自己的样式表会覆盖应用级规则，并且会影响它的所有子控件，
+已经使用主题的控件和它们的祖先控件都不要再调用 setStyleSheet。
+侧边栏、顶栏和设置页的规则都以容器的 objectName 开头，优先级高于容器内通用的背景规则。
+"""
+from functools import lru_cache
+
+# 通用控件：下拉框弹出列表、列表视图、滚动条和菜单
+_BASE = """
+QComboBox QAbstractItemView, QComboBoxPrivateContainer {
+    background-color: #282828;
+    color: white;
+    border: none;
+    outline: none;
+    border-radius: 0px;
+    selection-background-color: #1DB954;
+    selection-color: white;
+    padding: 0px;
+    margin: 0px;
+}
+QListView, QTreeView, QTableView {
+    background-color: #282828;
+    color: white;
+    border: none;
+    outline: none;
+}
+QListView::item:selected, QTreeView::item:selected {
+    background-color: #1DB954;
+    color: white;
+}
+QScrollBar:vertical {
+    background-color: #282828;
+    width: 8px;
+    margin: 0px;
+}
+QScrollBar::handle:vertical {
+    background-color: #535353;
+    min-height: 20px;
+    border-radius: 4px;
+}
+QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical,
+QScrollBar::add-page:vertical, QScrollBar::sub-page:vertical {
+    background: none;
+    height: 0px;
+    width: 0px;
+}
+QMenu, QMenu::item {
+    background-color: #040404;
+    color: #b3b3b3;
+    margin: 0px;
+    padding: 8px 32px;
+    border: none;
+}
+QMenu::item:selected {
+    background-color: #282828;
+    color: white;
+}
+QMenu::separator {
+    height: 1px;
+    background-color: #282828;
+    margin: 0px;
+    padding: 0px;
+}
+"""
+
+# 按钮和对话框：variant 属性为 primary（绿色）或 secondary（灰色），
+# density 属性为 medium 或 compact 时使用较小的字号和边距
+_CONTROLS = """
+QPushButton[variant="primary"] {
+    background-color: #1DB954;
+    color: white;
+    border-radius: 4px;
+    padding: 5px 15px;
+    font-weight: bold;
+    font-size: 14px;
+}
+QPushButton[variant="primary"]:hover {
+    background-color: #1ED760;
+}
+QPushButton[variant="secondary"] {
+    background-color: #333;
+    color: white;
+    border-radius: 4px;
+    padding: 5px 15px;
+    font-size: 14px;
+}
+QPushButton[variant="secondary"]:hover {
+    background-color: #444;
+}
+QPushButton[variant][density="medium"] {
+    padding: 5px 12px;
+    font-size: 13px;
+}
+QPushButton[variant][density="compact"] {
+    padding: 4px 10px;
+    font-size: 12px;
+}
+
+QComboBox QAbstractItemView, QComboBoxPrivateContainer {
+    background-color: #282828;
+    color: white;
+    border: none;
+    outline: none;
+    padding: 0px;
+    margin: 0px;
+}
+
+QMessageBox#darkDialog {
+    background-color: #1E1E1E;
+}
+QMessageBox#darkDialog QLabel {
+    color: #FFFFFF;
+    font-size: 14px;
+    padding: 10px;
+    min-width: 300px;
+}
+QMessageBox#darkDialog[variant="confirm"] QLabel {
+    min-width: 380px;
+    max-width: 380px;
+    min-height: 60px;
+}
+QMessageBox#darkDialog QPushButton {
+    background-color: #333;
+    color: #FFFFFF;
+    border: none;
+    border-radius: 4px;
+    padding: 5px 15px;
+    font-size: 13px;
+    min-width: 80px;
+}
+QMessageBox#darkDialog QPushButton:hover {
+    background-color: #404040;
+}
+QMessageBox#darkDialog[variant="success"] QPushButton,
+QMessageBox#darkDialog QPushButton[variant="primary"] {
+    background-color: #1DB954;
+}
+QMessageBox#darkDialog[variant="success"] QPushButton:hover,
+QMessageBox#darkDialog QPushButton[variant="primary"]:hover {
+    background-color: #1ED760;
+}
+"""
+
+# 主窗口内容区域
+_HOME = """
+QWidget#mainContent, QStackedWidget#contentStack {
+    background-color: #040404;
+}
+"""
+
+# 歌单页面
+_PLAYLIST = """
+QWidget#playlistHeader, QStackedWidget#songStack {
+    background-color: #121212;
+}
+QLabel#playlistCover {
+    background-color: #282828;
+    border-radius: 4px;
+    color: white;
+}
+QLabel#playlistCover[state="placeholder"] {
+    background-color: #333;
+    font-size: 14px;
+}
+QLabel#playlistTitle {
+    color: white;
+    font-size: 28px;
+    font-weight: bold;
+}
+QLabel#playlistTitle[density="medium"] {
+    font-size: 24px;
+}
+QLabel#playlistTitle[density="compact"] {
+    font-size: 22px;
+}
+QLabel#playlistStatus {
+    color: #b3b3b3;
+    font-size: 14px;
+}
+QLabel#songsLoadingText {
+    color: white;
+    font-size: 16px;
+    margin-top: 10px;
+}
+QLineEdit#playlistSearch {
+    background-color: #333;
+    color: white;
+    border-radius: 4px;
+    padding: 5px;
+    min-width: 200px;
+    max-width: 300px;
+    font-size: 14px;
+}
+QLineEdit#playlistSearch[density="medium"] {
+    min-width: 180px;
+    max-width: 250px;
+    font-size: 13px;
+}
+QLineEdit#playlistSearch[density="compact"] {
+    padding: 4px;
+    min-width: 150px;
+    max-width: 200px;
+    font-size: 12px;
+}
+QCheckBox#selectAllCheckbox {
+    color: white;
+    font-size: 14px;
+    background-color: transparent;
+}
+QCheckBox#selectAllCheckbox::indicator {
+    width: 18px;
+    height: 18px;
+}
+QCheckBox#selectAllCheckbox::indicator:unchecked {
+    border: 2px solid #b3b3b3;
+    border-radius: 4px;
+    background-color: transparent;
+}
+QCheckBox#selectAllCheckbox::indicator:checked {
+    border: 2px solid #1DB954;
+    border-radius: 4px;
+    background-color: #1DB954;
+    image: url(./assets/check.png);
+}
+QMenu#sortMenu {
+    background-color: #282828;
+    border: 1px solid #333;
+    border-radius: 4px;
+    padding: 5px;
+}
+QMenu#sortMenu::item {
+    background-color: transparent;
+    color: #b3b3b3;
+    padding: 5px 30px 5px 20px;
+    border-radius: 2px;
+}
+QMenu#sortMenu::item:selected {
+    background-color: #333;
+    color: white;
+}
+QMenu#sortMenu::separator {
+    height: 1px;
+    background: #333;
+    margin: 5px 0px;
+}
+QListView#songList {
+    background-color: #121212;
+    border: none;
+}
+#songList QScrollBar:vertical {
+    background-color: #121212;
+    width: 12px;
+    margin: 0px;
+}
+#songList QScrollBar::handle:vertical {
+    background-color: #535353;
+    min-height: 30px;
+    border-radius: 6px;
+}
+#songList QScrollBar::handle:vertical:hover {
+    background-color: #636363;
+}
+#songList QScrollBar::add-line:vertical, #songList QScrollBar::sub-line:vertical {
+    height: 0px;
+}
+#songList QScrollBar::add-page:vertical, #songList QScrollBar::sub-page:vertical {
+    background-color: #121212;
+}
+"""
+
+# 侧边栏
+_SIDEBAR = """
+#sidebar, #sidebar QWidget {
+    background-color: #000000;
+}
+#sidebar QLabel {
+    color: #B3B3B3;
+}
+#sidebar QScrollBar:vertical {
+    border: none;
+    background: #121212;
+    width: 8px;
+    margin: 0px 0px 0px 0px;
+}
+#sidebar QScrollBar::handle:vertical {
+    background: #535353;
+    min-height: 20px;
+    border-radius: 4px;
+}
+#sidebar QScrollBar::add-line:vertical, #sidebar QScrollBar::sub-line:vertical {
+    border: none;
+    background: none;
+}
+#sidebar QFrame#sidebarSeparator {
+    background-color: #282828;
+}
+#sidebar QPushButton[variant="icon"] {
+    background-color: transparent;
+    border: none;
+    color: #FFFFFF;
+}
+#sidebar QPushButton[variant="icon"]:hover {
+    background-color: #282828;
+    border-radius: 10px;
+}
+#sidebar QPushButton#sidebarCollapsedButton:hover {
+    border-radius: 15px;
+}
+#sidebar QPushButton#sidebarRefreshButton {
+    font-size: 16px;
+}
+#sidebar QLabel#sidebarTitle {
+    font-size: 14px;
+    font-weight: bold;
+}
+#sidebar QLineEdit#sidebarFilter {
+    background-color: #242424;
+    border: none;
+    border-radius: 14px;
+    color: #FFFFFF;
+    font-size: 13px;
+    padding: 0 10px;
+}
+#sidebar QProgressBar {
+    background-color: #535353;
+    border-radius: 2px;
+    border: none;
+}
+#sidebar QProgressBar::chunk {
+    background-color: #1DB954;
+    border-radius: 2px;
+}
+#sidebar QLabel#sidebarLoadingLabel {
+    font-size: 13px;
+}
+#sidebar QLabel#sidebarEmptyIcon {
+    font-size: 32px;
+}
+#sidebar QLabel#sidebarEmptyLabel {
+    font-size: 13px;
+    margin-top: 10px;
+}
+"""
+
+# 顶栏和头像菜单
+_TOPBAR = """
+#topbar, #topbar QWidget {
+    background-color: #040404;
+}
+QWidget#topbar {
+    border-bottom: 1px solid #282828;
+}
+#topbar QLabel {
+    background-color: transparent;
+    color: white;
+}
+#topbar QToolButton {
+    background-color: transparent;
+    border: none;
+    padding: 5px;
+    color: #b3b3b3;
+}
+#topbar QToolButton:hover {
+    color: white;
+    background-color: rgba(255, 255, 255, 0.1);
+}
+#topbar QToolButton#avatarButton {
+    background-color: rgba(255, 255, 255, 0.1);
+    border-radius: 16px;
+    color: white;
+}
+#topbar QToolButton#avatarButton:hover {
+    background-color: rgba(255, 255, 255, 0.2);
+}
+#topbar QToolButton#avatarButton[state="unknown"] {
+    font-weight: bold;
+    font-size: 16px;
+}
+#topbar QToolButton#avatarButton::menu-indicator {
+    image: none;
+}
+#topbar QMenu#avatarMenu {
+    background-color: #040404;
+    border: none;
+    border-radius: 8px;
+    padding: 0px;
+    margin: 0px;
+}
+#topbar QMenu#avatarMenu::item {
+    background-color: transparent;
+    padding: 8px 32px;
+    color: #b3b3b3;
+    min-width: 150px;
+    margin: 0px;
+    border: none;
+    border-radius: 2px;
+}
+#topbar QMenu#avatarMenu::item:selected {
+    background-color: #282828;
+    color: white;
+}
+#topbar QMenu#avatarMenu::separator {
+    height: 1px;
+    background-color: #282828;
+    margin: 0px;
+    padding: 0px;
+}
+"""
+
+# 设置页
+_SETTINGS = """
+#settingsView, #settingsView QWidget {
+    background-color: #040404;
+}
+#settingsView QScrollArea {
+    border: none;
+}
+#settingsView QScrollBar:vertical {
+    background-color: #121212;
+    width: 10px;
+    margin: 0px;
+}
+#settingsView QScrollBar::handle:vertical {
+    background-color: #535353;
+    min-height: 20px;
+    border-radius: 5px;
+}
+#settingsView QScrollBar::add-line:vertical, #settingsView QScrollBar::sub-line:vertical {
+    height: 0px;
+}
+#settingsView QScrollBar::add-page:vertical, #settingsView QScrollBar::sub-page:vertical {
+    background: none;
+}
+#settingsView QLabel {
+    color: white;
+}
+#settingsView QLabel[role="description"] {
+    color: #b3b3b3;
+    font-size: 13px;
+}
+#settingsView QLabel[role="field"], #settingsView QRadioButton {
+    color: white;
+    font-size: 14px;
+}
+#settingsView QLabel#file_format_label {
+    margin-top: 15px;
+}
+#settingsView QLabel#cache_size_label {
+    margin-top: 10px;
+}
+#settingsView QComboBox {
+    background-color: #282828;
+    color: white;
+    border: none;
+    border-radius: 4px;
+    padding: 5px 15px;
+    font-size: 14px;
+}
+#settingsView QComboBox:hover {
+    background-color: #333333;
+}
+#settingsView QComboBox::drop-down {
+    border: none;
+    width: 30px;
+    subcontrol-origin: padding;
+    subcontrol-position: right center;
+}
+#settingsView QComboBox::down-arrow {
+    image: none;
+    width: 0;
+}
+#settingsView QComboBoxPrivateContainer, #settingsView QComboBox QAbstractItemView,
+#settingsView QComboBox QAbstractItemView QWidget {
+    background-color: #282828;
+    color: white;
+    selection-background-color: #1DB954;
+    selection-color: white;
+    border: none;
+    padding: 0px;
+    margin: 0px;
+    outline: none;
+}
+#settingsView QComboBox QListView::item {
+    min-height: 30px;
+    height: 30px;
+    padding: 5px 15px;
+    margin: 0px;
+    border: none;
+    color: white;
+}
+#settingsView QComboBox QListView::item:selected {
+    background-color: #1DB954;
+    color: white;
+}
+#settingsView QComboBox QListView::item:hover {
+    background-color: #333333;
+}
+#settingsView QComboBox QListView QScrollBar:vertical {
+    width: 8px;
+    background: #282828;
+    border: none;
+    margin: 0px;
+}
+#settingsView QComboBox QListView QScrollBar::handle:vertical {
+    background: #535353;
+    min-height: 20px;
+    border-radius: 4px;
+}
+#settingsView QPushButton {
+    background-color: #282828;
+    color: white;
+    border: none;
+    border-radius: 4px;
+    font-size: 14px;
+}
+#settingsView QPushButton:hover {
+    background-color: #333333;
+}
+#settingsView QPushButton[variant="danger"] {
+    background-color: #E91429;
+}
+#settingsView QPushButton[variant="danger"]:hover {
+    background-color: #FF1622;
+}
+"""
+
+
+@lru_cache(maxsize=1)
+def stylesheet():
+    """
+    编译应用级样式表（只生成一次）
+    :return: 样式表字符串
+    """
+    return '\n'.join((_BASE, _CONTROLS, _HOME, _PLAYLIST, _SIDEBAR, _TOPBAR, _SETTINGS))
+
+
+def apply_theme(app):
+    """
+    把主题样式表设置到应用上，启动时调用一次
+    :param app: QApplication
+    """
+    app.setStyleSheet(stylesheet())
+
+
+def set_style_property(widget, name, value):
+    """
+    修改控件用于匹配样式的动态属性，值变化时重新应用样式（不重新解析样式表）
+    :param widget: 控件
+    :param name: 属性名
+    :param value: 属性值，为None时移除属性
+    """
+    if widget.property(name) == value:
+        return
+    widget.setProperty(name, value)
+    style = widget.style()
+    style.unpolish(widget)
+    style.polish(widget)
+    widget.update()
@@ -2,52 +2,39 @@
 顶栏视图
 """
 from PyQt5.QtWidgets import (QWidget, QHBoxLayout, QLabel, 
-                           QFrame, QToolButton, QVBoxLayout,
+                           QToolButton, QVBoxLayout,
                            QMenu, QAction, QMessageBox, QDesktopWidget)
-from PyQt5.QtGui import QFont, QPixmap, QImage, QIcon, QPainter, QPalette
-from PyQt5.QtCore import Qt, pyqtSignal, QThread, QSize, QPoint, QTimer, QEvent
-import requests
-from io import BytesIO
+from PyQt5.QtGui import QFont, QPixmap, QImage, QIcon, QPainter
+from PyQt5.QtCore import Qt, pyqtSignal, QThread, QSize, QPoint, QTimer
 import os
 import sys
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
 import webbrowser
 from src.utils.language_manager import LanguageManager
 from src.utils.cache_manager import CacheManager
+from src.utils.image_manager import get_image_manager
+from src.utils.image_utils import device_pixel_ratio, pick_image_url
 from src.utils.logger import logger
+from src.ui.theme import set_style_property
 
 class ImageLoader(QThread):
     """图像加载线程"""
     image_loaded = pyqtSignal(QImage)
     
-    def __init__(self, url):
+    def __init__(self, url, cache_manager):
         super().__init__()
         self.url = url
+        self.cache_manager = cache_manager
     
     def run(self):
-        try:
-            logger.debug(f"开始加载用户头像: {self.url}")
-            # 设置重试策略
-            session = requests.Session()
-            retries = Retry(total=3, backoff_factor=0.5)
-            session.mount('https://', HTTPAdapter(max_retries=retries))
-            
-            response = session.get(self.url, timeout=10)
-            response.raise_for_status()
-            
-            # 加载图片
-            img_data = BytesIO(response.content)
-            image = QImage()
-            image.loadFromData(img_data.getvalue())
-            
-            # 发送信号，传递图片
-            logger.debug("用户头像加载成功，准备显示")
-            self.image_loaded.emit(image)
-            
-        except Exception as e:
-            logger.error(f"加载用户头像失败: {str(e)}")
-            print(f"加载用户头像失败: {str(e)}")
+        logger.debug(f"开始加载用户头像: {self.url}")
+        image = get_image_manager().fetch(self.url, 'avatar', self.cache_manager)
+        if image is None:
+            logger.error(f"加载用户头像失败: {self.url}")
+            return
+        
+        # 发送信号，传递图片
+        logger.debug("用户头像加载成功，准备显示")
+        self.image_loaded.emit(image)
 
 class TopbarView(QWidget):
     """顶栏视图"""
@@ -140,47 +127,7 @@ class TopbarView(QWidget):
     def init_ui(self):
         """初始化UI"""
         logger.info("初始化TopbarView UI")
-        # 设置背景颜色和底部边框
-        self.setStyleSheet("""
-            QWidget {
-                background-color: #040404;
-            }
-            QWidget#topbar {
-                background-color: #040404;
-                border-bottom: 1px solid #282828;
-            }
-            QLabel {
-                background-color: transparent;
-                color: white;
-            }
-            QToolButton {
-                background-color: transparent;
-                border: none;
-                padding: 5px;
-                color: #b3b3b3;
-            }
-            QToolButton:hover {
-                color: white;
-                background-color: rgba(255, 255, 255, 0.1);
-            }
-            QMenu {
-                background-color: #040404;
-                border: none;
-                padding: 5px;
-                border-radius: 4px;
-            }
-            QMenu::item {
-                background-color: transparent;
-                padding: 8px 32px 8px 32px;
-                margin: 0px;
-                border-radius: 2px;
-                color: #b3b3b3;
-            }
-            QMenu::item:selected {
-                background-color: #282828;
-                color: white;
-            }
-        """)
+        # 背景、底部边框和菜单样式由主题按 objectName 匹配（见 src/ui/theme.py）
         self.setObjectName("topbar")
         
         # 创建主布局
@@ -190,7 +137,6 @@ class TopbarView(QWidget):
         
         # 创建内容容器（确保整个顶栏都有背景色）
         content_container = QWidget()
-        content_container.setStyleSheet("background-color: #040404;")
         
         # 创建顶部内容布局
         content_layout = QHBoxLayout(content_container)
@@ -199,7 +145,6 @@ class TopbarView(QWidget):
         
         # 导航按钮区域
         nav_frame = QWidget()
-        nav_frame.setStyleSheet("background-color: #040404;")
         nav_layout = QHBoxLayout(nav_frame)
         nav_layout.setContentsMargins(15, 0, 0, 0)
         nav_layout.setSpacing(10)
@@ -214,7 +159,6 @@ class TopbarView(QWidget):
             app_logo.setPixmap(logo_pixmap)
             app_logo.setFixedSize(32, 32)
             app_logo.setAlignment(Qt.AlignCenter)
-            app_logo.setStyleSheet("background-color: transparent;")
             nav_layout.addWidget(app_logo)
         
         # 首页按钮
@@ -234,89 +178,26 @@ class TopbarView(QWidget):
         # 添加Spotify标志
         self.spotify_label = QLabel(self.language_manager.get_text('topbar.app_name', 'SpotifyExport'))
         self.spotify_label.setFont(QFont("PingFang SC", 16, QFont.Bold))
-        self.spotify_label.setStyleSheet("color: white; background-color: transparent;")
         nav_layout.addWidget(self.spotify_label)
         
         content_layout.addWidget(nav_frame)
         
         # 中间填充区域（使用带背景色的部件替代简单的伸展空间）
         middle_spacer = QWidget()
-        middle_spacer.setStyleSheet("background-color: #040404;")
         content_layout.addWidget(middle_spacer, 1)  # 占据所有可用空间
         
         # 用户头像按钮（带下拉菜单）
         self.avatar_btn = QToolButton()
         self.avatar_btn.setFixedSize(32, 32)
-        self.avatar_btn.setStyleSheet("""
-            QToolButton {
-                background-color: rgba(255, 255, 255, 0.1);
-                border-radius: 16px;
-                color: white;
-            }
-            QToolButton:hover {
-                background-color: rgba(255, 255, 255, 0.2);
-            }
-            QToolButton::menu-indicator {
-                image: none;
-            }
-        """)
+        self.avatar_btn.setObjectName("avatarButton")
         self.avatar_btn.setText("")
         
         # 创建下拉菜单
         self.menu = QMenu(self)
-        self.menu.setStyleSheet("""
-            QMenu {
-                background-color: #040404;
-                border: none;
-                border-radius: 4px;
-                padding: 0px;
-                margin: 0px;
-            }
-            QMenu::item {
-                background-color: transparent;
-                padding: 8px 32px;
-                color: #b3b3b3;
-                min-width: 150px;
-                margin: 0px;
-                border: none;
-            }
-            QMenu::item:selected {
-                background-color: #282828;
-                color: white;
-            }
-            QMenu::separator {
-                height: 1px;
-                background-color: #282828;
-                margin: 0px;
-                padding: 0px;
-            }
-            QMenu QWidget {
-                background-color: #040404;
-                color: #b3b3b3;
-            }
-            QMenu QWidget::item {
-                background-color: transparent;
-            }
-            QMenu QWidget::item:selected {
-                background-color: #282828;
-            }
-            /* 由于Qt的绘制机制，需要明确设置背景色为完全不透明 */
-            QMenu::background {
-                background-color: #040404;
-            }
-            /* 覆盖QMenu内部视图类的样式 */
-            QMenu QAbstractItemView {
-                background-color: #040404;
-                border: none;
-                outline: none;
-                padding: 0px;
-                margin: 0px;
-            }
-            QMenu QPushButton, QMenu QToolButton {
-                background-color: #040404;
-                color: #b3b3b3;
-            }
-        """)
+        self.menu.setObjectName("avatarMenu")
+        # 无边框、透明背景，圆角之外不露出白色区域（只需设置一次）
+        self.menu.setWindowFlags(self.menu.windowFlags() | Qt.NoDropShadowWindowHint | Qt.FramelessWindowHint)
+        self.menu.setAttribute(Qt.WA_TranslucentBackground, True)
         
         # 添加用户名（作为不可点击的菜单项）
         self.username_action = QAction(self.language_manager.get_text('topbar.loading', '加载中...'), self)
@@ -349,7 +230,6 @@ class TopbarView(QWidget):
         
         # 添加头像按钮到布局，右侧有15px的边距
         right_container = QWidget()
-        right_container.setStyleSheet("background-color: #040404;")
         right_layout = QHBoxLayout(right_container)
         right_layout.setContentsMargins(0, 0, 15, 0)
         right_layout.addWidget(self.avatar_btn)
@@ -365,32 +245,6 @@ class TopbarView(QWidget):
     def showAvatarMenu(self):
         """显示头像下拉菜单，确保位置在窗口内"""
         logger.debug("显示用户菜单")
-        # 强制设置菜单样式，确保没有白色区域
-        self.menu.setWindowFlags(self.menu.windowFlags() | Qt.NoDropShadowWindowHint | Qt.FramelessWindowHint)
-        self.menu.setAttribute(Qt.WA_TranslucentBackground, True)
-        self.menu.setAutoFillBackground(False)
-        
-        # 设置自定义样式表以处理圆角问题
-        self.menu.setStyleSheet(self.menu.styleSheet() + """
-            QMenu {
-                background-color: #040404;
-                border: none; 
-                border-radius: 8px;
-                padding: 0px;
-                margin: 0px;
-            }
-            /* 彻底禁用菜单的外部边框 */
-            QMenu::frame {
-                border: none;
-                background-color: #040404;
-                padding: 0px;
-                margin: 0px;
-            }
-        """)
-        
-        # 为菜单设置事件过滤器
-        self.menu.installEventFilter(self)
-        
         # 获取按钮在屏幕上的位置
         button_pos = self.avatar_btn.mapToGlobal(QPoint(0, 0))
         
@@ -424,66 +278,6 @@ class TopbarView(QWidget):
         logger.debug(f"显示菜单，位置: ({x_pos}, {y_pos})")
         self.menu.popup(QPoint(x_pos, y_pos))
     
-    def eventFilter(self, obj, event):
-        """事件过滤器，处理菜单事件"""
-        if obj == self.menu and event.type() == QEvent.Show:
-            logger.debug("菜单显示事件触发，应用深色样式")
-            # 全面处理菜单及其子控件，消除白色背景
-            obj.setAutoFillBackground(False)
-            
-            # 递归处理所有子控件
-            self._apply_dark_style_to_widget(obj)
-            
-            # 设置整个菜单的外观
-            obj.setStyleSheet(obj.styleSheet() + """
-                QMenu {
-                    background-color: #040404;
-                    border: none;
-                }
-            """)
-            
-            # 使用定时器延迟处理，确保所有子控件都创建完毕
-            QTimer.singleShot(10, lambda: self._apply_dark_style_to_widget(obj))
-                
-        return False  # 继续处理事件
-    
-    def _apply_dark_style_to_widget(self, widget):
-        """递归应用暗色样式到控件及其子控件"""
-        logger.debug(f"为控件应用深色样式: {widget.__class__.__name__}")
-        # 对当前控件应用样式
-        widget.setAutoFillBackground(False)
-        
-        # 如果有背景角色，明确设置为黑色
-        if hasattr(widget, 'setBackgroundRole'):
-            widget.setBackgroundRole(QPalette.Window)
-        
-        # 如果是菜单，显式处理
-        if isinstance(widget, QMenu):
-            widget.setStyleSheet("""
-                background-color: #040404;
-                border: none;
-                border-radius: 8px;
-            """)
-            widget.setAttribute(Qt.WA_TranslucentBackground, True)
-        
-        # 递归处理所有子控件
-        for child in widget.findChildren(QWidget):
-            # 禁用自动填充背景
-            child.setAutoFillBackground(False)
-            
-            # 设置透明属性
-            child.setAttribute(Qt.WA_TranslucentBackground, True)
-            
-            # 为所有子控件设置背景色
-            child.setStyleSheet("background-color: #040404; border: none;")
-            
-            # 如果是可视控件，应用额外样式
-            if child.isVisible():
-                # 针对特定类型控件的处理
-                if isinstance(child, QFrame):
-                    child.setFrameShape(QFrame.NoFrame)
-                    child.setStyleSheet("background-color: #040404; border: none;")
-    
     def load_user_info(self):
         """加载用户信息"""
         try:
@@ -494,10 +288,10 @@ class TopbarView(QWidget):
             logger.info(f"加载到用户名: {user_info['display_name']}")
             
             # 加载用户头像
-            if user_info['images']:
-                image_url = user_info['images'][0]['url']
+            image_url = pick_image_url(user_info['images'], 32)
+            if image_url:
                 logger.debug(f"开始加载用户头像: {image_url}")
-                loader = ImageLoader(image_url)
+                loader = ImageLoader(image_url, self.cache_manager)
                 loader.image_loaded.connect(lambda image: self.on_avatar_loaded(image, image_url))
                 self.threads.append(loader)
                 loader.start()
@@ -508,28 +302,15 @@ class TopbarView(QWidget):
             self.api_connected = False
             # 加载默认头像
             self.avatar_btn.setText("?")
-            self.avatar_btn.setStyleSheet("""
-                QToolButton {
-                    background-color: rgba(255, 255, 255, 0.1);
-                    border-radius: 16px;
-                    color: white;
-                    font-weight: bold;
-                    font-size: 16px;
-                }
-                QToolButton:hover {
-                    background-color: rgba(255, 255, 255, 0.2);
-                }
-                QToolButton::menu-indicator {
-                    image: none;
-                }
-            """)
+            set_style_property(self.avatar_btn, "state", "unknown")
     
     def on_avatar_loaded(self, image, url):
         """头像加载完成回调"""
         if not image.isNull():
             logger.debug("用户头像加载成功，开始处理圆形裁剪")
-            # 创建圆形头像
-            target_size = 32
+            # 创建圆形头像，高分屏上按缩放比例保留更多像素
+            ratio = device_pixel_ratio()
+            target_size = round(32 * ratio)
             rounded = QImage(target_size, target_size, QImage.Format_ARGB32)
             rounded.fill(Qt.transparent)
             
@@ -544,10 +325,9 @@ class TopbarView(QWidget):
             painter.drawImage(0, 0, scaled)
             painter.end()
             
-            # 缓存头像
-            self.cache_manager.cache_image(url, rounded, 'avatar')
-            
-            self.avatar_btn.setIcon(QIcon(QPixmap.fromImage(rounded)))
+            pixmap = QPixmap.fromImage(rounded)
+            pixmap.setDevicePixelRatio(ratio)
+            self.avatar_btn.setIcon(QIcon(pixmap))
             self.avatar_btn.setIconSize(QSize(32, 32))
             logger.debug("用户头像显示完成")
     
@@ -0,0 +1,159 @@
+"""
+虚拟化列表共用的部分 - 封面缓存和可见行计算
+
+侧边栏歌单列表和歌曲列表都只绘制可见行，封面在行第一次绘制时才请求加载。
+两者的封面缓存、图片URL到行号的映射以及按滚动位置计算可见行的方法都在这里实现一次。
+"""
+import bisect
+
+from PyQt5.QtCore import Qt
+
+
+class CoverCacheMixin:
+    """
+    列表模型的封面缓存：已加载的封面、已请求的URL和图片URL -> 行号映射
+
+    使用的模型需要定义 cover_requested 信号，在 __init__ 中调用 _init_covers，
+    并实现 _row_cover_urls 返回一段行的封面URL。
+    映射在第一次设置封面时生成，之后随增删行用 _add_url_rows、_remove_url_row 和 _remap_url_rows 更新，
+    整体替换行时调用 _reset_url_rows。
+    """
+
+    def _init_covers(self):
+        self._covers = {}  # 图片URL -> QPixmap，替换行时保留
+        self._requested = set()  # 已请求过的封面URL
+        self._url_rows = None  # 图片URL -> 行号列表，第一次设置封面时生成
+
+    def _row_cover_urls(self, first, last):
+        """
+        获取一段行的封面URL
+        :param first: 第一行的行号
+        :param last: 最后一行之后的行号
+        :return: 与这些行一一对应的图片URL，没有封面的行为空字符串
+        """
+        raise NotImplementedError
+
+    def cover(self, url):
+        """
+        获取已加载的封面，未加载时请求加载
+        :param url: 图片URL
+        :return: QPixmap，尚未加载返回None
+        """
+        pixmap = self._covers.get(url)
+        if pixmap is None and url not in self._requested:
+            self._requested.add(url)
+            self.cover_requested.emit(url)
+        return pixmap
+
+    def has_cover(self, url):
+        """封面是否已加载"""
+        return url in self._covers
+
+    def cover_memory(self):
+        """已加载的封面大约占用的字节数"""
+        return sum(pixmap.width() * pixmap.height() * max(pixmap.depth(), 8) // 8
+                   for pixmap in self._covers.values())
+
+    def forget_cover_requests(self, urls):
+        """
+        忘记已取消的封面请求，行再次绘制时会重新请求
+        :param urls: 图片URL列表
+        """
+        self._requested.difference_update(urls)
+
+    def set_cover(self, url, pixmap):
+        """
+        设置加载完成的封面并刷新使用该封面的行
+        :param url: 图片URL
+        :param pixmap: 已缩放的QPixmap
+        """
+        self._covers[url] = pixmap
+
+        if self._url_rows is None:
+            self._url_rows = {}
+            self._add_url_rows(0, self.rowCount())
+
+        for row in self._url_rows.get(url, []):
+            index = self.index(row)
+            self.dataChanged.emit(index, index, [Qt.DecorationRole])
+
+    # ---------- 图片URL -> 行号 ----------
+
+    def _reset_url_rows(self):
+        """行被整体替换，丢弃映射，下次设置封面时重新生成"""
+        self._url_rows = None
+
+    def _add_url_rows(self, first, last):
+        """
+        登记一段连续行的封面URL，映射尚未生成时跳过
+        :param first: 第一行的行号
+        :param last: 最后一行之后的行号
+        """
+        if self._url_rows is None or last <= first:
+            return
+        for offset, url in enumerate(self._row_cover_urls(first, last)):
+            if url:
+                self._url_rows.setdefault(url, []).append(first + offset)
+
+    def _remove_url_row(self, row):
+        """从映射中移除一行（该行的内容即将被替换）"""
+        if self._url_rows is None:
+            return
+        url = self._row_cover_urls(row, row + 1)[0]
+        rows = self._url_rows.get(url)
+        if rows and row in rows:
+            rows.remove(row)
+            if not rows:
+                del self._url_rows[url]
+
+    def _remap_url_rows(self, opcodes):
+        """
+        行已按差异操作插入和删除后，把映射中的行号从旧列表换算到新列表，删除的行去掉，插入的行补上
+        :param opcodes: difflib 风格的差异操作（旧行号、新行号）
+        """
+        if self._url_rows is None:
+            return
+        # 只有相同的段保留下来，段内行号整体平移
+        equal = [(i1, i2, j1) for tag, i1, i2, j1, j2 in opcodes if tag == 'equal' and i2 > i1]
+        starts = [segment[0] for segment in equal]
+        url_rows = {}
+        for url, rows in self._url_rows.items():
+            moved = []
+            for row in rows:
+                position = bisect.bisect_right(starts, row) - 1
+                if position >= 0:
+                    i1, i2, j1 = equal[position]
+                    if row < i2:
+                        moved.append(j1 + row - i1)
+            if moved:
+                url_rows[url] = moved
+        self._url_rows = url_rows
+
+        for tag, i1, i2, j1, j2 in opcodes:
+            if tag != 'equal':
+                self._add_url_rows(j1, j2)
+
+
+class UniformRowsMixin:
+    """所有行等高的列表视图：按滚动位置直接计算可见行"""
+
+    def visible_rows(self, margin=0):
+        """
+        根据滚动位置和行高计算与视口（上下各扩展margin像素）相交的行，
+        所有行等高，计算量与行数无关
+        :param margin: 视口上下额外包含的像素
+        :return: (第一行, 最后一行)，没有行时返回None
+        """
+        model = self.model()
+        count = model.rowCount() if model is not None else 0
+        stride = self.sizeHintForRow(0) if count else 0
+        if stride <= 0:
+            return None
+
+        top = self.verticalScrollBar().value() - margin
+        bottom = self.verticalScrollBar().value() + self.viewport().height() + margin
+        first = max(0, top // stride)
+        last = min(count - 1, max(0, bottom - 1) // stride)
+        if first > last:
+            return None
+        return first, last
@@ -0,0 +1,125 @@
+"""
+共享动画时钟
+
+所有加载动画都注册到同一个时钟上，由一个定时器统一驱动。
+控件自身或祖先被隐藏时，它的动画自动暂停；没有可见的动画时定时器停止，
+空闲时不会产生任何定时器唤醒。
+"""
+from functools import partial
+
+from PyQt5 import sip
+from PyQt5.QtCore import QObject, QTimer, QEvent, QElapsedTimer
+
+
+class AnimationClock(QObject):
+    """共享动画时钟，需要在主线程中创建"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        # 控件 -> (回调, 帧间隔毫秒)
+        self._subscribers = {}
+        # 控件 -> 销毁时的清理函数（destroyed 信号传回的对象不是注册时的包装对象，需要绑定原控件）
+        self._destroy_slots = {}
+        # 当前可见、需要驱动的控件
+        self._visible = set()
+        self._elapsed = QElapsedTimer()
+        self._elapsed.start()
+
+        self._timer = QTimer(self)
+        self._timer.timeout.connect(self._tick)
+
+    def register(self, widget, callback, interval_ms=50):
+        """
+        注册动画，控件可见时每帧调用一次回调
+        :param widget: 动画所在的控件，用来判断是否可见
+        :param callback: 回调函数，参数为时钟的当前时间（毫秒），可据此计算动画帧
+        :param interval_ms: 需要的帧间隔，多个动画同时可见时按最小的间隔驱动
+        """
+        if widget not in self._subscribers:
+            widget.installEventFilter(self)
+            slot = partial(self._forget, widget)
+            widget.destroyed.connect(slot)
+            self._destroy_slots[widget] = slot
+        self._subscribers[widget] = (callback, interval_ms)
+        if widget.isVisible():
+            self._visible.add(widget)
+        self._update_timer()
+
+    def unregister(self, widget):
+        """
+        注销动画
+        :param widget: 注册时的控件
+        """
+        if widget not in self._subscribers:
+            return
+        widget.removeEventFilter(self)
+        widget.destroyed.disconnect(self._destroy_slots[widget])
+        self._forget(widget)
+
+    def is_registered(self, widget):
+        """控件是否已注册动画"""
+        return widget in self._subscribers
+
+    def is_active(self):
+        """定时器是否在运行（有可见的动画）"""
+        return self._timer.isActive()
+
+    def now(self):
+        """时钟的当前时间（毫秒）"""
+        return self._elapsed.elapsed()
+
+    def eventFilter(self, obj, event):
+        """跟踪已注册控件的显示和隐藏（祖先隐藏时控件也会收到隐藏事件）"""
+        if event.type() == QEvent.Show:
+            if obj in self._subscribers and obj not in self._visible:
+                self._visible.add(obj)
+                self._update_timer()
+        elif event.type() == QEvent.Hide:
+            if obj in self._visible:
+                self._visible.discard(obj)
+                self._update_timer()
+        return False
+
+    def _forget(self, widget, *args):
+        """移除控件的注册，控件销毁时也会调用"""
+        self._subscribers.pop(widget, None)
+        self._destroy_slots.pop(widget, None)
+        self._visible.discard(widget)
+        self._update_timer()
+
+    def _update_timer(self):
+        """按可见动画的最小帧间隔启动定时器，没有可见动画时停止"""
+        if sip.isdeleted(self._timer):
+            # 程序退出时时钟可能先于注册的控件销毁，之后控件的destroyed回调不再需要处理
+            return
+        if not self._visible:
+            self._timer.stop()
+            return
+        interval = min(self._subscribers[widget][1] for widget in self._visible)
+        if self._timer.interval() != interval:
+            self._timer.setInterval(interval)
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def _tick(self):
+        """驱动所有可见的动画"""
+        now = self.now()
+        # 回调中可能注销动画，先复制一份
+        for widget in list(self._visible):
+            subscriber = self._subscribers.get(widget)
+            if subscriber is not None:
+                subscriber[0](now)
+
+
+_clock = None
+
+
+def get_animation_clock():
+    """
+    获取全局的动画时钟，第一次调用时创建（需要在主线程中调用）
+    :return: AnimationClock
+    """
+    global _clock
+    if _clock is None:
+        _clock = AnimationClock()
+    return _clock
@@ -6,26 +6,36 @@ import json
 import sys
 from datetime import datetime, timedelta
 from PyQt5.QtGui import QImage
+from PyQt5.QtCore import QBuffer, QByteArray, QIODevice
 import hashlib
 import logging
+import re
+from src.utils.thumbnail_pack import ThumbnailPack
 
 logger = logging.getLogger(__name__)
 
 class CacheManager:
     """缓存管理器"""
     
-    def __init__(self):
-        # 获取程序运行目录
-        base_dir = self.get_base_dir()
-        
+    # 图片缓存文件名：URL的MD5 + .png
+    IMAGE_FILE_PATTERN = re.compile(r'^[0-9a-f]{32}\.png$')
+    
+    def __init__(self, cache_dir=None):
+        """
+        :param cache_dir: 缓存目录，默认为程序目录下的cache
+        """
         # 缓存目录
-        self.cache_dir = os.path.join(base_dir, 'cache')  # 现在cache与data同级
+        if cache_dir is None:
+            cache_dir = os.path.join(self.get_base_dir(), 'cache')  # 现在cache与data同级
+        self.cache_dir = cache_dir
         self.playlists_cache_file = os.path.join(self.cache_dir, 'playlists.json')
         self.tracks_cache_dir = os.path.join(self.cache_dir, 'tracks')
         self.images_cache_dir = os.path.join(self.cache_dir, 'images')
         self.avatar_cache_dir = os.path.join(self.images_cache_dir, 'avatars')
         self.playlist_cover_cache_dir = os.path.join(self.images_cache_dir, 'playlists')
         self.track_cover_cache_dir = os.path.join(self.images_cache_dir, 'tracks')
+        self.track_cover_pack_file = os.path.join(self.images_cache_dir, 'tracks.pack')
+        self.usage_file = os.path.join(self.cache_dir, 'usage.json')
         
         # 确保缓存目录存在
         os.makedirs(self.cache_dir, exist_ok=True)
@@ -40,6 +50,9 @@ class CacheManager:
         self.tracks_cache_expiry = timedelta(hours=12)
         self.images_cache_expiry = timedelta(days=7)
         
+        # 歌曲封面数量多且尺寸小，统一写入打包文件，避免大量小文件
+        self.track_cover_pack = ThumbnailPack.shared(self.track_cover_pack_file)
+        
         # 缓存刷新频率（单位：秒）
         self.refresh_interval = 3600  # 1小时
         
@@ -170,6 +183,9 @@ class CacheManager:
         :return: 缓存的QImage对象，如果没有缓存则返回None
         """
         try:
+            if image_type == 'track':
+                return self._get_packed_track_image(url)
+            
             # 根据图片类型选择缓存目录
             cache_dir = self._get_image_cache_dir(image_type)
             
@@ -211,15 +227,19 @@ class CacheManager:
         :param image_type: 图片类型，可选值：'avatar', 'playlist', 'track'
         """
         try:
-            # 根据图片类型选择缓存目录
-            cache_dir = self._get_image_cache_dir(image_type)
-            
-            # 使用URL的哈希作为文件名
-            filename = hashlib.md5(url.encode()).hexdigest() + '.png'
-            cache_file = os.path.join(cache_dir, filename)
-            
-            # 保存图片
-            image.save(cache_file, 'PNG')
+            if image_type == 'track':
+                # 歌曲封面写入打包文件
+                self.track_cover_pack.put(hashlib.md5(url.encode()).hexdigest(), self._encode_image(image))
+            else:
+                # 根据图片类型选择缓存目录
+                cache_dir = self._get_image_cache_dir(image_type)
+                
+                # 使用URL的哈希作为文件名
+                filename = hashlib.md5(url.encode()).hexdigest() + '.png'
+                cache_file = os.path.join(cache_dir, filename)
+                
+                # 保存图片
+                image.save(cache_file, 'PNG')
             
             # 更新缓存状态
             if url not in self.cache_status['images'][image_type + 's']:
@@ -233,6 +253,51 @@ class CacheManager:
                 self.cache_status['images'][image_type + 's'][url] = {}
             self.cache_status['images'][image_type + 's'][url]['error'] = str(e)
     
+    def _get_packed_track_image(self, url):
+        """
+        从打包文件读取歌曲封面，旧版本的单文件缓存会在首次读取时迁移进打包文件
+        :param url: 图片URL
+        :return: QImage对象，没有缓存或已过期返回None
+        """
+        key = hashlib.md5(url.encode()).hexdigest()
+        data = self.track_cover_pack.get(key, max_age=self.images_cache_expiry.total_seconds())
+        
+        if data is None:
+            legacy_file = os.path.join(self.track_cover_cache_dir, key + '.png')
+            if not os.path.exists(legacy_file):
+                return None
+            mtime = datetime.fromtimestamp(os.path.getmtime(legacy_file))
+            if datetime.now() - mtime > self.images_cache_expiry:
+                return None
+            with open(legacy_file, 'rb') as f:
+                data = f.read()
+            self.track_cover_pack.put(key, data)
+            os.remove(legacy_file)
+        
+        image = QImage()
+        if not image.loadFromData(data):
+            return None
+        
+        # 更新缓存状态
+        timestamp = self.track_cover_pack.get_timestamp(key)
+        status = self.cache_status['images']['tracks'].setdefault(url, {})
+        status['last_update'] = datetime.fromtimestamp(timestamp) if timestamp else datetime.now()
+        status['error'] = None
+        return image
+    
+    def _encode_image(self, image):
+        """
+        将QImage编码为PNG字节数据
+        :param image: QImage对象
+        :return: 字节数据
+        """
+        byte_array = QByteArray()
+        buffer = QBuffer(byte_array)
+        buffer.open(QIODevice.WriteOnly)
+        image.save(buffer, 'PNG')
+        buffer.close()
+        return bytes(byte_array)
+    
     def _get_image_cache_dir(self, image_type):
         """
         根据图片类型获取对应的缓存目录
@@ -334,6 +399,44 @@ class CacheManager:
                 self.cache_status['tracks'][playlist_id] = {}
             self.cache_status['tracks'][playlist_id]['error'] = str(e)
     
+    def get_tracks_cache_age(self, playlist_id):
+        """
+        根据文件修改时间获取歌曲缓存的年龄，不需要解析缓存内容
+        :param playlist_id: 歌单ID
+        :return: 距离上次写入的秒数，没有缓存返回None
+        """
+        cache_file = os.path.join(self.tracks_cache_dir, f'{playlist_id}.json')
+        try:
+            return max(0.0, datetime.now().timestamp() - os.path.getmtime(cache_file))
+        except OSError:
+            return None
+    
+    def mark_playlist_opened(self, playlist_id):
+        """
+        记录歌单最近一次被打开的时间
+        :param playlist_id: 歌单ID
+        """
+        try:
+            usage = self.get_playlist_usage()
+            usage[playlist_id] = datetime.now().timestamp()
+            with open(self.usage_file, 'w', encoding='utf-8') as f:
+                json.dump(usage, f)
+        except Exception as e:
+            logger.error(f"保存歌单使用记录失败: {str(e)}")
+    
+    def get_playlist_usage(self):
+        """
+        获取歌单最近打开时间
+        :return: 歌单ID到时间戳的字典
+        """
+        try:
+            if os.path.exists(self.usage_file):
+                with open(self.usage_file, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+        except Exception as e:
+            logger.error(f"读取歌单使用记录失败: {str(e)}")
+        return {}
+    
     def get_cache_timestamp(self, cache_type, id_or_url):
         """
         获取缓存的时间戳
@@ -393,6 +496,11 @@ class CacheManager:
                     if datetime.fromtimestamp(os.path.getmtime(file_path)) + self.images_cache_expiry < now:
                         os.remove(file_path)
             
+            # 清理打包文件中过期的歌曲封面，失效数据足够多时压缩
+            self.track_cover_pack.remove_expired(self.images_cache_expiry.total_seconds())
+            self.track_cover_pack.maybe_compact()
+            self.track_cover_pack.flush()
+            
             # 清理过期的歌单缓存
             if os.path.exists(self.playlists_cache_file):
                 with open(self.playlists_cache_file, 'r', encoding='utf-8') as f:
@@ -412,8 +520,9 @@ class CacheManager:
                     cache_time = datetime.fromisoformat(cache_data['timestamp'])
                     if now - cache_time > self.tracks_cache_expiry:
                         os.remove(file_path)
-                except:
+                except Exception as e:
                     # 如果文件格式错误，直接删除
+                    logger.warning(f"歌曲缓存文件损坏，已删除: {filename} - {str(e)}")
                     os.remove(file_path)
                     
         except Exception as e:
@@ -426,6 +535,7 @@ class CacheManager:
             for cache_dir in [self.avatar_cache_dir, self.playlist_cover_cache_dir, self.track_cover_cache_dir]:
                 for filename in os.listdir(cache_dir):
                     os.remove(os.path.join(cache_dir, filename))
+            self.track_cover_pack.clear()
             
             # 删除所有歌曲缓存
             for filename in os.listdir(self.tracks_cache_dir):
@@ -449,6 +559,116 @@ class CacheManager:
         except Exception as e:
             logger.error(f"清理所有缓存失败: {str(e)}")
     
+    def get_cache_size(self):
+        """
+        获取缓存目录占用的总字节数
+        :return: 字节数
+        """
+        total_size = 0
+        for dirpath, dirnames, filenames in os.walk(self.cache_dir):
+            for filename in filenames:
+                try:
+                    total_size += os.path.getsize(os.path.join(dirpath, filename))
+                except OSError:
+                    pass
+        return total_size
+    
+    def verify_cache(self, repair=False):
+        """
+        校验所有缓存条目，找出损坏和无主的文件
+        :param repair: 是否删除损坏和无主的文件，并重建打包文件的索引
+        :return: 校验报告字典，包含checked、corrupt、orphaned、repaired
+        """
+        report = {'checked': 0, 'corrupt': [], 'orphaned': [], 'repaired': 0}
+        
+        # 缓存根目录
+        known = {'playlists.json', 'usage.json', 'tracks', 'images'}
+        for name in sorted(os.listdir(self.cache_dir)):
+            if name not in known and os.path.isfile(os.path.join(self.cache_dir, name)):
+                report['orphaned'].append(os.path.join(self.cache_dir, name))
+        
+        for json_file in [self.playlists_cache_file, self.usage_file]:
+            if os.path.exists(json_file):
+                report['checked'] += 1
+                if not self._is_valid_json_file(json_file):
+                    report['corrupt'].append(json_file)
+        
+        # 歌曲缓存
+        for filename in sorted(os.listdir(self.tracks_cache_dir)):
+            file_path = os.path.join(self.tracks_cache_dir, filename)
+            if not filename.endswith('.json'):
+                report['orphaned'].append(file_path)
+                continue
+            report['checked'] += 1
+            if not self._is_valid_tracks_file(file_path):
+                report['corrupt'].append(file_path)
+        
+        # 图片缓存目录
+        image_dirs = [self.avatar_cache_dir, self.playlist_cover_cache_dir, self.track_cover_cache_dir]
+        pack = self.track_cover_pack
+        pack_files = {pack.data_file, pack.index_file, pack.lock_file}
+        for name in sorted(os.listdir(self.images_cache_dir)):
+            path = os.path.join(self.images_cache_dir, name)
+            if path not in image_dirs and os.path.abspath(path) not in pack_files:
+                report['orphaned'].append(path)
+        
+        for cache_dir in image_dirs:
+            for filename in sorted(os.listdir(cache_dir)):
+                file_path = os.path.join(cache_dir, filename)
+                if not self.IMAGE_FILE_PATTERN.match(filename):
+                    report['orphaned'].append(file_path)
+                    continue
+                report['checked'] += 1
+                if not QImage().load(file_path):
+                    report['corrupt'].append(file_path)
+        
+        # 打包的歌曲封面：修复时先从数据文件重建索引，再校验每条记录
+        if repair:
+            pack.rebuild_index()
+        report['checked'] += len(pack)
+        corrupt_keys = pack.verify(validator=lambda data: QImage().loadFromData(data))
+        report['corrupt'].extend(f"{pack.data_file}:{key}" for key in corrupt_keys)
+        
+        if repair:
+            for key in corrupt_keys:
+                pack.remove(key)
+            pack.flush()
+            for path in report['corrupt'] + report['orphaned']:
+                if os.path.isfile(path):
+                    os.remove(path)
+                    logger.info(f"已删除缓存文件: {path}")
+            report['repaired'] = len(report['corrupt']) + len(report['orphaned'])
+        
+        return report
+    
+    def compact_cache(self):
+        """
+        压缩打包存储，回收被覆盖和删除的记录
+        :return: 压缩前后打包数据文件的字节数
+        """
+        before = self.track_cover_pack.stats()['data_bytes']
+        self.track_cover_pack.compact()
+        return before, self.track_cover_pack.stats()['data_bytes']
+    
+    def _is_valid_json_file(self, file_path):
+        """检查文件是否为可解析的JSON"""
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                json.load(f)
+            return True
+        except Exception:
+            return False
+    
+    def _is_valid_tracks_file(self, file_path):
+        """检查歌曲缓存文件的格式"""
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                cache_data = json.load(f)
+            datetime.fromisoformat(cache_data['timestamp'])
+            return isinstance(cache_data['tracks'], list)
+        except Exception:
+            return False
+    
     def get_cache_status(self):
         """
         获取缓存状态
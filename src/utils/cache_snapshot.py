@@ -0,0 +1,238 @@
+"""
+缓存快照
+
+把整个缓存目录（歌单、歌曲、图片、打包文件及其索引）导出为一个压缩文件，
+并可以流式导入到另一台机器的缓存目录，省去重新调用API预热缓存的时间。
+
+快照是 tar.gz 流，第一个成员是 manifest.json，记录每个文件的大小和 SHA-256；
+导入时边解压边校验，全部通过后才替换现有缓存。
+"""
+import os
+import io
+import json
+import shutil
+import hashlib
+import tarfile
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FORMAT = 'spotify-export-cache'
+SNAPSHOT_VERSION = 1
+MANIFEST_NAME = 'manifest.json'
+MANIFEST_MAX_SIZE = 16 * 1024 * 1024
+CHUNK_SIZE = 1024 * 1024
+
+
+class SnapshotError(Exception):
+    """快照格式错误或校验失败"""
+
+
+def _file_sha256(file_path):
+    """计算文件的SHA-256"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _collect_files(cache_dir):
+    """
+    收集需要导出的缓存文件
+    :param cache_dir: 缓存目录
+    :return: 相对路径（使用 / 分隔）列表
+    """
+    files = []
+    for dirpath, dirnames, filenames in os.walk(cache_dir):
+        dirnames.sort()
+        for filename in sorted(filenames):
+            # 跳过写入过程中的临时文件和进程锁文件
+            if filename.endswith(('.tmp', '.lock')):
+                continue
+            rel_path = os.path.relpath(os.path.join(dirpath, filename), cache_dir)
+            files.append(rel_path.replace(os.sep, '/'))
+    return files
+
+
+def _is_safe_path(rel_path):
+    """检查快照中的路径不会写到缓存目录之外"""
+    if not rel_path or rel_path.startswith('/') or '\\' in rel_path or ':' in rel_path:
+        return False
+    return all(part not in ('', '.', '..') for part in rel_path.split('/'))
+
+
+def export_snapshot(cache_manager, snapshot_file):
+    """
+    导出缓存快照
+    :param cache_manager: 缓存管理器
+    :param snapshot_file: 快照文件路径
+    :return: 导出的文件数和原始字节数
+    """
+    cache_dir = cache_manager.cache_dir
+    cache_manager.track_cover_pack.flush()
+
+    entries = {}
+    total_bytes = 0
+    for rel_path in _collect_files(cache_dir):
+        file_path = os.path.join(cache_dir, *rel_path.split('/'))
+        size = os.path.getsize(file_path)
+        entries[rel_path] = {'size': size, 'sha256': _file_sha256(file_path)}
+        total_bytes += size
+
+    manifest = {
+        'format': SNAPSHOT_FORMAT,
+        'version': SNAPSHOT_VERSION,
+        'created': time.time(),
+        'files': entries
+    }
+    manifest_data = json.dumps(manifest, ensure_ascii=False).encode('utf-8')
+
+    tmp_file = snapshot_file + '.tmp'
+    try:
+        with tarfile.open(tmp_file, 'w:gz') as tar:
+            info = tarfile.TarInfo(MANIFEST_NAME)
+            info.size = len(manifest_data)
+            info.mtime = int(manifest['created'])
+            tar.addfile(info, io.BytesIO(manifest_data))
+
+            for rel_path in entries:
+                tar.add(os.path.join(cache_dir, *rel_path.split('/')), arcname=rel_path, recursive=False)
+        os.replace(tmp_file, snapshot_file)
+    except Exception:
+        if os.path.exists(tmp_file):
+            os.remove(tmp_file)
+        raise
+
+    logger.info(f"缓存快照已导出: {snapshot_file}, {len(entries)}个文件, {total_bytes}字节")
+    return len(entries), total_bytes
+
+
+def _read_manifest(tar):
+    """
+    读取并校验快照的清单
+    :param tar: 以流模式打开的tar文件
+    :return: 清单中的文件字典
+    """
+    member = tar.next()
+    if member is None or member.name != MANIFEST_NAME or not member.isfile():
+        raise SnapshotError("快照缺少清单文件")
+    if member.size > MANIFEST_MAX_SIZE:
+        raise SnapshotError("快照清单过大")
+
+    try:
+        manifest = json.loads(tar.extractfile(member).read().decode('utf-8'))
+    except ValueError as e:
+        raise SnapshotError(f"快照清单无法解析: {str(e)}")
+
+    if manifest.get('format') != SNAPSHOT_FORMAT:
+        raise SnapshotError("不是缓存快照文件")
+    if manifest.get('version') != SNAPSHOT_VERSION:
+        raise SnapshotError(f"不支持的快照版本: {manifest.get('version')}")
+
+    files = manifest.get('files')
+    if not isinstance(files, dict):
+        raise SnapshotError("快照清单格式错误")
+    for rel_path, entry in files.items():
+        if not _is_safe_path(rel_path):
+            raise SnapshotError(f"快照包含非法路径: {rel_path}")
+        if not isinstance(entry, dict) or not isinstance(entry.get('size'), int) or \
+                not isinstance(entry.get('sha256'), str):
+            raise SnapshotError(f"快照清单条目格式错误: {rel_path}")
+    return files
+
+
+def _extract_member(tar, member, entry, target_path):
+    """
+    流式解压单个文件并校验大小和SHA-256
+    :param tar: tar文件
+    :param member: tar成员
+    :param entry: 清单中的条目
+    :param target_path: 写入路径
+    """
+    if member.size != entry['size']:
+        raise SnapshotError(f"文件大小与清单不符: {member.name}")
+
+    os.makedirs(os.path.dirname(target_path), exist_ok=True)
+    digest = hashlib.sha256()
+    source = tar.extractfile(member)
+    with open(target_path, 'wb') as out:
+        for chunk in iter(lambda: source.read(CHUNK_SIZE), b''):
+            digest.update(chunk)
+            out.write(chunk)
+
+    if digest.hexdigest() != entry['sha256']:
+        raise SnapshotError(f"文件校验失败: {member.name}")
+
+    # 保留修改时间，图片缓存按修改时间判断是否过期
+    os.utime(target_path, (member.mtime, member.mtime))
+
+
+def import_snapshot(cache_manager, snapshot_file):
+    """
+    导入缓存快照，校验全部通过后替换现有缓存
+    :param cache_manager: 缓存管理器
+    :param snapshot_file: 快照文件路径
+    :return: 导入的文件数和原始字节数
+    """
+    cache_dir = cache_manager.cache_dir
+    staging_dir = cache_dir.rstrip(os.sep) + '.import'
+    if os.path.exists(staging_dir):
+        shutil.rmtree(staging_dir)
+
+    try:
+        # 流模式读取，不需要随机访问，也不会把整个快照读进内存
+        with tarfile.open(snapshot_file, 'r|gz') as tar:
+            files = _read_manifest(tar)
+            received = set()
+            while True:
+                member = tar.next()
+                if member is None:
+                    break
+                if not member.isfile():
+                    raise SnapshotError(f"快照包含不支持的成员类型: {member.name}")
+                entry = files.get(member.name)
+                if entry is None:
+                    raise SnapshotError(f"快照包含清单之外的文件: {member.name}")
+                if member.name in received:
+                    raise SnapshotError(f"快照包含重复文件: {member.name}")
+                _extract_member(tar, member, entry, os.path.join(staging_dir, *member.name.split('/')))
+                received.add(member.name)
+
+        missing = set(files) - received
+        if missing:
+            raise SnapshotError(f"快照缺少 {len(missing)} 个文件，例如: {sorted(missing)[0]}")
+    except (tarfile.TarError, EOFError, OSError) as e:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+        raise SnapshotError(f"读取快照失败: {str(e)}")
+    except Exception:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+        raise
+
+    # 打包文件被替换前先关闭，Windows下打开的文件不能被覆盖
+    pack = cache_manager.track_cover_pack
+    pack.close()
+    try:
+        for name in os.listdir(cache_dir):
+            path = os.path.join(cache_dir, name)
+            if os.path.isdir(path):
+                shutil.rmtree(path)
+            else:
+                os.remove(path)
+
+        total_bytes = 0
+        for rel_path, entry in files.items():
+            target_path = os.path.join(cache_dir, *rel_path.split('/'))
+            os.makedirs(os.path.dirname(target_path), exist_ok=True)
+            os.replace(os.path.join(staging_dir, *rel_path.split('/')), target_path)
+            total_bytes += entry['size']
+    finally:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+        for directory in [cache_manager.tracks_cache_dir, cache_manager.avatar_cache_dir,
+                          cache_manager.playlist_cover_cache_dir, cache_manager.track_cover_cache_dir]:
+            os.makedirs(directory, exist_ok=True)
+        pack.reopen()
+
+    logger.info(f"缓存快照已导入: {snapshot_file}, {len(files)}个文件, {total_bytes}字节")
+    return len(files), total_bytes
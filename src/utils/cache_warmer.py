@@ -0,0 +1,321 @@
+"""
+缓存预热器
+
+侧边栏加载完成后，在用户空闲时按优先级在后台预取歌单的歌曲列表和封面缩略图，
+之后打开歌单时可以直接从缓存加载。
+"""
+import math
+import time
+import heapq
+import threading
+from collections import deque
+
+import requests
+from PyQt5.QtCore import QThread, pyqtSignal
+from PyQt5.QtGui import QImage
+
+from src.utils.image_manager import get_image_manager
+from src.utils.image_utils import PLAYLIST_COVER_SIZE, device_pixel_ratio, pick_image_url, song_cover_url
+from src.utils.logger import logger
+from src.utils.track_fetcher import claim_or_wait, fetch_tracks, release_fetch, wait_for_fetch
+
+
+class RequestBudget:
+    """滑动时间窗口内的请求数和流量预算（线程安全）"""
+
+    def __init__(self, max_requests=60, max_bytes=8 * 1024 * 1024, window=60.0):
+        """
+        :param max_requests: 时间窗口内允许的最大请求数
+        :param max_bytes: 时间窗口内允许下载的最大字节数
+        :param window: 时间窗口长度（秒）
+        """
+        self.max_requests = max_requests
+        self.max_bytes = max_bytes
+        self.window = window
+        self._requests = deque()  # 请求时间
+        self._downloads = deque()  # (时间, 字节数)
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def _trim(self, now):
+        """移除时间窗口之外的记录"""
+        while self._requests and now - self._requests[0] > self.window:
+            self._requests.popleft()
+        while self._downloads and now - self._downloads[0][0] > self.window:
+            self._bytes -= self._downloads.popleft()[1]
+
+    def try_acquire(self, count=1):
+        """
+        尝试占用请求额度
+        :param count: 需要的请求数
+        :return: 额度足够时占用并返回True，否则返回False
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._trim(now)
+            if self._bytes >= self.max_bytes:
+                return False
+            # 单个任务的请求数超过窗口上限时，只要窗口为空就放行，避免永远等待
+            if self._requests and len(self._requests) + count > self.max_requests:
+                return False
+            self._requests.extend([now] * count)
+            return True
+
+    def record_bytes(self, size):
+        """
+        记录下载的字节数
+        :param size: 字节数
+        """
+        with self._lock:
+            self._downloads.append((time.monotonic(), size))
+            self._bytes += size
+
+
+class CacheWarmer(QThread):
+    """空闲时按优先级预取歌单歌曲和封面的后台线程"""
+    playlist_warmed = pyqtSignal(str)  # 预热完成的歌单ID
+
+    # 优先级权重：侧边栏位置、最近使用、缓存陈旧程度
+    POSITION_WEIGHT = 0.4
+    RECENCY_WEIGHT = 0.35
+    STALENESS_WEIGHT = 0.25
+
+    # 最近使用的影响随时间衰减（小时）
+    RECENCY_HALF_LIFE = 72
+
+    def __init__(self, sp, cache_manager, budget=None, idle_delay=3.0, parent=None):
+        """
+        :param sp: Spotify客户端
+        :param cache_manager: 缓存管理器
+        :param budget: 请求预算，默认每分钟60个请求、8MB流量
+        :param idle_delay: 用户操作后需要空闲多少秒才继续预热
+        :param parent: 父对象
+        """
+        super().__init__(parent)
+        self.sp = sp
+        self.cache_manager = cache_manager
+        self.budget = budget or RequestBudget()
+        self.idle_delay = idle_delay
+        # 后台线程中不访问屏幕信息，预热的图片尺寸与界面按同一缩放比例选择
+        self.pixel_ratio = device_pixel_ratio()
+
+        self._pending = None  # 等待计算优先级的歌单列表
+        self._queue = []  # (-优先级, 序号, 歌单数据)
+        self._discarded = set()  # 本轮队列中跳过的歌单，重建队列时清空
+        self._lock = threading.Lock()
+        self._sequence = 0
+        self._last_activity = 0.0
+
+    # ---------- GUI线程调用的接口 ----------
+
+    def enqueue_playlists(self, playlists):
+        """
+        设置需要预热的歌单，优先级在后台线程中计算，空闲时开始预热
+        :param playlists: 侧边栏中的歌单列表（按显示顺序）
+        """
+        with self._lock:
+            self._pending = list(playlists)
+
+        if not self.isRunning():
+            self.start(QThread.LowestPriority)
+
+    def notify_user_activity(self):
+        """记录用户操作，预热会暂停到用户空闲为止"""
+        self._last_activity = time.monotonic()
+
+    def discard(self, playlist_id):
+        """
+        在当前队列中跳过指定歌单（例如用户已经打开了它），侧边栏重新提交歌单时恢复
+        :param playlist_id: 歌单ID
+        """
+        with self._lock:
+            self._discarded.add(playlist_id)
+
+    def stop(self):
+        """停止预热并等待线程退出"""
+        with self._lock:
+            self._pending = None
+            self._queue = []
+        if self.isRunning():
+            self.requestInterruption()
+            self.wait(3000)
+
+    # ---------- 优先级 ----------
+
+    def _build_queue(self, playlists):
+        """
+        计算每个歌单的优先级并重建优先队列
+        :param playlists: 按侧边栏顺序排列的歌单列表
+        """
+        usage = self.cache_manager.get_playlist_usage()
+        now = time.time()
+        total = len(playlists)
+        queue = []
+
+        for position, playlist in enumerate(playlists):
+            if not playlist or not playlist.get('id'):
+                continue
+            priority = self._compute_priority(playlist['id'], position, total, usage.get(playlist['id']), now)
+            self._sequence += 1
+            queue.append((-priority, self._sequence, playlist))
+
+        heapq.heapify(queue)
+        with self._lock:
+            self._queue = queue
+            # 打开过的歌单之后可能又过期了，新一轮按优先级重新考虑
+            self._discarded.clear()
+        logger.info(f"缓存预热队列已更新: {len(queue)}个歌单")
+
+    def _compute_priority(self, playlist_id, position, total, last_opened, now):
+        """
+        计算歌单的预热优先级，数值越大越先预热
+        :param playlist_id: 歌单ID
+        :param position: 在侧边栏中的位置
+        :param total: 歌单总数
+        :param last_opened: 最近一次打开的时间戳，没打开过为None
+        :param now: 当前时间戳
+        :return: 0到1之间的优先级
+        """
+        position_score = 1.0 - position / total if total else 0.0
+
+        recency_score = 0.0
+        if last_opened:
+            age_hours = max(0.0, now - last_opened) / 3600
+            recency_score = math.pow(0.5, age_hours / self.RECENCY_HALF_LIFE)
+
+        cache_age = self.cache_manager.get_tracks_cache_age(playlist_id)
+        if cache_age is None:
+            staleness_score = 1.0
+        else:
+            expiry = self.cache_manager.tracks_cache_expiry.total_seconds()
+            staleness_score = min(1.0, cache_age / expiry)
+
+        return (self.POSITION_WEIGHT * position_score +
+                self.RECENCY_WEIGHT * recency_score +
+                self.STALENESS_WEIGHT * staleness_score)
+
+    # ---------- 后台线程 ----------
+
+    def _is_user_active(self):
+        """用户最近是否有操作"""
+        return time.monotonic() - self._last_activity < self.idle_delay
+
+    def _wait_until_allowed(self, count=1):
+        """
+        等待用户空闲且预算允许
+        :param count: 需要的请求数
+        :return: 可以继续返回True，线程被要求停止返回False
+        """
+        while not self.isInterruptionRequested():
+            if not self._is_user_active() and self.budget.try_acquire(count):
+                return True
+            self.msleep(200)
+        return False
+
+    def _next_playlist(self):
+        """取出下一个需要预热的歌单，队列为空返回None"""
+        with self._lock:
+            pending, self._pending = self._pending, None
+        if pending is not None:
+            self._build_queue(pending)
+
+        with self._lock:
+            while self._queue:
+                _, _, playlist = heapq.heappop(self._queue)
+                if playlist['id'] not in self._discarded:
+                    return playlist
+        return None
+
+    def run(self):
+        while not self.isInterruptionRequested():
+            playlist = self._next_playlist()
+            if playlist is None:
+                break
+            try:
+                if self._warm_playlist(playlist):
+                    self.playlist_warmed.emit(playlist['id'])
+            except Exception as e:
+                logger.warning(f"预热歌单失败: {playlist.get('name')} - {str(e)}")
+        logger.info("缓存预热线程结束")
+
+    def _warm_playlist(self, playlist):
+        """
+        预热单个歌单：歌曲列表和封面缩略图
+        :param playlist: 歌单数据
+        :return: 是否完成
+        """
+        playlist_id = playlist['id']
+        tracks = self.cache_manager.get_cached_tracks(playlist_id)
+
+        if tracks is None:
+            # 每页100首，按页数占用请求预算
+            total = (playlist.get('tracks') or {}).get('total', 0)
+            if not self._wait_until_allowed(max(1, math.ceil(total / 100))):
+                return False
+            tracks = self._fetch_tracks(playlist)
+            if tracks is None:
+                return False
+
+        images = []
+        cover_url = pick_image_url(playlist.get('images'), PLAYLIST_COVER_SIZE, self.pixel_ratio)
+        if cover_url:
+            images.append((cover_url, 'playlist'))
+        seen = set()
+        for item in tracks:
+            url = song_cover_url(item, self.pixel_ratio)
+            if url and url not in seen:
+                seen.add(url)
+                images.append((url, 'track'))
+
+        for url, image_type in images:
+            if self.isInterruptionRequested():
+                return False
+            if self.cache_manager.get_cached_image(url, image_type) is not None:
+                continue
+            if not self._wait_until_allowed():
+                return False
+            self._download_image(url, image_type)
+
+        logger.debug(f"歌单预热完成: {playlist.get('name')}, 封面{len(images)}张")
+        return True
+
+    def _fetch_tracks(self, playlist):
+        """
+        获取歌单歌曲并写入缓存，其他线程正在加载同一歌单时等它写入缓存后直接读取
+        :param playlist: 歌单数据
+        :return: 歌曲列表，取消或其他线程加载失败时返回None
+        """
+        playlist_id = playlist['id']
+        # 预算在登记之前占用，登记后不再等待，不会让打开歌单的加载线程排在预热后面
+        owner, done = claim_or_wait(playlist_id)
+        if not owner:
+            if not wait_for_fetch(done, self.isInterruptionRequested):
+                return None
+            return self.cache_manager.get_cached_tracks(playlist_id)
+
+        try:
+            tracks = self.cache_manager.get_cached_tracks(playlist_id)
+            if tracks is None:
+                logger.debug(f"预热歌单歌曲: {playlist.get('name')}")
+                tracks = fetch_tracks(self.sp, playlist_id, self.isInterruptionRequested)
+                if tracks is not None:
+                    self.cache_manager.cache_tracks(playlist_id, tracks)
+            return tracks
+        finally:
+            release_fetch(playlist_id, done)
+
+    def _download_image(self, url, image_type):
+        """
+        下载图片并写入缓存
+        :param url: 图片URL
+        :param image_type: 图片类型
+        """
+        try:
+            content = get_image_manager().download(url)
+            self.budget.record_bytes(len(content))
+
+            image = QImage()
+            if image.loadFromData(content) and not image.isNull():
+                self.cache_manager.cache_image(url, image, image_type)
+        except requests.exceptions.RequestException as e:
+            logger.debug(f"预热图片失败: {url} - {str(e)}")
@@ -0,0 +1,160 @@
+"""
+图片下载管理
+
+侧边栏、顶栏、歌曲列表和缓存预热共用一个下载管理器：
+共享一个保持连接的会话（不必每张图片都重新握手），
+用全局信号量限制同时下载的数量，所有类型的图片都经过磁盘缓存，
+并记录每次下载的耗时和流量。
+"""
+import time
+import threading
+import logging
+from collections import deque
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from PyQt5.QtGui import QImage
+
+logger = logging.getLogger(__name__)
+
+
+class ImageDownloadManager:
+    """共享连接池的图片下载管理器，可以在任意线程中调用"""
+
+    TIMEOUT = 10
+    RECENT_LIMIT = 100  # 保留最近多少条下载记录
+
+    def __init__(self, max_concurrent=6):
+        """
+        :param max_concurrent: 全局最多同时下载的图片数
+        """
+        self.max_concurrent = max_concurrent
+        self._slots = threading.BoundedSemaphore(max_concurrent)
+
+        retries = Retry(total=3, backoff_factor=0.5)
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max_concurrent, max_retries=retries)
+        self._session = requests.Session()
+        self._session.mount('https://', adapter)
+        self._session.mount('http://', adapter)
+
+        self._lock = threading.Lock()
+        self._recent = deque(maxlen=self.RECENT_LIMIT)
+        self._stats = {
+            'requests': 0,
+            'cache_hits': 0,
+            'downloads': 0,
+            'failures': 0,
+            'bytes': 0,
+            'download_time': 0.0
+        }
+
+    def download(self, url):
+        """
+        下载原始数据，受全局并发数限制
+        :param url: 图片URL
+        :return: 响应内容
+        :raises requests.exceptions.RequestException: 下载失败
+        """
+        start = time.perf_counter()
+        waited = 0.0
+        try:
+            with self._slots:
+                waited = time.perf_counter() - start
+                response = self._session.get(url, timeout=self.TIMEOUT)
+                response.raise_for_status()
+                content = response.content
+        except requests.exceptions.RequestException:
+            self._record(url, 0, time.perf_counter() - start, waited, ok=False)
+            raise
+
+        self._record(url, len(content), time.perf_counter() - start, waited, ok=True)
+        return content
+
+    def fetch(self, url, image_type='playlist', cache_manager=None):
+        """
+        获取图片，优先使用磁盘缓存，下载成功后写入缓存
+        :param url: 图片URL
+        :param image_type: 图片类型，可选值：'avatar', 'playlist', 'track'
+        :param cache_manager: 缓存管理器，为None时不使用缓存
+        :return: QImage，失败返回None
+        """
+        with self._lock:
+            self._stats['requests'] += 1
+
+        if cache_manager is not None:
+            image = cache_manager.get_cached_image(url, image_type)
+            if image and not image.isNull():
+                with self._lock:
+                    self._stats['cache_hits'] += 1
+                return image
+
+        if not url or not url.startswith('http'):
+            logger.error(f"无效的图片URL: {url}")
+            return None
+
+        try:
+            content = self.download(url)
+        except requests.exceptions.RequestException as e:
+            logger.error(f"网络请求错误: {url} - {str(e)}")
+            return None
+
+        image = QImage()
+        if not image.loadFromData(content) or image.isNull():
+            logger.debug(f"加载的图片无效: {url}")
+            return None
+
+        if cache_manager is not None:
+            try:
+                cache_manager.cache_image(url, image, image_type)
+            except Exception as e:
+                # 缓存失败不影响继续使用图片
+                logger.error(f"缓存图片失败: {str(e)}")
+        return image
+
+    def stats(self):
+        """
+        获取累计的下载统计
+        :return: 统计字典
+        """
+        with self._lock:
+            return dict(self._stats)
+
+    def recent_downloads(self):
+        """
+        获取最近的下载记录
+        :return: 记录列表，每条包含 url、bytes、seconds、wait、ok
+        """
+        with self._lock:
+            return list(self._recent)
+
+    def _record(self, url, size, elapsed, waited, ok):
+        """记录一次下载"""
+        with self._lock:
+            if ok:
+                self._stats['downloads'] += 1
+                self._stats['bytes'] += size
+            else:
+                self._stats['failures'] += 1
+            self._stats['download_time'] += elapsed
+            self._recent.append({'url': url, 'bytes': size, 'seconds': elapsed, 'wait': waited, 'ok': ok})
+
+        logger.debug(f"图片下载{'完成' if ok else '失败'}: {url}, {size / 1024:.1f}KB, "
+                     f"耗时{elapsed * 1000:.0f}ms（排队{waited * 1000:.0f}ms）")
+
+
+_manager = None
+_manager_lock = threading.Lock()
+
+
+def get_image_manager():
+    """
+    获取全局共享的图片下载管理器
+    :return: ImageDownloadManager
+    """
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            from src.config import settings
+            _manager = ImageDownloadManager(settings.get_setting('image_max_downloads', 6))
+        return _manager
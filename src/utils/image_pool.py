@@ -0,0 +1,190 @@
+"""
+图片加载线程池
+
+固定数量的工作线程从优先级队列中取任务，数值越小越先加载。
+排队中的任务可以随时调整优先级或取消；已经在下载的任务被取消后，结果直接丢弃。
+工作线程按需启动，空闲一段时间后自动退出，快速滚动长列表时不会创建大量系统线程。
+"""
+import heapq
+import itertools
+import threading
+import logging
+
+from PyQt5.QtCore import QObject, pyqtSignal
+from PyQt5.QtGui import QImage
+
+logger = logging.getLogger(__name__)
+
+
+class ImageWorkerPool(QObject):
+    """有界的图片加载线程池"""
+    image_loaded = pyqtSignal(QImage, str)  # 加载的图片和图片URL
+
+    PRIORITY_VISIBLE = 0
+    IDLE_TIMEOUT = 30  # 工作线程空闲多少秒后退出
+
+    def __init__(self, load_func, max_workers=4, parent=None):
+        """
+        :param load_func: 加载函数，接收图片URL，返回QImage（在工作线程中调用）
+        :param max_workers: 最多同时运行的工作线程数
+        :param parent: 父对象
+        """
+        super().__init__(parent)
+        self.load_func = load_func
+        self.max_workers = max_workers
+
+        self._condition = threading.Condition()
+        self._heap = []  # [优先级, 序号, URL]，URL为None表示条目已失效
+        self._queued = {}  # URL -> 堆中的条目
+        self._running = {}  # URL -> 是否已取消
+        self._counter = itertools.count()
+        self._workers = 0
+        self._idle_workers = 0
+        self._closed = False
+
+    def request(self, url, priority=PRIORITY_VISIBLE):
+        """
+        请求加载图片，已在队列中时只会提高优先级
+        :param url: 图片URL
+        :param priority: 优先级，数值越小越先加载
+        """
+        with self._condition:
+            if self._closed:
+                return
+            if url in self._running:
+                # 正在下载，撤销之前的取消
+                self._running[url] = False
+                return
+            entry = self._queued.get(url)
+            if entry is not None and entry[0] <= priority:
+                return
+            self._push(url, priority)
+            self._ensure_workers()
+            self._condition.notify()
+
+    def reprioritize(self, priorities):
+        """
+        按新的优先级重排队列，不在字典中的任务全部取消
+        :param priorities: URL -> 优先级
+        :return: 被取消的URL列表
+        """
+        cancelled = []
+        with self._condition:
+            if self._closed:
+                return cancelled
+
+            for url, entry in list(self._queued.items()):
+                if url not in priorities:
+                    entry[2] = None
+                    del self._queued[url]
+                    cancelled.append(url)
+
+            for url, cancel_flag in self._running.items():
+                if url not in priorities and not cancel_flag:
+                    self._running[url] = True
+                    cancelled.append(url)
+
+            for url, priority in priorities.items():
+                if url in self._running:
+                    self._running[url] = False
+                    continue
+                entry = self._queued.get(url)
+                if entry is None or entry[0] != priority:
+                    self._push(url, priority)
+
+            # 失效条目太多时重建堆
+            if len(self._heap) > 2 * len(self._queued) + 64:
+                self._heap = [entry for entry in self._heap if entry[2] is not None]
+                heapq.heapify(self._heap)
+
+            if self._queued:
+                self._ensure_workers()
+                self._condition.notify_all()
+        return cancelled
+
+    def cancel_all(self):
+        """
+        取消所有排队和正在下载的任务
+        :return: 被取消的URL列表
+        """
+        return self.reprioritize({})
+
+    def shutdown(self):
+        """取消所有任务并让工作线程退出"""
+        with self._condition:
+            self._closed = True
+            self._heap = []
+            self._queued = {}
+            for url in self._running:
+                self._running[url] = True
+            self._condition.notify_all()
+
+    def pending_count(self):
+        """排队中和正在下载的任务数"""
+        with self._condition:
+            return len(self._queued) + len(self._running)
+
+    # ---------- 内部实现（调用方持有锁） ----------
+
+    def _push(self, url, priority):
+        old = self._queued.get(url)
+        if old is not None:
+            old[2] = None
+        entry = [priority, next(self._counter), url]
+        self._queued[url] = entry
+        heapq.heappush(self._heap, entry)
+
+    def _ensure_workers(self):
+        """按排队的任务数补足工作线程，空闲的线程先用上，总数不超过上限"""
+        wanted = len(self._queued) - self._idle_workers
+        while wanted > 0 and self._workers < self.max_workers:
+            self._workers += 1
+            wanted -= 1
+            threading.Thread(target=self._worker_loop, name="ImageWorker", daemon=True).start()
+
+    def _next_job(self):
+        """取出下一个任务，空闲超时或线程池关闭时返回None"""
+        with self._condition:
+            while True:
+                while self._heap:
+                    entry = heapq.heappop(self._heap)
+                    url = entry[2]
+                    if url is None:
+                        continue
+                    del self._queued[url]
+                    self._running[url] = False
+                    return url
+
+                if self._closed:
+                    self._workers -= 1
+                    return None
+
+                self._idle_workers += 1
+                notified = self._condition.wait(self.IDLE_TIMEOUT)
+                self._idle_workers -= 1
+                if not notified and not self._heap:
+                    self._workers -= 1
+                    return None
+
+    def _worker_loop(self):
+        while True:
+            url = self._next_job()
+            if url is None:
+                return
+
+            image = None
+            try:
+                image = self.load_func(url)
+            except Exception as e:
+                logger.error(f"加载图片失败: {url} - {str(e)}")
+
+            with self._condition:
+                cancelled = self._running.pop(url, True)
+
+            if cancelled or image is None:
+                continue
+            try:
+                self.image_loaded.emit(image, url)
+            except RuntimeError:
+                # 线程池所属的界面已经销毁
+                return
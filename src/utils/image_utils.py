@@ -0,0 +1,83 @@
+"""
+图片工具
+
+Spotify 为同一张图片提供多种尺寸，按显示尺寸和屏幕缩放比例选出够用的最小尺寸，
+侧边栏和顶栏的小图标不必下载和解码640像素的大图；
+加载后按同样的比例缩放，高分屏上也能清晰显示。
+"""
+import math
+
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QGuiApplication, QPixmap
+
+PLAYLIST_COVER_SIZE = 192  # 歌单页面封面的最大显示尺寸
+SONG_ARTWORK_SIZE = 50  # 歌曲列表中专辑封面的显示尺寸
+
+
+def device_pixel_ratio():
+    """
+    获取屏幕缩放比例（多个屏幕时取最大值），需要在主线程中调用
+    :return: 缩放比例，没有图形应用实例（包括只有 QCoreApplication 的命令行工具）时返回1.0
+    """
+    app = QGuiApplication.instance()
+    return app.devicePixelRatio() if isinstance(app, QGuiApplication) else 1.0
+
+
+def pick_image_url(images, size, ratio=None):
+    """
+    选出不小于显示尺寸的最小图片
+    :param images: Spotify 图片列表，每项包含 url、width、height（自定义封面的尺寸可能为None）
+    :param size: 显示尺寸（逻辑像素）
+    :param ratio: 屏幕缩放比例，为None时使用当前应用的缩放比例
+    :return: 图片URL，没有图片时返回空字符串
+    """
+    if not images:
+        return ''
+    needed = math.ceil(size * (device_pixel_ratio() if ratio is None else ratio))
+
+    best = None  # 足够大的图片中最小的 (边长, URL)
+    largest = None  # 所有已知尺寸的图片中最大的 (边长, URL)
+    for image in images:
+        url = image.get('url')
+        sides = [side for side in (image.get('width'), image.get('height')) if side]
+        if not url or not sides:
+            continue
+        side = min(sides)
+        if side >= needed and (best is None or side < best[0]):
+            best = (side, url)
+        if largest is None or side > largest[0]:
+            largest = (side, url)
+
+    if best is not None:
+        return best[1]
+    if largest is not None:
+        return largest[1]
+    # 都没有尺寸信息时使用第一张
+    return images[0].get('url') or ''
+
+
+def song_cover_url(song, ratio=None):
+    """
+    获取歌曲行使用的专辑封面URL
+    :param song: 歌曲数据
+    :param ratio: 屏幕缩放比例，为None时使用当前应用的缩放比例
+    :return: 图片URL，没有封面时返回None
+    """
+    images = ((song.get('track') or {}).get('album') or {}).get('images')
+    return pick_image_url(images, SONG_ARTWORK_SIZE, ratio) or None
+
+
+def scaled_pixmap(image, size, ratio=None):
+    """
+    把图片缩放为显示尺寸的像素图，按屏幕缩放比例保留更多像素
+    :param image: QImage
+    :param size: 显示尺寸（逻辑像素）
+    :param ratio: 屏幕缩放比例，为None时使用当前应用的缩放比例
+    :return: QPixmap
+    """
+    if ratio is None:
+        ratio = device_pixel_ratio()
+    pixels = round(size * ratio)
+    pixmap = QPixmap.fromImage(image.scaled(pixels, pixels, Qt.KeepAspectRatio, Qt.SmoothTransformation))
+    pixmap.setDevicePixelRatio(ratio)
+    return pixmap
@@ -2,10 +2,16 @@
 加载指示器控件
 """
 from PyQt5.QtWidgets import QWidget
-from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QPainter, QColor, QBrush, QPen
+from src.utils.animation_clock import get_animation_clock
 
 class LoadingIndicator(QWidget):
+    """旋转的加载指示器，由共享动画时钟驱动，隐藏时自动暂停"""
+
+    FRAME_MS = 50  # 每帧间隔
+    STEP_DEGREES = 10  # 每帧旋转的角度
+
     def __init__(self, parent=None):
         super().__init__(parent)
         
@@ -18,30 +24,30 @@ class LoadingIndicator(QWidget):
         # 默认尺寸
         self.setFixedSize(40, 40)
         
-        # 动画计时器
-        self.timer = QTimer(self)
-        self.timer.timeout.connect(self.rotate)
-        self.timer.setInterval(50)  # 50毫秒间隔
-        
         # 默认颜色
         self.color = QColor("#1DB954")  # Spotify绿色
         
-    def rotate(self):
-        """旋转指示器"""
-        self.angle = (self.angle + 10) % 360
-        self.update()
+    def rotate(self, now):
+        """
+        按时钟时间旋转指示器，角度不变时不重绘
+        :param now: 动画时钟的当前时间（毫秒）
+        """
+        angle = (now // self.FRAME_MS * self.STEP_DEGREES) % 360
+        if angle != self.angle:
+            self.angle = angle
+            self.update()
         
     def start(self):
         """开始动画"""
-        self.timer.start()
+        get_animation_clock().register(self, self.rotate, self.FRAME_MS)
         
     def stop(self):
         """停止动画"""
-        self.timer.stop()
+        get_animation_clock().unregister(self)
         
     def isRunning(self):
-        """是否正在运行"""
-        return self.timer.isActive()
+        """是否正在运行（已开始，隐藏时暂停也算在运行）"""
+        return get_animation_clock().is_registered(self)
         
     def setColor(self, color):
         """设置颜色
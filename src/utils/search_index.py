@@ -0,0 +1,238 @@
+"""
+歌曲和歌单搜索索引
+
+为每首歌的歌曲名、艺术家和专辑预先生成规范化文本（忽略大小写和重音符号）和三元组倒排索引。
+查询文本作为子串出现在某个字段中的歌曲总是排在最前（如 "ong" 能找到 "Love Song"）；
+其后按共有的三元组数量找出候选歌曲，容忍拼写错误，再按相似度和匹配的字段排序；
+查询中不足三个字符的词（如 "Part 2" 中的 "2"）没有三元组，要求它是某个词的开头；
+很短的查询只做子串匹配。子串匹配在追加字符时只在上一次的结果中继续筛选。
+索引可以随分页加载的歌曲增量追加。
+歌单名称索引用于侧边栏筛选，只做子串匹配，几千个歌单也能在每次按键时即时筛选。
+"""
+import re
+import math
+import unicodedata
+from collections import Counter, defaultdict
+from itertools import chain
+
+NGRAM_SIZE = 3
+MIN_SIMILARITY = 0.5  # 查询的三元组中至少有多少比例出现在歌曲中
+EXACT_GRAMS = 3  # 三元组不超过这个数量的短查询（4个字符以内的词）要求全部三元组都出现
+
+# 查询文本完整出现在某个字段中时的加分，歌曲名最重要
+FIELD_BONUS = (1.0, 0.8, 0.6)  # 歌曲名、艺术家、专辑
+
+# 分解后的组合用重音符号
+_COMBINING_MARKS = re.compile('[\u0300-\u036f\u1ab0-\u1aff\u1dc0-\u1dff\u20d0-\u20ff\ufe20-\ufe2f]')
+
+
+def normalize_text(text):
+    """
+    规范化搜索文本：去掉重音符号并忽略大小写
+    :param text: 原始文本
+    :return: 规范化后的文本
+    """
+    if not text:
+        return ''
+    if text.isascii():
+        # 纯ASCII文本没有重音符号，直接转小写即可
+        return text.lower()
+    return _COMBINING_MARKS.sub('', unicodedata.normalize('NFKD', text)).casefold()
+
+
+def song_search_fields(song):
+    """
+    提取歌曲中参与搜索的字段
+    :param song: 歌曲数据
+    :return: (歌曲名, 艺术家, 专辑)
+    """
+    track = song.get('track') or {}
+    artists = ' '.join(artist.get('name', '') for artist in track.get('artists', []))
+    return track.get('name', ''), artists, (track.get('album') or {}).get('name', '')
+
+
+def ngrams(text):
+    """
+    生成文本的三元组集合，开头补空格，使输入单词开头时也能匹配
+    :param text: 规范化后的文本
+    :return: 三元组集合
+    """
+    padded = ' ' + text
+    return {padded[i:i + NGRAM_SIZE] for i in range(len(padded) - NGRAM_SIZE + 1)}
+
+
+class SongSearchIndex:
+    """歌曲名、艺术家和专辑的模糊搜索索引"""
+
+    def __init__(self, songs=None):
+        self._fields = []  # 歌曲序号 -> 规范化后的(歌曲名, 艺术家, 专辑)
+        self._postings = defaultdict(list)  # 三元组 -> 歌曲序号列表（递增）
+        self._word_grams = {}  # 单词 -> 三元组集合，艺术家和专辑名重复很多
+        self._last_query = None
+        self._last_result = None
+        if songs:
+            self.add_songs(songs)
+
+    def __len__(self):
+        return len(self._fields)
+
+    def add_songs(self, songs):
+        """
+        追加歌曲到索引末尾，序号与歌曲在歌单中的位置一致
+        :param songs: 歌曲列表
+        """
+        postings = self._postings
+        word_grams = self._word_grams
+        for song in songs:
+            index = len(self._fields)
+            fields = tuple(normalize_text(field) for field in song_search_fields(song))
+            self._fields.append(fields)
+
+            # 每个词单独补空格，词首的三元组也能命中
+            grams = set()
+            for field in fields:
+                for word in field.split():
+                    cached = word_grams.get(word)
+                    if cached is None:
+                        cached = word_grams[word] = ngrams(word)
+                    grams |= cached
+            for gram in grams:
+                postings[gram].append(index)
+
+        self._last_query = None
+        self._last_result = None
+
+    def search(self, query):
+        """
+        搜索歌曲
+        :param query: 搜索文本
+        :return: 匹配歌曲的序号列表（按相关度从高到低），查询为空时返回None
+        """
+        query = normalize_text(query.strip())
+        if not query:
+            return None
+        exact = self._substring_search(query)
+        if len(query) < NGRAM_SIZE:
+            return exact
+        return self._fuzzy_search(query, exact)
+
+    def _substring_search(self, query):
+        """按子串匹配，结果按歌单顺序"""
+        # 新查询包含上一次的查询时，结果一定是上一次结果的子集
+        if self._last_query and self._last_query in query:
+            candidates = self._last_result
+        else:
+            candidates = range(len(self._fields))
+
+        fields = self._fields
+        result = [i for i in candidates if any(query in field for field in fields[i])]
+        self._last_query = query
+        self._last_result = result
+        return result
+
+    def _fuzzy_search(self, query, exact):
+        """
+        按共有三元组数量召回候选，按相似度和完整匹配的字段排序
+        :param query: 规范化后的查询
+        :param exact: 子串匹配的歌曲序号，排在模糊匹配的结果之前
+        :return: 歌曲序号列表
+        """
+        query_grams = set()
+        short_words = []
+        for word in query.split():
+            if len(word) < NGRAM_SIZE:
+                # 一两个字符的词补空格后最多只有一个三元组，改为要求它是某个词的开头
+                short_words.append(word)
+            else:
+                query_grams.update(ngrams(word))
+        fields = self._fields
+        prefix_patterns = [re.compile(r'(?:^|\s)' + re.escape(word)) for word in short_words]
+
+        def has_short_words(index):
+            return all(any(pattern.search(field) for field in fields[index]) for pattern in prefix_patterns)
+
+        exact_set = set(exact)
+        if not query_grams:
+            # 查询只由短词组成，按词首匹配，结果按歌单顺序
+            return exact + [i for i in range(len(fields)) if i not in exact_set and has_short_words(i)]
+
+        postings = self._postings
+        # Counter 在C层计数，比逐个累加快得多
+        shared = Counter(chain.from_iterable(postings[gram] for gram in query_grams if gram in postings))
+        if len(query_grams) <= EXACT_GRAMS:
+            min_shared = len(query_grams)
+        else:
+            min_shared = max(1, math.ceil(len(query_grams) * MIN_SIMILARITY))
+        total = float(len(query_grams))
+
+        exact_scored = []
+        for index in exact:
+            score = shared.get(index, 0) / total
+            for field, bonus in zip(fields[index], FIELD_BONUS):
+                if query in field:
+                    score += bonus
+                    break
+            exact_scored.append((-score, index))
+
+        scored = []
+        for index, count in shared.items():
+            if count < min_shared or index in exact_set:
+                continue
+            if prefix_patterns and not has_short_words(index):
+                continue
+            scored.append((-count / total, index))
+
+        exact_scored.sort()
+        scored.sort()
+        return [index for _, index in exact_scored] + [index for _, index in scored]
+
+
+class PlaylistNameIndex:
+    """歌单名称的筛选索引"""
+
+    def __init__(self, playlists=None):
+        self._names = []  # 歌单序号 -> 规范化后的名称
+        self._last_query = None
+        self._last_result = None
+        if playlists:
+            self.set_playlists(playlists)
+
+    def __len__(self):
+        return len(self._names)
+
+    def set_playlists(self, playlists):
+        """
+        重建索引，序号与歌单在列表中的位置一致
+        :param playlists: 歌单列表
+        """
+        self._names = [normalize_text(playlist.get('name') or '') for playlist in playlists]
+        self._last_query = None
+        self._last_result = None
+
+    def filter(self, query):
+        """
+        筛选名称包含查询中所有词的歌单
+        :param query: 筛选文本
+        :return: 匹配歌单的序号列表（保持原顺序），查询为空时返回None
+        """
+        query = normalize_text(query.strip())
+        if not query:
+            self._last_query = None
+            self._last_result = None
+            return None
+
+        # 在上一次的查询后追加字符时，结果一定是上一次结果的子集
+        if self._last_query and query.startswith(self._last_query):
+            candidates = self._last_result
+        else:
+            candidates = range(len(self._names))
+
+        names = self._names
+        words = query.split()
+        if len(words) == 1:
+            result = [i for i in candidates if query in names[i]]
+        else:
+            result = [i for i in candidates if all(word in names[i] for word in words)]
+        self._last_query = query
+        self._last_result = result
+        return result
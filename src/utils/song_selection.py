@@ -0,0 +1,135 @@
+"""
+歌曲勾选状态
+
+按歌曲在歌单中的位置记录勾选，与列表当前的行号无关，
+搜索和排序重新生成列表后勾选状态保持不变。
+全选、清空和反选只修改一个标记，不需要逐首处理；
+之后单独勾选或取消的歌曲记录为相对于该标记的例外。
+从API刷新歌单后，勾选按歌曲身份（曲目ID和添加时间）迁移到新的位置；
+保存到磁盘的勾选快照同样按歌曲身份记录。
+"""
+
+
+def song_key(song):
+    """
+    获取歌曲在歌单中的唯一标识
+    :param song: 歌曲数据
+    :return: 歌曲的原始位置，没有时使用曲目ID
+    """
+    key = song.get('original_index')
+    if key is None:
+        key = (song.get('track') or {}).get('id')
+    return key
+
+
+def song_identity(song):
+    """
+    获取歌曲在刷新前后保持不变的身份，歌单中的位置可能变化
+    :param song: 歌曲数据
+    :return: (曲目ID, 添加时间)
+    """
+    track = song.get('track') or {}
+    return track.get('id') or track.get('uri'), song.get('added_at')
+
+
+class SongSelection:
+    """以歌曲标识为键的勾选集合"""
+
+    def __init__(self):
+        self._inverted = False  # 为True时默认勾选，例外集合记录未勾选的歌曲
+        self._exceptions = set()  # 与默认状态相反的歌曲标识
+
+    def is_selected(self, song):
+        """歌曲是否被勾选"""
+        return (song_key(song) in self._exceptions) != self._inverted
+
+    def set_selected(self, song, selected):
+        """
+        勾选或取消勾选一首歌曲
+        :param song: 歌曲数据
+        :param selected: 是否勾选
+        """
+        if selected != self._inverted:
+            self._exceptions.add(song_key(song))
+        else:
+            self._exceptions.discard(song_key(song))
+
+    def set_songs_selected(self, songs, selected):
+        """
+        勾选或取消勾选一部分歌曲（例如搜索结果）
+        :param songs: 歌曲列表
+        :param selected: 是否勾选
+        """
+        keys = (song_key(song) for song in songs)
+        if selected != self._inverted:
+            self._exceptions.update(keys)
+        else:
+            self._exceptions.difference_update(keys)
+
+    def invert_songs(self, songs):
+        """反选一部分歌曲"""
+        self._exceptions.symmetric_difference_update({song_key(song) for song in songs})
+
+    def select_all(self):
+        """勾选全部歌曲"""
+        self._inverted = True
+        self._exceptions = set()
+
+    def clear(self):
+        """取消全部勾选"""
+        self._inverted = False
+        self._exceptions = set()
+
+    def invert(self):
+        """反选全部歌曲"""
+        self._inverted = not self._inverted
+
+    def count(self, total):
+        """
+        勾选的歌曲数量
+        :param total: 歌单中可勾选的歌曲总数
+        :return: 勾选数量
+        """
+        return total - len(self._exceptions) if self._inverted else len(self._exceptions)
+
+    def selected(self, songs):
+        """
+        筛选出勾选的歌曲，保持传入的顺序
+        :param songs: 歌曲列表
+        :return: 勾选的歌曲列表
+        """
+        if not self._inverted and not self._exceptions:
+            return []
+        return [song for song in songs if self.is_selected(song)]
+
+    def carry_over(self, old_songs, new_songs):
+        """
+        歌单刷新后按歌曲身份迁移勾选状态，新增的歌曲保持默认状态（全选后为勾选）
+        :param old_songs: 刷新前的歌曲列表
+        :param new_songs: 刷新后的歌曲列表
+        """
+        if not self._exceptions:
+            return
+        identities = {song_identity(song) for song in old_songs if song_key(song) in self._exceptions}
+        self._exceptions = {song_key(song) for song in new_songs if song_identity(song) in identities}
+
+    def snapshot(self, songs):
+        """
+        生成可以保存为JSON的勾选快照，按歌曲身份记录，歌单变化后仍然适用
+        :param songs: 歌单中的全部歌曲
+        :return: 字典，包含 inverted 和 songs（例外歌曲的身份列表）
+        """
+        return {
+            'inverted': self._inverted,
+            'songs': [list(song_identity(song)) for song in songs if song_key(song) in self._exceptions],
+        }
+
+    def restore(self, snapshot, songs):
+        """
+        从勾选快照恢复，快照中已不在歌单里的歌曲被忽略
+        :param snapshot: snapshot 生成的字典
+        :param songs: 歌单中的全部歌曲
+        """
+        identities = {tuple(identity) for identity in snapshot.get('songs', [])}
+        self._inverted = bool(snapshot.get('inverted'))
+        self._exceptions = {song_key(song) for song in songs if song_identity(song) in identities} if identities else set()
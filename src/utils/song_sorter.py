@@ -0,0 +1,165 @@
+"""
+歌曲排序
+
+每个排序键的取值只在第一次使用时计算一次（文本忽略大小写和重音符号），
+并缓存按该键升序排列的歌曲序号；降序直接反转缓存的顺序，
+之后切换排序键或排序方向都只需要线性时间。
+多个排序键（例如 艺术家 → 专辑 → 曲目号）从最后一个键开始依次做稳定排序，
+每一步都只比较预先计算好的整数名次。
+"""
+from src.utils.search_index import normalize_text
+
+SORT_KEYS = ('order', 'name', 'artist', 'album', 'release_date', 'popularity', 'duration', 'added_at')
+
+# 只作为次要排序键使用的键
+TIEBREAKER_KEYS = ('track_number',)
+
+# 未指定次要排序键时，主键相同的歌曲按这些键继续排序，最后保持原始顺序
+DEFAULT_TIEBREAKERS = {
+    'name': ('artist',),
+    'artist': ('album', 'track_number'),
+    'album': ('track_number',),
+    'release_date': ('album', 'track_number'),
+    'popularity': ('name',),
+}
+
+
+def sort_chain(primary, secondary=None):
+    """
+    生成完整的排序键序列
+    :param primary: 主排序键
+    :param secondary: 次要排序键，为None时使用默认的次要排序键
+    :return: 排序键元组
+    """
+    if primary not in SORT_KEYS or primary == 'order':
+        return ('order',)
+    if secondary and secondary != primary and secondary in SORT_KEYS:
+        if secondary == 'order':
+            return (primary,)
+        return (primary, secondary) + tuple(k for k in DEFAULT_TIEBREAKERS.get(secondary, ()) if k != primary)
+    return (primary,) + DEFAULT_TIEBREAKERS.get(primary, ())
+
+
+def _text_key(text):
+    """文本排序键：先按规范化后的文本，再按原文区分大小写和重音"""
+    text = text or ''
+    return normalize_text(text), text
+
+
+def _sort_value(song, index, key):
+    """
+    计算一首歌在某个排序键下的取值
+    :param song: 歌曲数据
+    :param index: 歌曲在歌单中的位置
+    :param key: 排序键
+    :return: 可比较的值
+    """
+    track = song.get('track') or {}
+    if key == 'name':
+        return _text_key(track.get('name'))
+    if key == 'artist':
+        artists = track.get('artists') or []
+        return _text_key(artists[0].get('name') if artists else '')
+    if key == 'album':
+        return _text_key((track.get('album') or {}).get('name'))
+    if key == 'release_date':
+        # 发行日期可能只有年份或年月，字符串比较即可
+        return (track.get('album') or {}).get('release_date') or ''
+    if key == 'popularity':
+        return track.get('popularity') or 0
+    if key == 'track_number':
+        return track.get('disc_number') or 1, track.get('track_number') or 0
+    if key == 'duration':
+        return track.get('duration_ms') or 0
+    if key == 'added_at':
+        return song.get('added_at') or ''
+    return index
+
+
+class SongSorter:
+    """按排序键缓存歌曲顺序"""
+
+    def __init__(self, songs):
+        """
+        :param songs: 按歌单顺序排列的歌曲列表
+        """
+        self.songs = songs
+        self._columns = {}  # 排序键 -> 每首歌的取值
+        self._ranks = {}  # 排序键 -> 每首歌的名次（取值相同则名次相同）
+        self._orders = {}  # 排序键元组 -> 升序排列的歌曲序号
+
+    def column(self, key):
+        """
+        获取排序键的取值列，第一次使用时计算
+        :param key: 排序键
+        :return: 与歌曲列表一一对应的取值列表
+        """
+        column = self._columns.get(key)
+        if column is None:
+            column = [_sort_value(song, i, key) for i, song in enumerate(self.songs)]
+            self._columns[key] = column
+        return column
+
+    def rank(self, key):
+        """
+        获取排序键的名次列，用整数比较代替文本比较
+        :param key: 排序键
+        :return: 与歌曲列表一一对应的名次列表
+        """
+        ranks = self._ranks.get(key)
+        if ranks is None:
+            column = self.column(key)
+            ranks = [0] * len(column)
+            current = 0
+            previous = None
+            for position, index in enumerate(self._ascending((key,))):
+                value = column[index]
+                if position and value != previous:
+                    current += 1
+                ranks[index] = current
+                previous = value
+            self._ranks[key] = ranks
+        return ranks
+
+    def _ascending(self, keys):
+        """按排序键元组升序排列的歌曲序号（缓存）"""
+        keys = tuple(k for k in keys if (k in SORT_KEYS or k in TIEBREAKER_KEYS) and k != 'order')
+        if not keys:
+            return range(len(self.songs))
+
+        ascending = self._orders.get(keys)
+        if ascending is None:
+            if len(keys) == 1:
+                # sorted 是稳定排序，取值相同的歌曲保持原始顺序
+                ascending = sorted(range(len(self.songs)), key=self.column(keys[0]).__getitem__)
+            else:
+                # 从最后一个键开始依次稳定排序，前面的键优先
+                ascending = list(self._ascending(keys[1:]))
+                ascending.sort(key=self.rank(keys[0]).__getitem__)
+            self._orders[keys] = ascending
+        return ascending
+
+    def order(self, keys, reverse=False):
+        """
+        获取按排序键排列的歌曲序号
+        :param keys: 排序键或排序键元组（前面的键优先），未知的键被忽略
+        :param reverse: 是否降序
+        :return: 歌曲序号序列
+        """
+        if isinstance(keys, str):
+            keys = (keys,)
+        ascending = self._ascending(keys)
+        return ascending[::-1] if reverse else ascending
+
+    def sort_indices(self, indices, keys, reverse=False):
+        """
+        按排序键排列部分歌曲（例如搜索结果）
+        :param indices: 歌曲序号列表
+        :param keys: 排序键或排序键元组
+        :param reverse: 是否降序
+        :return: 排好序的歌曲序号列表
+        """
+        wanted = set(indices)
+        if len(wanted) == len(self.songs):
+            return list(self.order(keys, reverse))
+        return [i for i in self.order(keys, reverse) if i in wanted]
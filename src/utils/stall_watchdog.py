@@ -0,0 +1,148 @@
+"""
+界面卡顿监视
+
+主线程的定时器按固定间隔记录心跳，并把每次心跳的延迟计入直方图；
+辅助线程检查心跳是否按时到达，事件循环被阻塞超过阈值时，
+把主线程当时的调用栈写入日志，可以直接看到是哪段同步代码卡住了界面。
+默认关闭，通过设置项 `stall_watchdog` 开启，阈值为 `stall_threshold_ms`。
+"""
+import sys
+import time
+import threading
+import traceback
+
+from PyQt5.QtCore import QObject, QTimer, Qt
+
+from src.utils.logger import logger
+
+# 卡顿直方图各区间的上限（毫秒），超过最后一个上限的计入最后一个区间
+STALL_BUCKETS = (100, 250, 500, 1000, 2000, 5000)
+
+
+class StallWatchdog(QObject):
+    """事件循环卡顿监视器，需要在主线程中创建"""
+
+    HEARTBEAT_MS = 50  # 主线程心跳间隔
+    MIN_STALL_MS = 50  # 心跳延迟超过多少才算一次卡顿并计入直方图
+
+    def __init__(self, threshold_ms=200, parent=None):
+        """
+        :param threshold_ms: 卡顿超过多少毫秒时记录主线程调用栈
+        :param parent: 父对象
+        """
+        super().__init__(parent)
+        self.threshold = threshold_ms / 1000.0
+        self._main_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._histogram = [0] * (len(STALL_BUCKETS) + 1)
+        self._stalls = 0
+        self._max_stall = 0.0
+        self._beats = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+        self._timer = QTimer(self)
+        self._timer.setTimerType(Qt.PreciseTimer)
+        self._timer.setInterval(self.HEARTBEAT_MS)
+        self._timer.timeout.connect(self._beat)
+
+    def start(self):
+        """开始监视"""
+        if self._thread is not None:
+            return
+        self._last_beat = time.monotonic()
+        self._stop.clear()
+        self._timer.start()
+        self._thread = threading.Thread(target=self._watch, name='StallWatchdog', daemon=True)
+        self._thread.start()
+        logger.info(f"界面卡顿监视已开启，阈值{self.threshold * 1000:.0f}ms")
+
+    def stop(self):
+        """停止监视，并把卡顿统计写入日志"""
+        if self._thread is None:
+            return
+        self._timer.stop()
+        self._stop.set()
+        self._thread.join(1.0)
+        self._thread = None
+        logger.info(f"界面卡顿统计: {self.format_stats()}")
+
+    def is_running(self):
+        """是否正在监视"""
+        return self._thread is not None
+
+    def stats(self):
+        """
+        获取卡顿统计
+        :return: 字典，包含 heartbeats、stalls、max_ms 和 histogram（[(区间上限毫秒, 次数)]，最后一个区间上限为None）
+        """
+        with self._lock:
+            bounds = list(STALL_BUCKETS) + [None]
+            return {
+                'heartbeats': self._beats,
+                'stalls': self._stalls,
+                'max_ms': self._max_stall * 1000,
+                'histogram': list(zip(bounds, self._histogram)),
+            }
+
+    def format_stats(self):
+        """卡顿统计的单行文字，用于日志和诊断信息"""
+        stats = self.stats()
+        buckets = []
+        lower = self.MIN_STALL_MS
+        for upper, count in stats['histogram']:
+            label = f"{lower}-{upper}ms" if upper is not None else f">{lower}ms"
+            buckets.append(f"{label}: {count}")
+            lower = upper
+        return f"心跳{stats['heartbeats']}次，卡顿{stats['stalls']}次，最长{stats['max_ms']:.0f}ms（{', '.join(buckets)}）"
+
+    def _beat(self):
+        """主线程心跳，记录距离上一次心跳的延迟"""
+        now = time.monotonic()
+        delay = now - self._last_beat - self.HEARTBEAT_MS / 1000.0
+        self._last_beat = now
+        with self._lock:
+            self._beats += 1
+            if delay * 1000 < self.MIN_STALL_MS:
+                return
+            self._stalls += 1
+            self._max_stall = max(self._max_stall, delay)
+            for i, upper in enumerate(STALL_BUCKETS):
+                if delay * 1000 <= upper:
+                    self._histogram[i] += 1
+                    break
+            else:
+                self._histogram[-1] += 1
+        if delay >= self.threshold:
+            logger.warning(f"界面卡顿已恢复，持续{delay * 1000:.0f}ms")
+
+    def _watch(self):
+        """辅助线程：心跳超时时记录主线程的调用栈，每次卡顿只记录一次"""
+        poll = max(0.02, self.threshold / 4)
+        reported_beat = None
+        while not self._stop.wait(poll):
+            beat = self._last_beat
+            late = time.monotonic() - beat - self.HEARTBEAT_MS / 1000.0
+            if late < self.threshold or beat == reported_beat:
+                continue
+            reported_beat = beat
+
+            frame = sys._current_frames().get(self._main_thread_id)
+            stack = ''.join(traceback.format_stack(frame)) if frame is not None else '（无法获取调用栈）'
+            logger.warning(f"界面卡顿超过{late * 1000:.0f}ms，主线程调用栈:\n{stack}")
+
+
+_watchdog = None
+
+
+def get_stall_watchdog():
+    """
+    获取全局的卡顿监视器，第一次调用时按设置创建（需要在主线程中调用）
+    :return: StallWatchdog
+    """
+    global _watchdog
+    if _watchdog is None:
+        from src.config import settings
+        _watchdog = StallWatchdog(settings.get_setting('stall_threshold_ms', 200))
+    return _watchdog
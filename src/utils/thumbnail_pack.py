@@ -0,0 +1,539 @@
+"""
+缩略图打包存储
+
+将大量小图片追加写入同一个数据文件，读取时通过内存映射直接切片，
+并用偏移索引按图片键定位，避免每张图片一次 open/stat/close。
+
+打开时对同名的 .lock 文件加进程间排他锁，主程序和缓存维护工具不会同时写入；
+拿不到锁的进程以只读方式打开，不追加、不压缩，也不改写索引。
+"""
+import os
+import atexit
+import json
+import mmap
+import struct
+import threading
+import time
+import logging
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+logger = logging.getLogger(__name__)
+
+# 记录头: 魔数(4) + 键长度(2) + 数据长度(4) + 写入时间戳(8)
+RECORD_MAGIC = b'TPK1'
+RECORD_HEADER = struct.Struct('<4sHId')
+
+
+def _try_lock_file(handle):
+    """
+    对打开的锁文件加非阻塞的排他锁，进程退出时由系统自动释放
+    :param handle: 锁文件对象
+    :return: 是否加锁成功
+    """
+    try:
+        if fcntl is not None:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            handle.seek(0)
+            msvcrt.locking(handle.fileno(), msvcrt.LK_NBLCK, 1)
+        return True
+    except OSError:
+        return False
+
+
+def _unlock_file(handle):
+    """释放锁文件上的锁"""
+    try:
+        if fcntl is not None:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+        else:
+            handle.seek(0)
+            msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+    except OSError:
+        pass
+
+
+class ThumbnailPack:
+    """追加写入、内存映射读取的缩略图打包存储"""
+
+    INDEX_VERSION = 1
+
+    # 按数据文件路径共享的实例，同一个文件只能有一个写入者
+    _shared = {}
+    _shared_lock = threading.Lock()
+
+    @classmethod
+    def shared(cls, data_file):
+        """
+        获取指定数据文件的共享实例，程序退出时自动写回索引
+        :param data_file: 数据文件路径
+        :return: ThumbnailPack实例
+        """
+        path = os.path.abspath(data_file)
+        with cls._shared_lock:
+            pack = cls._shared.get(path)
+            if pack is None:
+                pack = cls(path)
+                cls._shared[path] = pack
+                atexit.register(pack.close)
+            return pack
+
+    def __init__(self, data_file, compact_ratio=0.5, compact_min_bytes=4 * 1024 * 1024, flush_every=64):
+        """
+        :param data_file: 数据文件路径，索引文件和锁文件为同名的 .idx 和 .lock 文件
+        :param compact_ratio: 失效数据占比超过该值时允许压缩
+        :param compact_min_bytes: 失效数据至少达到该字节数时才压缩
+        :param flush_every: 每追加多少条记录写一次索引文件
+        """
+        self.data_file = data_file
+        self.index_file = data_file + '.idx'
+        self.lock_file = data_file + '.lock'
+        self.compact_ratio = compact_ratio
+        self.compact_min_bytes = compact_min_bytes
+        self.flush_every = flush_every
+
+        self._lock = threading.RLock()
+        self._index = {}  # key -> (数据偏移, 数据长度, 时间戳)
+        self._data_size = 0
+        self._live_bytes = 0
+        self._dirty = 0
+        self._writer = None
+        self._reader = None
+        self._mm = None
+        self._lock_handle = None  # 持有进程间锁的锁文件，只读打开时为None
+
+        os.makedirs(os.path.dirname(self.data_file), exist_ok=True)
+        self._open()
+
+    # ---------- 打开与索引 ----------
+
+    @property
+    def read_only(self):
+        """其他进程持有锁时以只读方式打开"""
+        return self._lock_handle is None
+
+    def _acquire_lock(self):
+        """
+        获取进程间排他锁
+        :return: 是否获取成功
+        """
+        handle = open(self.lock_file, 'a+b')
+        if _try_lock_file(handle):
+            self._lock_handle = handle
+            return True
+        handle.close()
+        return False
+
+    def _release_lock(self):
+        """释放进程间排他锁"""
+        if self._lock_handle is not None:
+            _unlock_file(self._lock_handle)
+            self._lock_handle.close()
+            self._lock_handle = None
+
+    def _open(self):
+        """打开数据文件并加载索引，索引落后时从数据文件尾部补扫"""
+        if not self._acquire_lock():
+            logger.warning(f"缩略图存储正被其他进程使用，以只读方式打开: {self.data_file}")
+
+        if not os.path.exists(self.data_file):
+            if self.read_only:
+                self._index = {}
+                self._live_bytes = 0
+                return
+            open(self.data_file, 'wb').close()
+
+        self._data_size = os.path.getsize(self.data_file)
+        scan_from = self._load_index()
+        if scan_from < self._data_size:
+            if self.read_only:
+                # 其他进程可能正在追加，只使用索引已覆盖的部分
+                self._data_size = scan_from
+            else:
+                logger.info(f"缩略图索引落后于数据文件，从偏移 {scan_from} 开始重建")
+                self._scan_records(scan_from)
+                self._save_index()
+
+        if not self.read_only:
+            self._writer = open(self.data_file, 'ab')
+
+    def _load_index(self):
+        """
+        加载索引文件
+        :return: 索引覆盖到的数据偏移，之后的部分需要扫描补齐
+        """
+        self._index = {}
+        self._live_bytes = 0
+        try:
+            if not os.path.exists(self.index_file):
+                return 0
+
+            with open(self.index_file, 'r', encoding='utf-8') as f:
+                index_data = json.load(f)
+
+            covered = index_data.get('data_size', 0)
+            if index_data.get('version') != self.INDEX_VERSION or covered > self._data_size:
+                return 0
+
+            for key, (offset, length, timestamp) in index_data.get('entries', {}).items():
+                if offset + length > covered:
+                    return 0
+                self._put_index(key, offset, length, timestamp)
+            return covered
+
+        except Exception as e:
+            logger.error(f"读取缩略图索引失败，将重新扫描数据文件: {str(e)}")
+            self._index = {}
+            self._live_bytes = 0
+            return 0
+
+    def _scan_records(self, start):
+        """
+        从指定偏移开始顺序扫描记录，补齐索引
+        :param start: 起始偏移
+        :return: 最后一条完整记录结束的偏移
+        """
+        if start == 0:
+            self._index = {}
+            self._live_bytes = 0
+
+        end = start
+        with open(self.data_file, 'rb') as f:
+            f.seek(start)
+            while True:
+                header = f.read(RECORD_HEADER.size)
+                if len(header) < RECORD_HEADER.size:
+                    break
+                magic, key_len, data_len, timestamp = RECORD_HEADER.unpack(header)
+                if magic != RECORD_MAGIC:
+                    logger.warning(f"缩略图数据文件在偏移 {end} 处损坏，忽略之后的内容")
+                    break
+                key = f.read(key_len)
+                data_offset = end + RECORD_HEADER.size + key_len
+                if len(key) < key_len or data_offset + data_len > self._data_size:
+                    logger.warning(f"缩略图数据文件末尾记录不完整，偏移 {end}")
+                    break
+                f.seek(data_len, os.SEEK_CUR)
+                self._put_index(key.decode('utf-8'), data_offset, data_len, timestamp)
+                end = data_offset + data_len
+
+        # 截掉尾部的不完整记录，保证之后追加的记录可被顺序扫描
+        if end < self._data_size:
+            with open(self.data_file, 'r+b') as f:
+                f.truncate(end)
+            self._data_size = end
+        return end
+
+    @staticmethod
+    def _record_size(key, length):
+        """一条记录在数据文件中占用的字节数"""
+        return RECORD_HEADER.size + len(key.encode('utf-8')) + length
+
+    def _put_index(self, key, offset, length, timestamp):
+        """更新索引条目并维护有效记录字节数"""
+        old = self._index.get(key)
+        if old:
+            self._live_bytes -= self._record_size(key, old[1])
+        self._index[key] = (offset, length, timestamp)
+        self._live_bytes += self._record_size(key, length)
+
+    def _save_index(self):
+        """将索引写入磁盘（先写临时文件再替换）"""
+        index_data = {
+            'version': self.INDEX_VERSION,
+            'data_size': self._data_size,
+            'entries': {key: list(entry) for key, entry in self._index.items()}
+        }
+        tmp_file = self.index_file + '.tmp'
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(index_data, f, separators=(',', ':'))
+        os.replace(tmp_file, self.index_file)
+        self._dirty = 0
+
+    # ---------- 内存映射 ----------
+
+    def _close_map(self):
+        """关闭内存映射"""
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
+
+    def _ensure_mapped(self, end):
+        """
+        确保映射覆盖到指定偏移，追加写入后按需重新映射
+        :param end: 需要读取到的偏移
+        :return: 是否映射成功
+        """
+        if self._mm is not None and len(self._mm) >= end:
+            return True
+
+        self._close_map()
+        if self._writer is not None:
+            self._writer.flush()
+        if self._data_size == 0:
+            return False
+
+        self._reader = open(self.data_file, 'rb')
+        self._mm = mmap.mmap(self._reader.fileno(), 0, access=mmap.ACCESS_READ)
+        return len(self._mm) >= end
+
+    # ---------- 读写接口 ----------
+
+    def get(self, key, max_age=None):
+        """
+        读取图片数据
+        :param key: 图片键
+        :param max_age: 最长有效期（秒），超过则视为不存在
+        :return: 图片字节数据，不存在或过期返回None
+        """
+        with self._lock:
+            entry = self._index.get(key)
+            if not entry:
+                return None
+            offset, length, timestamp = entry
+            if max_age is not None and time.time() - timestamp > max_age:
+                return None
+            if not self._ensure_mapped(offset + length):
+                return None
+            return self._mm[offset:offset + length]
+
+    def get_timestamp(self, key):
+        """
+        获取条目写入时间
+        :param key: 图片键
+        :return: 时间戳（秒），不存在返回None
+        """
+        with self._lock:
+            entry = self._index.get(key)
+            return entry[2] if entry else None
+
+    def put(self, key, data):
+        """
+        追加写入图片数据，同键的旧数据变为失效数据
+        :param key: 图片键
+        :param data: 图片字节数据
+        """
+        key_bytes = key.encode('utf-8')
+        timestamp = time.time()
+        header = RECORD_HEADER.pack(RECORD_MAGIC, len(key_bytes), len(data), timestamp)
+
+        with self._lock:
+            if self._writer is None:
+                return
+            record_offset = self._data_size
+            self._writer.write(header)
+            self._writer.write(key_bytes)
+            self._writer.write(data)
+            data_offset = record_offset + RECORD_HEADER.size + len(key_bytes)
+            self._data_size = data_offset + len(data)
+            self._put_index(key, data_offset, len(data), timestamp)
+
+            self._dirty += 1
+            if self._dirty >= self.flush_every:
+                self.flush()
+
+    def remove(self, key):
+        """
+        删除条目（数据在下次压缩时回收）
+        :param key: 图片键
+        """
+        with self._lock:
+            entry = self._index.pop(key, None)
+            if entry:
+                self._live_bytes -= self._record_size(key, entry[1])
+                self._dirty += 1
+
+    def remove_expired(self, max_age):
+        """
+        删除过期条目
+        :param max_age: 最长有效期（秒）
+        :return: 删除的条目数
+        """
+        now = time.time()
+        with self._lock:
+            expired = [key for key, entry in self._index.items() if now - entry[2] > max_age]
+            for key in expired:
+                self.remove(key)
+            return len(expired)
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._index
+
+    def __len__(self):
+        with self._lock:
+            return len(self._index)
+
+    def keys(self):
+        """获取所有条目键的快照"""
+        with self._lock:
+            return list(self._index.keys())
+
+    def stats(self):
+        """
+        获取存储统计信息
+        :return: 包含条目数、数据文件大小、有效和失效记录字节数的字典
+        """
+        with self._lock:
+            return {
+                'entries': len(self._index),
+                'data_bytes': self._data_size,
+                'live_bytes': self._live_bytes,
+                'dead_bytes': self._dead_bytes()
+            }
+
+    def _dead_bytes(self):
+        """被覆盖或删除的记录占用的字节数"""
+        return self._data_size - self._live_bytes
+
+    def flush(self):
+        """把缓冲区和索引写入磁盘"""
+        with self._lock:
+            if self._writer is None:
+                return
+            self._writer.flush()
+            if self._dirty:
+                self._save_index()
+
+    # ---------- 校验 ----------
+
+    def verify(self, validator=None):
+        """
+        校验索引中的每个条目：范围、记录头、键以及可选的数据校验
+        :param validator: 可选的回调，接收图片字节数据，返回数据是否有效
+        :return: 损坏条目的键列表
+        """
+        corrupt = []
+        with self._lock:
+            if self._index:
+                self._ensure_mapped(self._data_size)
+
+            for key, (offset, length, timestamp) in self._index.items():
+                key_bytes = key.encode('utf-8')
+                record_offset = offset - len(key_bytes) - RECORD_HEADER.size
+                if record_offset < 0 or offset + length > self._data_size or self._mm is None:
+                    corrupt.append(key)
+                    continue
+
+                magic, key_len, data_len, _ = RECORD_HEADER.unpack_from(self._mm, record_offset)
+                stored_key = self._mm[record_offset + RECORD_HEADER.size:offset]
+                if magic != RECORD_MAGIC or key_len != len(key_bytes) or \
+                        data_len != length or stored_key != key_bytes:
+                    corrupt.append(key)
+                    continue
+
+                if validator and not validator(self._mm[offset:offset + length]):
+                    corrupt.append(key)
+
+        return corrupt
+
+    def rebuild_index(self):
+        """
+        丢弃现有索引，从数据文件头开始重新扫描生成
+        :return: 重建后的条目数
+        """
+        with self._lock:
+            if self._writer is None:
+                return len(self._index)
+            self._close_map()
+            self._writer.close()
+            self._data_size = os.path.getsize(self.data_file)
+            self._scan_records(0)
+            self._save_index()
+            self._writer = open(self.data_file, 'ab')
+            return len(self._index)
+
+    # ---------- 压缩 ----------
+
+    def should_compact(self):
+        """检查失效数据是否多到需要压缩"""
+        with self._lock:
+            dead = self._dead_bytes()
+            if self._writer is None or dead < self.compact_min_bytes or self._data_size == 0:
+                return False
+            return dead / self._data_size >= self.compact_ratio
+
+    def maybe_compact(self):
+        """
+        失效数据达到阈值时执行压缩
+        :return: 是否执行了压缩
+        """
+        if self.should_compact():
+            self.compact()
+            return True
+        return False
+
+    def compact(self):
+        """重写数据文件，只保留有效条目"""
+        with self._lock:
+            if self._writer is None:
+                return
+            before = self._data_size
+            tmp_file = self.data_file + '.tmp'
+            new_index = {}
+
+            self._ensure_mapped(self._data_size)
+            with open(tmp_file, 'wb') as out:
+                position = 0
+                for key, (offset, length, timestamp) in sorted(self._index.items(), key=lambda item: item[1][0]):
+                    key_bytes = key.encode('utf-8')
+                    out.write(RECORD_HEADER.pack(RECORD_MAGIC, len(key_bytes), length, timestamp))
+                    out.write(key_bytes)
+                    out.write(self._mm[offset:offset + length])
+                    data_offset = position + RECORD_HEADER.size + len(key_bytes)
+                    new_index[key] = (data_offset, length, timestamp)
+                    position = data_offset + length
+                out.flush()
+                os.fsync(out.fileno())
+
+            # Windows下被映射或打开的文件不能被替换，先全部关闭
+            self._close_map()
+            self._writer.close()
+            os.replace(tmp_file, self.data_file)
+            self._writer = open(self.data_file, 'ab')
+
+            self._index = new_index
+            self._data_size = position
+            self._live_bytes = position
+            self._save_index()
+            logger.info(f"缩略图存储压缩完成: {before} -> {self._data_size} 字节")
+
+    def clear(self):
+        """清空所有条目和数据文件"""
+        with self._lock:
+            if self._writer is None:
+                return
+            self._close_map()
+            self._writer.close()
+            open(self.data_file, 'wb').close()
+            self._writer = open(self.data_file, 'ab')
+            self._index = {}
+            self._data_size = 0
+            self._live_bytes = 0
+            self._save_index()
+
+    def reopen(self):
+        """关闭后重新打开数据文件和索引（数据文件被外部替换后使用）"""
+        with self._lock:
+            self.close()
+            self._data_size = 0
+            self._dirty = 0
+            self._open()
+
+    def close(self):
+        """写回索引并释放文件句柄、内存映射和进程间锁"""
+        with self._lock:
+            if self._writer is not None:
+                self.flush()
+                self._writer.close()
+                self._writer = None
+            self._close_map()
+            self._release_lock()
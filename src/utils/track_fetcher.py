@@ -0,0 +1,86 @@
+"""
+歌单歌曲获取
+
+从API分页获取歌单的全部歌曲，并记录正在从API加载的歌单。
+歌单页面、悬停预取和缓存预热共用同一个登记表：同一歌单正在加载时，
+其他线程等它写入缓存后直接读取，不会重复请求，也不会同时写同一个缓存文件。
+"""
+import threading
+
+from src.utils.logger import logger
+
+# 正在从API加载的歌单
+_inflight = {}  # 歌单ID -> threading.Event
+_inflight_lock = threading.Lock()
+
+
+def fetch_tracks(sp, playlist_id, is_cancelled=None, on_page=None):
+    """
+    从API分页获取播放列表的全部歌曲
+    :param sp: Spotify客户端
+    :param playlist_id: 歌单ID
+    :param is_cancelled: 可选的回调，返回True时在翻页之间停止
+    :param on_page: 可选的回调，每获取一页后以该页的歌曲列表调用
+    :return: 歌曲列表（带原始索引），取消时返回None
+    """
+    tracks = []
+    results = sp.playlist_tracks(playlist_id)
+
+    # 添加原始索引
+    for i, item in enumerate(results['items']):
+        item['original_index'] = i + 1
+        tracks.append(item)
+    if on_page:
+        on_page(results['items'])
+
+    while results['next']:
+        if is_cancelled and is_cancelled():
+            return None
+        logger.info(f"加载更多播放列表歌曲，当前已加载: {len(tracks)}首")
+        results = sp.next(results)
+        for i, item in enumerate(results['items'], len(tracks) + 1):
+            item['original_index'] = i
+            tracks.append(item)
+        if on_page:
+            on_page(results['items'])
+
+    return tracks
+
+
+def claim_or_wait(playlist_id):
+    """
+    在同一次加锁中检查并登记歌单的加载，两个线程不会同时认为自己负责加载
+    :param playlist_id: 歌单ID
+    :return: (是否由调用方负责加载, 完成事件)；负责加载时，结束后必须调用 release_fetch
+    """
+    with _inflight_lock:
+        done = _inflight.get(playlist_id)
+        if done is not None:
+            return False, done
+        done = _inflight[playlist_id] = threading.Event()
+        return True, done
+
+
+def release_fetch(playlist_id, done):
+    """
+    注销 claim_or_wait 登记的加载并唤醒等待的线程
+    :param playlist_id: 歌单ID
+    :param done: claim_or_wait 返回的完成事件
+    """
+    with _inflight_lock:
+        if _inflight.get(playlist_id) is done:
+            del _inflight[playlist_id]
+    done.set()
+
+
+def wait_for_fetch(done, is_cancelled=None):
+    """
+    等待其他线程的加载完成
+    :param done: claim_or_wait 返回的完成事件
+    :param is_cancelled: 可选的回调，返回True时停止等待
+    :return: 加载完成返回True，等待期间被取消返回False
+    """
+    while not done.wait(0.1):
+        if is_cancelled and is_cancelled():
+            return False
+    return not (is_cancelled and is_cancelled())
@@ -0,0 +1,98 @@
+"""
+歌单页面的视图状态
+
+记录每个歌单离开时的滚动锚点（视口顶部歌曲的身份和偏移）、搜索文本、排序设置、
+导出模式和勾选，重新打开时恢复到离开时的位置，不需要从列表顶部重新生成。
+状态保存在 config/view_state.json 中，只保留最近使用的若干个歌单。
+"""
+import os
+import json
+import time
+
+from src.config.settings import BASE_DIR
+from src.utils.logger import logger
+
+VIEW_STATE_PATH = os.path.join(BASE_DIR, 'config', 'view_state.json')
+
+
+class ViewStateStore:
+    """按歌单ID保存视图状态，第一次读取时加载文件，每次保存时写回"""
+
+    MAX_PLAYLISTS = 100  # 最多保留的歌单数量，超过时丢弃最久未使用的
+
+    def __init__(self, path=VIEW_STATE_PATH):
+        """
+        :param path: 状态文件路径
+        """
+        self.path = path
+        self._states = None
+
+    def get(self, playlist_id):
+        """
+        获取歌单的视图状态
+        :param playlist_id: 歌单ID
+        :return: 状态字典，没有记录时返回None
+        """
+        return self._load().get(playlist_id)
+
+    def save(self, playlist_id, state):
+        """
+        保存歌单的视图状态并写入文件
+        :param playlist_id: 歌单ID
+        :param state: 可以保存为JSON的状态字典
+        """
+        states = self._load()
+        states.pop(playlist_id, None)
+        states[playlist_id] = dict(state, saved_at=time.time())
+        # 字典保持插入顺序，最久未保存的在最前
+        while len(states) > self.MAX_PLAYLISTS:
+            del states[next(iter(states))]
+        self._write(states)
+
+    def discard(self, playlist_id):
+        """
+        删除歌单的视图状态
+        :param playlist_id: 歌单ID
+        """
+        if self._load().pop(playlist_id, None) is not None:
+            self._write(self._states)
+
+    def _load(self):
+        """读取状态文件，文件不存在或损坏时从空状态开始"""
+        if self._states is None:
+            self._states = {}
+            try:
+                if os.path.exists(self.path):
+                    with open(self.path, 'r', encoding='utf-8') as f:
+                        states = json.load(f)
+                    if isinstance(states, dict):
+                        # 按保存时间排序，保证淘汰顺序正确
+                        self._states = dict(sorted(states.items(), key=lambda item: item[1].get('saved_at', 0)))
+            except Exception as e:
+                logger.error(f"读取视图状态失败: {str(e)}")
+        return self._states
+
+    def _write(self, states):
+        """先写临时文件再替换，避免写到一半退出时损坏状态文件"""
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            temp_path = self.path + '.tmp'
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(states, f, ensure_ascii=False)
+            os.replace(temp_path, self.path)
+        except Exception as e:
+            logger.error(f"保存视图状态失败: {str(e)}")
+
+
+_store = None
+
+
+def get_view_state_store():
+    """
+    获取全局的视图状态存储
+    :return: ViewStateStore
+    """
+    global _store
+    if _store is None:
+        _store = ViewStateStore()
+    return _store
@@ -0,0 +1,106 @@
+"""
+缓存快照导出和导入的测试
+"""
+import io
+import json
+import os
+import shutil
+import tarfile
+import tempfile
+import unittest
+import hashlib
+
+from src.utils.cache_manager import CacheManager
+from src.utils.cache_snapshot import (export_snapshot, import_snapshot, SnapshotError,
+                                      MANIFEST_NAME, SNAPSHOT_FORMAT, SNAPSHOT_VERSION)
+
+
+def write_snapshot(path, files, manifest_files=None):
+    """
+    手工写一个快照文件
+    :param files: 相对路径 -> 文件内容
+    :param manifest_files: 清单中的条目，默认按文件内容生成
+    """
+    if manifest_files is None:
+        manifest_files = {name: {'size': len(data), 'sha256': hashlib.sha256(data).hexdigest()}
+                          for name, data in files.items()}
+    manifest = json.dumps({'format': SNAPSHOT_FORMAT, 'version': SNAPSHOT_VERSION,
+                           'created': 0, 'files': manifest_files}).encode('utf-8')
+    with tarfile.open(path, 'w:gz') as tar:
+        for name, data in [(MANIFEST_NAME, manifest)] + list(files.items()):
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+
+
+class CacheSnapshotTest(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_dir, True)
+        self.snapshot = os.path.join(self.temp_dir, 'snapshot.tar.gz')
+
+    def make_cache(self, name):
+        cache_manager = CacheManager(os.path.join(self.temp_dir, name))
+        self.addCleanup(cache_manager.track_cover_pack.close)
+        return cache_manager
+
+    def test_round_trip(self):
+        source = self.make_cache('source')
+        source.cache_tracks('p1', [{'track': {'id': 't1'}, 'original_index': 1}])
+        source.track_cover_pack.put('cover', b'png-bytes')
+
+        count, total = export_snapshot(source, self.snapshot)
+        self.assertGreater(count, 0)
+        self.assertGreater(total, 0)
+
+        target = self.make_cache('target')
+        target.cache_tracks('old', [{'track': {'id': 'x'}}])
+        self.assertEqual(import_snapshot(target, self.snapshot), (count, total))
+        self.assertEqual(target.get_cached_tracks('p1')[0]['track']['id'], 't1')
+        self.assertIsNone(target.get_cached_tracks('old'))
+        self.assertEqual(target.track_cover_pack.get('cover'), b'png-bytes')
+        self.assertFalse(target.track_cover_pack.read_only)
+
+    def test_export_skips_lock_file(self):
+        source = self.make_cache('source')
+        source.track_cover_pack.put('cover', b'png-bytes')
+        export_snapshot(source, self.snapshot)
+        with tarfile.open(self.snapshot, 'r:gz') as tar:
+            names = tar.getnames()
+        self.assertIn('images/tracks.pack', names)
+        self.assertFalse(any(name.endswith('.lock') for name in names))
+
+    def assert_rejected(self, message):
+        target = self.make_cache('target')
+        target.cache_tracks('keep', [{'track': {'id': 'k'}}])
+        with self.assertRaises(SnapshotError) as context:
+            import_snapshot(target, self.snapshot)
+        self.assertIn(message, str(context.exception))
+        # 校验失败时现有缓存保持不变，临时目录已清理
+        self.assertIsNotNone(target.get_cached_tracks('keep'))
+        self.assertFalse(os.path.exists(target.cache_dir + '.import'))
+
+    def test_rejects_tampered_hash(self):
+        write_snapshot(self.snapshot, {'playlists.json': b'{}'},
+                       {'playlists.json': {'size': 2, 'sha256': '0' * 64}})
+        self.assert_rejected('文件校验失败')
+
+    def test_rejects_size_mismatch(self):
+        write_snapshot(self.snapshot, {'playlists.json': b'{}'},
+                       {'playlists.json': {'size': 3, 'sha256': hashlib.sha256(b'{}').hexdigest()}})
+        self.assert_rejected('文件大小与清单不符')
+
+    def test_rejects_parent_directory_path(self):
+        write_snapshot(self.snapshot, {'../evil.json': b'{}'})
+        self.assert_rejected('非法路径')
+        self.assertFalse(os.path.exists(os.path.join(self.temp_dir, 'evil.json')))
+
+    def test_rejects_member_outside_manifest(self):
+        write_snapshot(self.snapshot, {'playlists.json': b'{}', 'extra.json': b'{}'},
+                       {'playlists.json': {'size': 2, 'sha256': hashlib.sha256(b'{}').hexdigest()}})
+        self.assert_rejected('清单之外')
+
+
+if __name__ == '__main__':
+    unittest.main()
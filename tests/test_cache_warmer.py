@@ -0,0 +1,106 @@
+"""
+缓存预热优先级和请求预算的测试
+"""
+import time
+import unittest
+from datetime import timedelta
+from unittest import mock
+
+from src.utils.cache_warmer import CacheWarmer, RequestBudget
+
+
+class FakeCacheManager:
+    """只提供优先级计算需要的接口"""
+    tracks_cache_expiry = timedelta(hours=12)
+
+    def __init__(self, usage=None, ages=None):
+        self.usage = usage or {}
+        self.ages = ages or {}
+
+    def get_playlist_usage(self):
+        return self.usage
+
+    def get_tracks_cache_age(self, playlist_id):
+        return self.ages.get(playlist_id)
+
+
+def queue_order(warmer):
+    order = []
+    while True:
+        playlist = warmer._next_playlist()
+        if playlist is None:
+            return order
+        order.append(playlist['id'])
+
+
+class PriorityTest(unittest.TestCase):
+
+    def make_warmer(self, usage=None, ages=None):
+        return CacheWarmer(None, FakeCacheManager(usage, ages), budget=RequestBudget())
+
+    def test_sidebar_position_orders_equal_playlists(self):
+        warmer = self.make_warmer()
+        warmer._build_queue([{'id': 'a'}, {'id': 'b'}, {'id': 'c'}])
+        self.assertEqual(queue_order(warmer), ['a', 'b', 'c'])
+
+    def test_recently_opened_playlist_goes_first(self):
+        warmer = self.make_warmer(usage={'c': time.time() - 60})
+        warmer._build_queue([{'id': 'a'}, {'id': 'b'}, {'id': 'c'}])
+        self.assertEqual(queue_order(warmer)[0], 'c')
+
+    def test_stale_cache_goes_before_fresh_cache(self):
+        warmer = self.make_warmer(ages={'a': 0, 'b': 12 * 3600})
+        warmer._build_queue([{'id': 'a'}, {'id': 'b'}])
+        self.assertEqual(queue_order(warmer), ['b', 'a'])
+
+    def test_recency_decays_with_half_life(self):
+        warmer = self.make_warmer()
+        now = time.time()
+        fresh = warmer._compute_priority('x', 0, 1, now, now)
+        old = warmer._compute_priority('x', 0, 1, now - CacheWarmer.RECENCY_HALF_LIFE * 3600, now)
+        never = warmer._compute_priority('x', 0, 1, None, now)
+        self.assertAlmostEqual(fresh - never, CacheWarmer.RECENCY_WEIGHT)
+        self.assertAlmostEqual(old - never, CacheWarmer.RECENCY_WEIGHT / 2)
+
+    def test_discarded_playlist_skipped_until_rebuild(self):
+        warmer = self.make_warmer()
+        playlists = [{'id': 'a'}, {'id': 'b'}]
+        warmer._build_queue(playlists)
+        warmer.discard('a')
+        self.assertEqual(queue_order(warmer), ['b'])
+        warmer._build_queue(playlists)
+        self.assertEqual(queue_order(warmer), ['a', 'b'])
+
+
+class RequestBudgetTest(unittest.TestCase):
+
+    def setUp(self):
+        self.now = 1000.0
+        patcher = mock.patch('src.utils.cache_warmer.time.monotonic', lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_request_limit_refills_after_window(self):
+        budget = RequestBudget(max_requests=3, window=60)
+        self.assertTrue(budget.try_acquire(2))
+        self.assertTrue(budget.try_acquire())
+        self.assertFalse(budget.try_acquire())
+        self.now += 61
+        self.assertTrue(budget.try_acquire(3))
+
+    def test_byte_limit_refills_after_window(self):
+        budget = RequestBudget(max_requests=100, max_bytes=1000, window=60)
+        self.assertTrue(budget.try_acquire())
+        budget.record_bytes(1000)
+        self.assertFalse(budget.try_acquire())
+        self.now += 61
+        self.assertTrue(budget.try_acquire())
+
+    def test_oversized_task_allowed_when_window_empty(self):
+        budget = RequestBudget(max_requests=2, window=60)
+        self.assertTrue(budget.try_acquire(5))
+        self.assertFalse(budget.try_acquire())
+
+
+if __name__ == '__main__':
+    unittest.main()
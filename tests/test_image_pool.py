@@ -0,0 +1,45 @@
+"""
+图片加载线程池的测试
+"""
+import threading
+import unittest
+
+from PyQt5.QtGui import QImage
+
+from src.utils.image_pool import ImageWorkerPool
+
+
+class ImageWorkerPoolTest(unittest.TestCase):
+
+    def setUp(self):
+        self.release = threading.Event()
+        self.started = []
+        self.lock = threading.Lock()
+
+        def load(url):
+            with self.lock:
+                self.started.append(url)
+            self.release.wait(5)
+            return QImage()
+
+        self.pool = ImageWorkerPool(load, max_workers=4)
+        self.addCleanup(self.release.set)
+        self.addCleanup(self.pool.shutdown)
+
+    def test_reprioritize_starts_workers_for_whole_viewport(self):
+        self.pool.reprioritize({f'url{i}': i for i in range(10)})
+        self.assertEqual(self.pool._workers, 4)
+
+    def test_workers_limited_by_queued_jobs(self):
+        self.pool.reprioritize({'url0': 0, 'url1': 1})
+        self.assertEqual(self.pool._workers, 2)
+
+    def test_cancel_all_drops_queued_jobs(self):
+        self.pool.reprioritize({f'url{i}': i for i in range(10)})
+        cancelled = self.pool.cancel_all()
+        self.assertEqual(len(cancelled), 10)
+        self.release.set()
+
+
+if __name__ == '__main__':
+    unittest.main()
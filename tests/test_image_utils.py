@@ -0,0 +1,55 @@
+"""
+图片工具的测试
+"""
+import os
+import subprocess
+import sys
+import unittest
+
+from src.utils.image_utils import pick_image_url
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMAGES = [
+    {'url': 'large', 'width': 640, 'height': 640},
+    {'url': 'medium', 'width': 300, 'height': 300},
+    {'url': 'small', 'width': 64, 'height': 64},
+]
+
+
+class PickImageUrlTest(unittest.TestCase):
+
+    def test_smallest_image_large_enough(self):
+        self.assertEqual(pick_image_url(IMAGES, 50, 1.0), 'small')
+        self.assertEqual(pick_image_url(IMAGES, 50, 2.0), 'medium')
+        self.assertEqual(pick_image_url(IMAGES, 400, 1.0), 'large')
+
+    def test_largest_image_when_none_is_large_enough(self):
+        self.assertEqual(pick_image_url(IMAGES, 800, 1.0), 'large')
+
+    def test_missing_sizes(self):
+        self.assertEqual(pick_image_url([{'url': 'a', 'width': None, 'height': None}], 50, 1.0), 'a')
+        self.assertEqual(pick_image_url([], 50, 1.0), '')
+
+
+class CoreApplicationTest(unittest.TestCase):
+    """命令行工具只创建 QCoreApplication，缩放比例应回退为1.0"""
+
+    def test_device_pixel_ratio_without_gui_application(self):
+        # 同一进程中只能有一个应用实例，放到子进程中运行
+        code = (
+            "from PyQt5.QtCore import QCoreApplication\n"
+            "app = QCoreApplication([])\n"
+            "from src.utils.image_utils import device_pixel_ratio, pick_image_url, song_cover_url\n"
+            "images = [{'url': 'small', 'width': 64, 'height': 64}]\n"
+            "print(device_pixel_ratio(), pick_image_url(images, 50),\n"
+            "      song_cover_url({'track': {'album': {'images': images}}}))\n"
+        )
+        result = subprocess.run([sys.executable, '-c', code], cwd=PROJECT_DIR,
+                                capture_output=True, text=True, timeout=60)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout.split(), ['1.0', 'small', 'small'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+"""
+歌曲搜索索引的测试
+"""
+import unittest
+
+from src.utils.search_index import SongSearchIndex
+
+
+def make_song(name, artist='Artist', album='Album'):
+    """构造只包含搜索字段的歌曲数据"""
+    return {'track': {'name': name, 'artists': [{'name': artist}], 'album': {'name': album}}}
+
+
+class SongSearchIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        songs = [make_song(f'Song {n}') for n in range(1, 251)]
+        songs += [make_song(f'Part {n}') for n in range(1, 251)]
+        self.songs = songs
+        self.index = SongSearchIndex(songs)
+
+    def titles(self, query):
+        return {self.songs[i]['track']['name'] for i in self.index.search(query)}
+
+    def test_numeric_word_narrows_results(self):
+        titles = self.titles('Song 1')
+        self.assertIn('Song 1', titles)
+        self.assertIn('Song 12', titles)
+        self.assertNotIn('Song 2', titles)
+        self.assertTrue(all(title.startswith('Song') for title in titles))
+        # 1, 10-19, 100-199
+        self.assertEqual(len(titles), 111)
+
+    def test_short_word_must_start_a_word(self):
+        titles = self.titles('Part 2')
+        self.assertIn('Part 2', titles)
+        self.assertIn('Part 25', titles)
+        self.assertNotIn('Part 12', titles)
+        self.assertNotIn('Part 3', titles)
+
+    def test_only_short_words(self):
+        self.assertEqual(self.titles('1 2'), set())
+        index = SongSearchIndex([make_song('A B'), make_song('A C')])
+        self.assertEqual(index.search('a b'), [0])
+
+    def test_short_query_needs_all_grams(self):
+        index = SongSearchIndex([make_song('Lot'), make_song('Love Song')])
+        self.assertEqual(index.search('lov'), [1])
+
+    def test_typo_still_matches_longer_query(self):
+        index = SongSearchIndex([make_song('Bohemian Rhapsody'), make_song('Love of My Life')])
+        self.assertEqual(index.search('bohemain rhapsody'), [0])
+
+
+class SubstringSearchTest(unittest.TestCase):
+
+    def setUp(self):
+        self.index = SongSearchIndex([make_song('Love Song'), make_song('Yesterday'), make_song('Hello'),
+                                      make_song('Help', artist='The Beatles')])
+
+    def test_infix_matches(self):
+        self.assertEqual(self.index.search('ong'), [0])
+        self.assertEqual(self.index.search('llo'), [2])
+        self.assertEqual(self.index.search('ello'), [2])
+        self.assertEqual(self.index.search('day'), [1])
+        self.assertEqual(self.index.search('song'), [0])
+
+    def test_exact_hits_rank_before_fuzzy_hits(self):
+        index = SongSearchIndex([make_song('Love'), make_song('Lovely Day')])
+        # "love" 只共有部分三元组，排在完整包含查询的 "Lovely Day" 之后
+        self.assertEqual(index.search('lovely'), [1, 0])
+
+    def test_appending_characters_narrows(self):
+        self.assertEqual(self.index.search('e'), [0, 1, 2, 3])
+        self.assertEqual(self.index.search('el'), [2, 3])
+        self.assertEqual(self.index.search('ell'), [2])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+"""
+歌曲勾选状态的测试
+"""
+import unittest
+
+from src.utils.song_selection import SongSelection
+
+
+def make_song(position, track_id, added_at='2020'):
+    return {'original_index': position, 'added_at': added_at, 'track': {'id': track_id}}
+
+
+class SongSelectionTest(unittest.TestCase):
+
+    def setUp(self):
+        self.songs = [make_song(i + 1, f't{i}') for i in range(5)]
+        self.selection = SongSelection()
+
+    def selected_ids(self, songs=None):
+        return [song['track']['id'] for song in self.selection.selected(songs or self.songs)]
+
+    def test_select_and_count(self):
+        self.selection.set_selected(self.songs[1], True)
+        self.selection.set_selected(self.songs[3], True)
+        self.assertEqual(self.selected_ids(), ['t1', 't3'])
+        self.assertEqual(self.selection.count(5), 2)
+
+    def test_select_all_then_exceptions(self):
+        self.selection.select_all()
+        self.selection.set_selected(self.songs[0], False)
+        self.assertEqual(self.selection.count(5), 4)
+        self.assertFalse(self.selection.is_selected(self.songs[0]))
+
+    def test_invert_all(self):
+        self.selection.set_selected(self.songs[0], True)
+        self.selection.invert()
+        self.assertEqual(self.selected_ids(), ['t1', 't2', 't3', 't4'])
+        self.selection.invert()
+        self.assertEqual(self.selected_ids(), ['t0'])
+
+    def test_invert_subset(self):
+        self.selection.set_selected(self.songs[0], True)
+        self.selection.invert_songs(self.songs[:2])
+        self.assertEqual(self.selected_ids(), ['t1'])
+
+    def test_selection_kept_across_reordering(self):
+        self.selection.set_songs_selected(self.songs[2:4], True)
+        reordered = list(reversed(self.songs))
+        self.assertEqual(self.selected_ids(reordered), ['t3', 't2'])
+
+    def test_carry_over_follows_identity(self):
+        self.selection.set_selected(self.songs[1], True)
+        self.selection.set_selected(self.songs[4], True)
+        # 刷新后 t0 被删除，其余歌曲位置前移，新增歌曲 t9
+        refreshed = [make_song(i + 1, song['track']['id']) for i, song in enumerate(self.songs[1:])]
+        refreshed.append(make_song(5, 't9'))
+        self.selection.carry_over(self.songs, refreshed)
+        self.assertEqual(self.selected_ids(refreshed), ['t1', 't4'])
+
+    def test_carry_over_after_select_all(self):
+        self.selection.select_all()
+        self.selection.set_selected(self.songs[2], False)
+        refreshed = [make_song(1, 't9')] + [make_song(i + 2, song['track']['id']) for i, song in enumerate(self.songs)]
+        self.selection.carry_over(self.songs, refreshed)
+        # 新增的歌曲保持全选后的默认状态
+        self.assertEqual(self.selected_ids(refreshed), ['t9', 't0', 't1', 't3', 't4'])
+
+    def test_snapshot_restore(self):
+        self.selection.select_all()
+        self.selection.set_selected(self.songs[3], False)
+        snapshot = self.selection.snapshot(self.songs)
+
+        restored = SongSelection()
+        restored.restore(snapshot, list(reversed(self.songs)))
+        self.assertTrue(restored.is_selected(self.songs[0]))
+        self.assertFalse(restored.is_selected(self.songs[3]))
+        self.assertEqual(restored.count(5), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+"""
+歌曲排序的测试
+"""
+import unittest
+
+from src.utils.song_sorter import SongSorter, sort_chain
+
+
+def make_song(name, artist, album='Album', track_number=1, duration=0):
+    return {'track': {'name': name, 'artists': [{'name': artist}], 'album': {'name': album},
+                      'track_number': track_number, 'disc_number': 1, 'duration_ms': duration}}
+
+
+class SortChainTest(unittest.TestCase):
+
+    def test_default_tiebreakers(self):
+        self.assertEqual(sort_chain('artist'), ('artist', 'album', 'track_number'))
+        self.assertEqual(sort_chain('duration'), ('duration',))
+
+    def test_order_and_unknown_keys(self):
+        self.assertEqual(sort_chain('order'), ('order',))
+        self.assertEqual(sort_chain('unknown'), ('order',))
+
+    def test_secondary_key(self):
+        self.assertEqual(sort_chain('duration', 'album'), ('duration', 'album', 'track_number'))
+        self.assertEqual(sort_chain('duration', 'order'), ('duration',))
+        # 次要键与主键相同时按默认次要键
+        self.assertEqual(sort_chain('album', 'album'), ('album', 'track_number'))
+        self.assertEqual(sort_chain('name', 'artist'), ('name', 'artist', 'album', 'track_number'))
+
+
+class SongSorterTest(unittest.TestCase):
+
+    def setUp(self):
+        self.songs = [
+            make_song('b', 'Queen', 'Jazz', 2, 300),
+            make_song('A', 'ABBA', 'Gold', 1, 200),
+            make_song('c', 'Queen', 'Jazz', 1, 200),
+            make_song('É', 'Queen', 'Innuendo', 1, 100),
+        ]
+        self.sorter = SongSorter(self.songs)
+
+    def names(self, order):
+        return [self.songs[i]['track']['name'] for i in order]
+
+    def test_text_ignores_case_and_accents(self):
+        self.assertEqual(self.names(self.sorter.order('name')), ['A', 'b', 'c', 'É'])
+
+    def test_reverse_is_reversed_ascending(self):
+        self.assertEqual(list(self.sorter.order('duration', reverse=True)),
+                         list(reversed(self.sorter.order('duration'))))
+
+    def test_equal_values_keep_original_order(self):
+        self.assertEqual(list(self.sorter.order('duration')), [3, 1, 2, 0])
+
+    def test_chain_is_stable(self):
+        order = self.sorter.order(sort_chain('artist'))
+        # 艺术家相同时按专辑，再按曲目号
+        self.assertEqual(self.names(order), ['A', 'É', 'c', 'b'])
+
+    def test_orders_are_cached(self):
+        first = self.sorter.order(('artist', 'album'))
+        self.assertIs(self.sorter.order(('artist', 'album')), first)
+        self.assertIn(('artist', 'album'), self.sorter._orders)
+
+    def test_order_key_keeps_playlist_order(self):
+        self.assertEqual(list(self.sorter.order('order')), [0, 1, 2, 3])
+        self.assertEqual(list(self.sorter.order('order', reverse=True)), [3, 2, 1, 0])
+
+    def test_sort_indices_subset(self):
+        self.assertEqual(self.sorter.sort_indices([0, 2, 3], 'duration'), [3, 2, 0])
+        self.assertEqual(self.sorter.sort_indices([0, 1, 2, 3], 'duration'), [3, 1, 2, 0])
+
+
+if __name__ == '__main__':
+    unittest.main()
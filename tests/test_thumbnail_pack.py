@@ -0,0 +1,133 @@
+"""
+缩略图打包存储的测试
+"""
+import os
+import shutil
+import tempfile
+import unittest
+
+from src.utils.thumbnail_pack import ThumbnailPack
+
+
+class ThumbnailPackTest(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_dir, True)
+        self.data_file = os.path.join(self.temp_dir, 'images', 'tracks.pack')
+        self.pack = self.open_pack()
+
+    def open_pack(self, **kwargs):
+        pack = ThumbnailPack(self.data_file, compact_min_bytes=1, **kwargs)
+        self.addCleanup(pack.close)
+        return pack
+
+    def test_put_get_round_trip(self):
+        self.pack.put('a', b'alpha')
+        self.pack.put('b', b'beta' * 100)
+        self.assertEqual(self.pack.get('a'), b'alpha')
+        self.assertEqual(self.pack.get('b'), b'beta' * 100)
+        self.assertIsNone(self.pack.get('missing'))
+        self.assertEqual(len(self.pack), 2)
+
+    def test_entries_survive_reopen(self):
+        self.pack.put('a', b'alpha')
+        self.pack.put('a', b'alpha2')
+        self.pack.close()
+        pack = self.open_pack()
+        self.assertEqual(pack.get('a'), b'alpha2')
+        self.assertEqual(len(pack), 1)
+
+    def test_max_age(self):
+        self.pack.put('a', b'alpha')
+        self.assertIsNone(self.pack.get('a', max_age=-1))
+        self.assertEqual(self.pack.get('a', max_age=60), b'alpha')
+
+    def test_compact_keeps_live_entries(self):
+        for i in range(20):
+            self.pack.put(f'k{i}', bytes([i]) * 200)
+        for i in range(0, 20, 2):
+            self.pack.remove(f'k{i}')
+        self.pack.put('k1', b'new')
+        self.assertTrue(self.pack.should_compact())
+
+        before = self.pack.stats()['data_bytes']
+        self.pack.compact()
+        stats = self.pack.stats()
+        self.assertLess(stats['data_bytes'], before)
+        self.assertEqual(stats['dead_bytes'], 0)
+        self.assertEqual(self.pack.get('k1'), b'new')
+        for i in range(3, 20, 2):
+            self.assertEqual(self.pack.get(f'k{i}'), bytes([i]) * 200)
+        self.assertIsNone(self.pack.get('k0'))
+        self.assertEqual(self.pack.verify(), [])
+
+        # 压缩后的文件重新打开也一致
+        self.pack.close()
+        pack = self.open_pack()
+        self.assertEqual(len(pack), 10)
+        self.assertEqual(pack.get('k19'), bytes([19]) * 200)
+
+    def test_rebuild_index_after_index_truncated(self):
+        for i in range(10):
+            self.pack.put(f'k{i}', f'value{i}'.encode())
+        self.pack.flush()
+        with open(self.pack.index_file, 'r+b') as f:
+            f.truncate(10)
+
+        self.assertEqual(self.pack.rebuild_index(), 10)
+        self.assertEqual(self.pack.get('k7'), b'value7')
+        self.assertEqual(self.pack.verify(), [])
+
+    def test_reopen_with_truncated_index_scans_data(self):
+        for i in range(5):
+            self.pack.put(f'k{i}', b'x' * i)
+        self.pack.close()
+        with open(self.data_file + '.idx', 'w') as f:
+            f.write('{"broken')
+        pack = self.open_pack()
+        self.assertEqual(len(pack), 5)
+        self.assertEqual(pack.get('k4'), b'xxxx')
+
+    def test_incomplete_tail_record_is_dropped(self):
+        self.pack.put('a', b'alpha')
+        self.pack.put('b', b'beta')
+        self.pack.close()
+        os.remove(self.data_file + '.idx')
+        with open(self.data_file, 'r+b') as f:
+            f.truncate(os.path.getsize(self.data_file) - 2)
+        pack = self.open_pack()
+        self.assertEqual(pack.get('a'), b'alpha')
+        self.assertNotIn('b', pack)
+
+    def test_verify_reports_corrupt_data(self):
+        self.pack.put('a', b'good')
+        self.pack.put('b', b'bad!')
+        self.assertEqual(self.pack.verify(validator=lambda data: data != b'bad!'), ['b'])
+
+    def test_second_instance_is_read_only_while_lock_held(self):
+        self.pack.put('a', b'alpha')
+        self.pack.flush()
+        self.assertFalse(self.pack.read_only)
+
+        other = self.open_pack()
+        self.assertTrue(other.read_only)
+        self.assertEqual(other.get('a'), b'alpha')
+        other.put('b', b'beta')
+        self.assertNotIn('b', other)
+        other.compact()
+        other.clear()
+        other.close()
+        self.assertEqual(self.pack.get('a'), b'alpha')
+        self.assertEqual(os.path.getsize(self.data_file), self.pack.stats()['data_bytes'])
+
+        # 持有锁的实例关闭后，新实例可以写入
+        self.pack.close()
+        writer = self.open_pack()
+        self.assertFalse(writer.read_only)
+        writer.put('b', b'beta')
+        self.assertEqual(writer.get('b'), b'beta')
+
+
+if __name__ == '__main__':
+    unittest.main()
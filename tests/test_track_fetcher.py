@@ -0,0 +1,80 @@
+"""
+歌单歌曲获取的测试
+"""
+import threading
+import unittest
+
+from src.utils.track_fetcher import claim_or_wait, fetch_tracks, release_fetch, wait_for_fetch
+
+
+class FakeSpotify:
+    """两页歌曲的假客户端"""
+
+    def __init__(self):
+        self.requests = 0
+
+    def playlist_tracks(self, playlist_id):
+        self.requests += 1
+        return {'items': [{'track': {'id': 'a'}}, {'track': {'id': 'b'}}], 'next': 'page2'}
+
+    def next(self, results):
+        self.requests += 1
+        return {'items': [{'track': {'id': 'c'}}], 'next': None}
+
+
+class FetchTracksTest(unittest.TestCase):
+
+    def test_pages_and_original_index(self):
+        pages = []
+        tracks = fetch_tracks(FakeSpotify(), 'p', on_page=pages.append)
+        self.assertEqual([item['original_index'] for item in tracks], [1, 2, 3])
+        self.assertEqual([len(page) for page in pages], [2, 1])
+
+    def test_cancel_between_pages(self):
+        sp = FakeSpotify()
+        self.assertIsNone(fetch_tracks(sp, 'p', is_cancelled=lambda: True))
+        self.assertEqual(sp.requests, 1)
+
+
+class ClaimOrWaitTest(unittest.TestCase):
+
+    def test_only_one_owner_under_contention(self):
+        results = []
+        barrier = threading.Barrier(8)
+
+        def claim():
+            barrier.wait()
+            results.append(claim_or_wait('contended'))
+
+        threads = [threading.Thread(target=claim) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        owners = [done for owner, done in results if owner]
+        self.assertEqual(len(owners), 1)
+        # 其他线程拿到的是同一个完成事件
+        self.assertTrue(all(done is owners[0] for _, done in results))
+        release_fetch('contended', owners[0])
+        self.assertTrue(wait_for_fetch(owners[0]))
+
+    def test_release_allows_next_claim(self):
+        owner, done = claim_or_wait('p1')
+        self.assertTrue(owner)
+        self.assertFalse(claim_or_wait('p1')[0])
+        release_fetch('p1', done)
+        owner, done = claim_or_wait('p1')
+        self.assertTrue(owner)
+        release_fetch('p1', done)
+
+    def test_wait_can_be_cancelled(self):
+        owner, done = claim_or_wait('p2')
+        try:
+            self.assertFalse(wait_for_fetch(done, is_cancelled=lambda: True))
+        finally:
+            release_fetch('p2', done)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+"""
+虚拟化列表封面缓存的测试
+"""
+import unittest
+
+from src.ui.virtual_list import CoverCacheMixin
+
+
+class FakeSignal:
+
+    def __init__(self):
+        self.emitted = []
+
+    def emit(self, *args):
+        self.emitted.append(args)
+
+
+class FakeCoverModel(CoverCacheMixin):
+    """只保存每行封面URL的模型，行号即为index"""
+
+    def __init__(self, urls):
+        self.urls = list(urls)
+        self.cover_requested = FakeSignal()
+        self.dataChanged = FakeSignal()
+        self._init_covers()
+
+    def rowCount(self):
+        return len(self.urls)
+
+    def index(self, row):
+        return row
+
+    def _row_cover_urls(self, first, last):
+        return self.urls[first:last]
+
+    def rebuilt_rows(self):
+        url_rows = {}
+        for row, url in enumerate(self.urls):
+            if url:
+                url_rows.setdefault(url, []).append(row)
+        return url_rows
+
+
+class CoverCacheMixinTest(unittest.TestCase):
+
+    def test_cover_requested_once(self):
+        model = FakeCoverModel(['a'])
+        self.assertIsNone(model.cover('a'))
+        self.assertIsNone(model.cover('a'))
+        self.assertEqual(model.cover_requested.emitted, [('a',)])
+
+        model.forget_cover_requests(['a'])
+        model.cover('a')
+        self.assertEqual(len(model.cover_requested.emitted), 2)
+
+    def test_set_cover_refreshes_rows_using_url(self):
+        model = FakeCoverModel(['a', 'b', 'a', ''])
+        model.set_cover('a', object())
+        self.assertTrue(model.has_cover('a'))
+        self.assertEqual([args[0] for args in model.dataChanged.emitted], [0, 2])
+
+    def test_added_rows_registered(self):
+        model = FakeCoverModel(['a'])
+        model.set_cover('x', object())
+        model.urls += ['b', 'a']
+        model._add_url_rows(1, 3)
+        self.assertEqual(model._url_rows, model.rebuilt_rows())
+
+    def test_remove_row_before_replacing(self):
+        model = FakeCoverModel(['a', 'b'])
+        model.set_cover('x', object())
+        model._remove_url_row(1)
+        model.urls[1] = 'c'
+        model._add_url_rows(1, 2)
+        self.assertEqual(model._url_rows, model.rebuilt_rows())
+
+    def test_remap_after_insert_and_delete(self):
+        model = FakeCoverModel(['a', 'b', 'c', 'd'])
+        model.set_cover('x', object())
+        # 删除 b，在 d 之前插入 e、a
+        model.urls = ['a', 'c', 'e', 'a', 'd']
+        model._remap_url_rows([('equal', 0, 1, 0, 1), ('delete', 1, 2, 1, 1), ('equal', 2, 3, 1, 2),
+                               ('insert', 3, 3, 2, 4), ('equal', 3, 4, 4, 5)])
+        self.assertEqual(model._url_rows, model.rebuilt_rows())
+
+    def test_reset_rebuilds_on_next_cover(self):
+        model = FakeCoverModel(['a'])
+        model.set_cover('a', object())
+        model.urls = ['b', 'a']
+        model._reset_url_rows()
+        model.dataChanged.emitted.clear()
+        model.set_cover('a', object())
+        self.assertEqual([args[0] for args in model.dataChanged.emitted], [1])
+
+
+if __name__ == '__main__':
+    unittest.main()